@@ -11,7 +11,18 @@ class ProductConfig(AppConfig):
     - default_auto_field (str): Specifies the type of automatic field to be used
                               for models in this application.
     - name (str): The name of the application ('apps.product').
+
+    Methods:
+    - ready(): Connects the signal receivers of the application.
     """
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.product"
+
+    def ready(self):
+        """
+        Connect the signal receivers of the application.
+        """
+        from . import (  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
+            signals,
+        )
@@ -0,0 +1,223 @@
+"""
+Module containing the async views of the Product endpoints, for ASGI deployments.
+
+Django Rest Framework views are synchronous, so under ASGI every request to them is handed to a
+worker thread. The views of this module are native Django async views instead: authentication,
+queries (through the async ORM) and rendering all run in the event loop, so that a single worker
+process can hold many concurrent slow clients. They produce the same representations as their
+synchronous counterparts (ProductList and ProductDetail), rendered as JSON.
+
+Classes:
+- AsyncAPIView(View): Base async view, authenticating requests and rendering errors like DRF.
+- AsyncProductList(AsyncAPIView): Async view listing products.
+- AsyncProductDetail(AsyncAPIView): Async view retrieving a specific product.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from .authentication import AsyncJWTAuthentication
+from .cache import aget_catalog_version, get_list_cache_key, get_products_cache
+from .counts import aget_list_state
+from .filters import filter_products
+from .models import Product
+from .paginations import CustomNumberPagination
+from .renderers import ORJSONRenderer
+from .routers import acan_cache_reads
+from .serializers import (
+    ProductReadSerializer,
+    ProductSerializer,
+    defer_unrequested,
+    get_requested_fields,
+)
+from .views import ProductList
+
+
+class AsyncAPIView(View):
+    """
+    Base async view, authenticating requests and rendering errors like DRF's APIView.
+
+    Every handler must be a coroutine. It gets a DRF Request wrapping the Django request, with
+    its 'user' already authenticated, and returns the data to be rendered as JSON.
+
+    Attributes:
+    - authentication_classes (tuple): Tuple of async authentication classes, providing an
+                                      'aauthenticate' coroutine.
+    - renderer_class (class): The renderer of the responses.
+
+    Methods:
+    - dispatch(request, *args, **kwargs): Authenticates the request and runs its handler.
+    - authenticate(request): Authenticates the request, or raises NotAuthenticated.
+    - render(data, status): Renders data as a response.
+    """
+
+    authentication_classes = (AsyncJWTAuthentication,)
+    renderer_class = ORJSONRenderer
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Authenticate the request and run its handler, rendering the API errors.
+
+        Parameters:
+        - request (HttpRequest): The Django request.
+
+        Returns:
+        - HttpResponse: The rendered response.
+        """
+        request = Request(request)
+        try:
+            await self.authenticate(request)
+            data = await super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.render({"detail": exceptions.NotFound.default_detail}, 404)
+        except exceptions.APIException as exc:
+            if isinstance(exc.detail, (list, dict)):
+                response = self.render(exc.detail, exc.status_code)
+            else:
+                response = self.render({"detail": exc.detail}, exc.status_code)
+
+            if exc.status_code == 401:
+                authenticator = self.authenticators[0]
+                response["WWW-Authenticate"] = authenticator.authenticate_header(
+                    request
+                )
+            return response
+
+        if isinstance(data, HttpResponse):
+            return data
+        return self.render(data)
+
+    async def authenticate(self, request):
+        """
+        Authenticate the request with the first authentication class accepting it.
+
+        Parameters:
+        - request (Request): The request.
+
+        Raises:
+        - NotAuthenticated: If no authentication class accepted the request.
+        - AuthenticationFailed: If the credentials of the request are invalid.
+        """
+        self.authenticators = [cls() for cls in self.authentication_classes]
+        for authenticator in self.authenticators:
+            result = await authenticator.aauthenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+
+        raise exceptions.NotAuthenticated()
+
+    def render(self, data, status=200):
+        """
+        Render data as a JSON response.
+
+        Parameters:
+        - data (object): The data.
+        - status (int): The status code.
+
+        Returns:
+        - HttpResponse: The response.
+        """
+        renderer = self.renderer_class()
+        return HttpResponse(
+            renderer.render(data), content_type=renderer.media_type, status=status
+        )
+
+
+class AsyncProductList(AsyncAPIView):
+    """
+    Async view listing products, like ProductList.
+
+    The list accepts the same filters ('name', 'min_price' and 'max_price'), 'ordering' and
+    'fields' query params, with page-number pagination only. Responses are cached like the ones
+    of ProductList, through the async cache API, and so is the number of filtered products (see
+    the 'counts' module).
+
+    Attributes:
+    - pagination_class (class): Custom pagination class ('CustomNumberPagination').
+
+    Methods:
+    - get(request): Handles GET requests for listing products.
+    """
+
+    pagination_class = CustomNumberPagination
+
+    async def get(self, request):
+        """
+        Handle GET requests for listing products.
+
+        Parameters:
+        - request (Request): The request.
+
+        Returns:
+        - dict: The serialized page of products, with the total count and the page links.
+
+        Raises:
+        - ValidationError: If the ordering or any of the filters or fields is invalid.
+        """
+        ordering = request.query_params.get("ordering", "created_at")
+        if ordering not in ProductList.orderings:
+            raise exceptions.ValidationError(
+                {"ordering": [f"Ordering must be one of {list(ProductList.orderings)}"]}
+            )
+
+        cache = get_products_cache()
+        cache_key = get_list_cache_key(request, await aget_catalog_version())
+        data = await cache.aget(cache_key)
+
+        if data is None:
+            fields = get_requested_fields(request.query_params)
+            products = filter_products(Product.objects.sharded(), request.query_params)
+            products = products.order_by(*ProductList.orderings[ordering])
+            serializer = ProductReadSerializer(fields)
+
+            state = await aget_list_state(request, products)
+            paginator = self.pagination_class()
+            paginator.known_count = state["count"]
+            paginator.count_exact = state["count_exact"]
+            page = await paginator.apaginate_queryset(
+                serializer.select(products, *ProductList.orderings[ordering]), request
+            )
+            results = serializer.to_representation(page)
+            data = paginator.get_paginated_response(results).data
+            if await acan_cache_reads():
+                await cache.aset(cache_key, data)
+
+        return data
+
+
+class AsyncProductDetail(AsyncAPIView):
+    """
+    Async view retrieving a specific product, like ProductDetail, accepting the 'fields' query
+    param.
+
+    Methods:
+    - get(request, product_id): Handles GET requests for retrieving a specific product.
+    """
+
+    async def get(self, request, product_id):
+        """
+        Handle GET requests for retrieving a specific product.
+
+        Parameters:
+        - request (Request): The request.
+        - product_id (str): The unique identifier of the product.
+
+        Returns:
+        - dict: The serialized product.
+
+        Raises:
+        - Http404: If the product with the specified 'product_id' does not exist.
+        - ValidationError: If any of the requested fields is invalid.
+        """
+        fields = get_requested_fields(request.query_params)
+
+        try:
+            products = defer_unrequested(Product.objects.shard(product_id), fields)
+            product = await products.aget(pk=product_id)
+        except (Product.DoesNotExist, DjangoValidationError, ValueError) as exc:
+            raise Http404 from exc
+
+        return ProductSerializer(product, fields=fields).data
@@ -0,0 +1,253 @@
+"""
+Module containing the authentication classes of the Product endpoints.
+
+Verifying a JWT (decoding it and checking its signature) and loading its user from the database
+are a large share of the time of a cached product request. The classes of this module keep, in
+the memory of the process:
+- The verified tokens, keyed by a hash of the raw token, until their expiration ('exp' claim),
+  so that a token is verified once per process rather than on every request.
+- The users, keyed by their id (as a string, like the claim of the tokens), for
+  USER_CACHE_TIMEOUT seconds, so that the user of a token is loaded once in a while rather than
+  on every request. Saving or deleting a user evicts it from the cache of the process (see the
+  'signals' module); the other processes pick the change up within USER_CACHE_TIMEOUT seconds.
+
+The checks made on every request by 'JWTAuthentication' (active user, password not changed since
+the token was issued) still run on every request, against the cached user.
+
+Classes:
+- CachedJWTAuthentication(JWTAuthentication): JWT authentication caching the verified tokens
+                                              and the users.
+- AsyncJWTAuthentication(CachedJWTAuthentication): Cached JWT authentication usable from the
+                                                   async views.
+
+Functions:
+- forget_user(user_id): Evicts a user from the cache of the process.
+"""
+import hashlib
+import time
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import LocalCache
+
+TOKEN_CACHE_SIZE = 10000
+USER_CACHE_SIZE = 10000
+USER_CACHE_TIMEOUT = 30
+
+validated_tokens = LocalCache(TOKEN_CACHE_SIZE, timeout=0)
+users = LocalCache(USER_CACHE_SIZE, timeout=USER_CACHE_TIMEOUT)
+
+
+def forget_user(user_id):
+    """
+    Evict a user from the cache of the process.
+
+    Parameters:
+    - user_id (object): The id of the user.
+    """
+    users.delete(str(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication caching the verified tokens and the users in the memory of the process.
+
+    Methods:
+    - authenticate(request): Authenticates a request.
+    - get_cached_validated_token(raw_token): Verifies a raw token, once per process.
+    - get_cached_user(validated_token): Gets the user of a validated token, from the cache.
+    - get_user_id(validated_token): Gets the user id claim of a validated token.
+    - check_user(user, validated_token): Checks that a user may be authenticated by a token.
+    """
+
+    def authenticate(self, request):
+        """
+        Authenticate a request through the JWT of its 'Authorization' header.
+
+        Parameters:
+        - request (Request): The request.
+
+        Returns:
+        - tuple: The '(user, validated_token)' tuple, or None if the request holds no JWT.
+
+        Raises:
+        - AuthenticationFailed: If the token is invalid, or its user is unknown or inactive.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_cached_validated_token(raw_token)
+        return self.get_cached_user(validated_token), validated_token
+
+    def get_cached_validated_token(self, raw_token):
+        """
+        Verify a raw token, or get it from the cache if it was already verified.
+
+        Verified tokens are cached until their expiration, keyed by a hash of the raw token.
+
+        Parameters:
+        - raw_token (bytes): The raw token.
+
+        Returns:
+        - Token: The validated token.
+
+        Raises:
+        - InvalidToken: If the token is invalid or expired.
+        """
+        key = hashlib.sha256(raw_token).hexdigest()
+        validated_token = validated_tokens.get(key)
+
+        if validated_token is None:
+            validated_token = self.get_validated_token(raw_token)
+            lifetime = validated_token["exp"] - time.time()
+            if lifetime > 0:
+                validated_tokens.set(key, validated_token, timeout=lifetime)
+
+        return validated_token
+
+    def get_cached_user(self, validated_token):
+        """
+        Get the user of a validated token from the cache, or from the database.
+
+        Parameters:
+        - validated_token (Token): The validated token.
+
+        Returns:
+        - User: The user.
+
+        Raises:
+        - InvalidToken: If the token holds no user id.
+        - AuthenticationFailed: If the user is unknown, inactive, or changed their password.
+        """
+        user_id = str(self.get_user_id(validated_token))
+        user = users.get(user_id)
+
+        if user is None:
+            user = self.get_user(validated_token)
+            users.set(user_id, user)
+        else:
+            self.check_user(user, validated_token)
+
+        return user
+
+    def get_user_id(self, validated_token):
+        """
+        Get the user id claim of a validated token.
+
+        Parameters:
+        - validated_token (Token): The validated token.
+
+        Returns:
+        - object: The user id.
+
+        Raises:
+        - InvalidToken: If the token holds no user id.
+        """
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from exc
+
+    def check_user(self, user, validated_token):
+        """
+        Check that a user may be authenticated by a token, like 'JWTAuthentication' does.
+
+        Parameters:
+        - user (User): The user of the token.
+        - validated_token (Token): The validated token.
+
+        Raises:
+        - AuthenticationFailed: If the user is inactive, or changed their password since the
+                                token was issued.
+        """
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+
+class AsyncJWTAuthentication(CachedJWTAuthentication):
+    """
+    Cached JWT authentication usable from the async views.
+
+    The token is verified like 'CachedJWTAuthentication' does (this is CPU work only), and the
+    users missing from the cache are loaded with the async ORM, so that the event loop is never
+    blocked.
+
+    Methods:
+    - aauthenticate(request): Authenticates a request.
+    - aget_user(validated_token): Gets the user of a validated token.
+    """
+
+    async def aauthenticate(self, request):
+        """
+        Authenticate a request through the JWT of its 'Authorization' header.
+
+        Parameters:
+        - request (HttpRequest): The request.
+
+        Returns:
+        - tuple: The '(user, validated_token)' tuple, or None if the request holds no JWT.
+
+        Raises:
+        - AuthenticationFailed: If the token is invalid, or its user is unknown or inactive.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_cached_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """
+        Get the user of a validated token from the cache, or from the database with the async
+        ORM, with the same checks as 'JWTAuthentication'.
+
+        Parameters:
+        - validated_token (Token): The validated token.
+
+        Returns:
+        - User: The user.
+
+        Raises:
+        - InvalidToken: If the token holds no user id.
+        - AuthenticationFailed: If the user is unknown, inactive, or changed their password.
+        """
+        user_id = str(self.get_user_id(validated_token))
+        user = users.get(user_id)
+
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as exc:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from exc
+
+            users.set(user_id, user)
+
+        self.check_user(user, validated_token)
+        return user
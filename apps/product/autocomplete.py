@@ -0,0 +1,338 @@
+"""
+Module containing the in-process index of the product names, serving the name autocomplete.
+
+The index holds the distinct product names, folded (case and accents removed) and kept sorted,
+so that the names starting with a prefix are found with a binary search, without querying the
+database. It is loaded on its first use and then kept up to date by the Product signals (see the
+'signals' module) of the process. Since the changes made by the other processes do not reach it,
+it is also reloaded in a background thread every REFRESH_INTERVAL seconds, and whenever products
+are changed without being known (e.g. cleared by the 'seed_products' command), while the current
+index keeps serving the requests.
+
+The index tracks at most MAX_SIZE products, so that its memory usage stays bounded; the
+products beyond it are left out of the autocomplete.
+
+Classes:
+- NameTable: Sorted table of the folded product names.
+- ProductNameIndex: Autocomplete index of the product names, loaded and refreshed lazily.
+
+Functions:
+- fold(text): Folds a text for case and accent insensitive comparisons.
+"""
+import logging
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.db import connections
+
+from .models import Product
+
+MAX_SIZE = 100_000
+REFRESH_INTERVAL = 300
+
+logger = logging.getLogger(__name__)
+
+
+def fold(text):
+    """
+    Fold a text for case and accent insensitive comparisons.
+
+    Parameters:
+    - text (str): The text.
+
+    Returns:
+    - str: The text, without its accents and case folded.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.strip())
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    ).casefold()
+
+
+class NameTable:
+    """
+    Sorted table of the folded product names.
+
+    Products sharing a folded name share an entry, displayed with the name of the first one
+    still tracked. An entry is dropped along with the last product using it, and the display name
+    of an entry always belongs to one of its products, so that the names of removed or renamed
+    products are never completed.
+
+    Attributes:
+    - max_size (int): The maximum number of tracked products.
+    - truncated (bool): Whether products were left out because the table was full.
+
+    Methods:
+    - fill(products): Adds many products at once.
+    - set(pk, name): Adds or renames a product.
+    - discard(pk): Removes a product.
+    - search(prefix, limit): Returns the names starting with a folded prefix.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.truncated = False
+        self._keys = []
+        self._entries = {}
+        self._by_pk = {}
+
+    def __len__(self):
+        return len(self._by_pk)
+
+    def fill(self, products):
+        """
+        Add many products at once, sorting the names once rather than on every insertion.
+
+        Parameters:
+        - products (Iterable): The '(pk, name)' tuples of the products, not tracked yet.
+        """
+        for pk, name in products:
+            if len(self._by_pk) >= self.max_size:
+                self.truncated = True
+                break
+
+            key = fold(name)
+            self._by_pk[pk] = key
+            self._entries.setdefault(key, {})[pk] = name
+
+        self._keys = sorted(self._entries)
+
+    def set(self, pk, name):
+        """
+        Add a product, or rename it if it is already tracked.
+
+        Parameters:
+        - pk (int): The primary key of the product.
+        - name (str): The name of the product.
+        """
+        key = fold(name)
+        if self._by_pk.get(pk) == key:
+            self._entries[key][pk] = name
+            return
+
+        if pk in self._by_pk:
+            self.discard(pk)
+        elif len(self._by_pk) >= self.max_size:
+            self.truncated = True
+            return
+
+        self._by_pk[pk] = key
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = {pk: name}
+            insort(self._keys, key)
+        else:
+            entry[pk] = name
+
+    def discard(self, pk):
+        """
+        Remove a product, if it is tracked.
+
+        Parameters:
+        - pk (int): The primary key of the product.
+        """
+        key = self._by_pk.pop(pk, None)
+        if key is None:
+            return
+
+        entry = self._entries[key]
+        del entry[pk]
+        if not entry:
+            del self._entries[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def search(self, prefix, limit):
+        """
+        Get the names starting with a folded prefix, in alphabetical order.
+
+        Parameters:
+        - prefix (str): The folded prefix.
+        - limit (int): The maximum number of names.
+
+        Returns:
+        - list: The names.
+        """
+        names = []
+        index = bisect_left(self._keys, prefix)
+
+        while index < len(self._keys) and len(names) < limit:
+            key = self._keys[index]
+            if not key.startswith(prefix):
+                break
+
+            names.append(next(iter(self._entries[key].values())))
+            index += 1
+
+        return names
+
+
+class ProductNameIndex:
+    """
+    Autocomplete index of the product names, loaded on its first use and refreshed lazily.
+
+    Attributes:
+    - max_size (int): The maximum number of tracked products.
+    - refresh_interval (float): The number of seconds after which the index is reloaded.
+
+    Methods:
+    - search(prefix, limit): Returns the product names starting with a prefix.
+    - update(products): Adds or renames products.
+    - remove(pks): Removes products.
+    - invalidate(): Marks the index to be reloaded.
+    - load(): Loads the index from the database.
+    - clear(): Unloads the index.
+    """
+
+    def __init__(self, max_size=MAX_SIZE, refresh_interval=REFRESH_INTERVAL):
+        self.max_size = max_size
+        self.refresh_interval = refresh_interval
+        self._table = None
+        self._loaded_at = None
+        self._stale = False
+        self._pending = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def search(self, prefix, limit):
+        """
+        Get the product names starting with a prefix, ignoring case and accents.
+
+        The index is loaded from the database on the first call only. Afterwards, a stale index
+        keeps answering while it is reloaded in a background thread.
+
+        Parameters:
+        - prefix (str): The prefix.
+        - limit (int): The maximum number of names.
+
+        Returns:
+        - list: The names, in alphabetical order.
+        """
+        if self._table is None:
+            with self._load_lock:
+                if self._table is None:
+                    self._load()
+        elif self._stale or time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.refresh()
+
+        with self._lock:
+            return self._table.search(fold(prefix), limit)
+
+    def update(self, products):
+        """
+        Add products, or rename them if they are already tracked. Ignored until the index is
+        loaded.
+
+        Parameters:
+        - products (list): The '(pk, name)' tuples of the products.
+        """
+        self._apply([("set", product) for product in products])
+
+    def remove(self, pks):
+        """
+        Remove products, if they are tracked. Ignored until the index is loaded.
+
+        Parameters:
+        - pks (list): The primary keys of the products.
+        """
+        self._apply([("discard", (pk,)) for pk in pks])
+
+    def invalidate(self):
+        """
+        Mark the index to be reloaded, on its next use.
+        """
+        self._stale = True
+
+    def load(self):
+        """
+        Load the index from the database, replacing the current one.
+
+        The changes applied while the products are read are replayed on the new index, so that
+        none of them is lost when it replaces the current one.
+        """
+        with self._load_lock:
+            self._load()
+
+    def refresh(self):
+        """
+        Reload the index in a background thread, unless a reload is already running.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def clear(self):
+        """
+        Unload the index, to be loaded again on its next use.
+        """
+        with self._load_lock, self._lock:
+            self._table = None
+            self._loaded_at = None
+            self._stale = False
+
+    def _load(self):
+        """
+        Load the index from the database, the load lock being held.
+        """
+        with self._lock:
+            self._pending = []
+            self._stale = False
+
+        try:
+            table = NameTable(self.max_size)
+            products = Product.objects.sharded().values_list("pk", "name").order_by()
+            table.fill(products.iterator(chunk_size=2000))
+        except Exception:
+            with self._lock:
+                self._pending = None
+                self._stale = True
+            raise
+
+        if table.truncated:
+            logger.warning(
+                "Product name index is full, products beyond %s are left out",
+                self.max_size,
+            )
+
+        with self._lock:
+            for method, args in self._pending:
+                getattr(table, method)(*args)
+
+            self._table = table
+            self._loaded_at = time.monotonic()
+            self._pending = None
+
+    def _refresh(self):
+        """
+        Reload the index, logging the errors instead of raising them (background thread).
+        """
+        try:
+            self.load()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not reload the product name index")
+        finally:
+            self._refreshing = False
+            connections.close_all()
+
+    def _apply(self, changes):
+        """
+        Apply changes to the loaded index, and record them if a reload is running.
+
+        Parameters:
+        - changes (list): The '(method, args)' tuples of the changes, 'method' being the name of
+                          the NameTable method applying a change.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.extend(changes)
+            if self._table is not None:
+                for method, args in changes:
+                    getattr(self._table, method)(*args)
+
+
+product_names = ProductNameIndex()
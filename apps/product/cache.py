@@ -0,0 +1,468 @@
+"""
+Module containing the caching helpers of the Product endpoints.
+
+Cached lists are stored in the 'products' cache (see the CACHES setting) and their keys embed
+the current catalog version. Any change to the products bumps that version, through the Product
+signals (see the 'signals' module), which makes every entry computed before the change
+unreachable at once, in every worker process sharing the cache. Stale entries are then evicted by
+the cache backend, according to its TIMEOUT and MAX_ENTRIES options.
+
+Single products are cached in two tiers: a small LRU cache local to the process, whose entries
+live a few seconds, in front of the 'products' cache shared by every process. Shared entries are
+invalidated per product by the Product signals, by changing the version of the product, or all
+at once (by changing the object generation) when the changed products are not known. An entry
+is only served under the generation and the version it was loaded under, so that a request that
+read a product before a change was committed can not store its stale copy as a fresh entry
+after the invalidation. Both are initialized with a new value when the cache does not hold them
+(e.g. evicted by the culling of the cache), which no stored entry matches; changes of more than
+MAX_INVALIDATED_OBJECTS products change the generation rather than as many versions.
+
+Once a shared entry is no longer fresh, a single request reloads it, under a lock taken in the
+shared cache, while the concurrent requests keep being served the stale product, so that an
+expiring hot product never sends a burst of identical queries to the database.
+
+Classes:
+- LocalCache: Bounded LRU cache local to the process, whose entries expire after a timeout.
+
+Functions:
+- get_products_cache(): Returns the cache storing the Product entries.
+- get_catalog_version(): Returns the current catalog version.
+- aget_catalog_version(): Async version of 'get_catalog_version'.
+- bump_catalog_version(): Changes the catalog version, invalidating every cached entry.
+- get_request_fingerprint(request): Returns a digest of the normalized request.
+- get_list_cache_key(request, version): Builds the cache key of a product list request.
+- get_object_generation(): Returns the current object generation.
+- get_object_version(pk): Returns the current version of a product.
+- get_cached_product(product_id, store): Returns a product through the two cache tiers.
+- invalidate_products(pks): Invalidates the cached products.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+from .models import Product
+
+CACHE_ALIAS = "products"
+CATALOG_VERSION_KEY = "products:catalog-version"
+OBJECT_GENERATION_KEY = "products:object-generation"
+
+LOCAL_CACHE_SIZE = 1024
+LOCAL_CACHE_TIMEOUT = 5
+OBJECT_FRESH_TIMEOUT = 60
+OBJECT_STALE_TIMEOUT = 300
+OBJECT_LOCK_TIMEOUT = 10
+OBJECT_LOCK_WAIT = 2
+OBJECT_LOCK_POLL = 0.05
+OBJECT_VERSION_TIMEOUT = 2 * OBJECT_STALE_TIMEOUT
+MAX_INVALIDATED_OBJECTS = 100
+
+
+class LocalCache:
+    """
+    Bounded LRU cache local to the process, whose entries expire after a timeout.
+
+    It is safe to use from the threads of a process. Missing, expired and None values can not
+    be told apart, so None should not be cached.
+
+    Attributes:
+    - max_size (int): The maximum number of entries, the least recently used one being evicted
+                      beyond it.
+    - timeout (float): The number of seconds an entry lives, unless set otherwise.
+
+    Methods:
+    - get(key): Returns the value of a key, or None if it is missing or expired.
+    - set(key, value, timeout=None): Sets the value of a key.
+    - delete(key): Deletes a key.
+    - clear(): Deletes every key.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get the value of a key, marking it as the most recently used one.
+
+        Parameters:
+        - key (Hashable): The key.
+
+        Returns:
+        - object: The value, or None if the key is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Set the value of a key, evicting the least recently used key if the cache is full.
+
+        Parameters:
+        - key (Hashable): The key.
+        - value (object): The value.
+        - timeout (float): The number of seconds the entry lives. Defaults to 'timeout'.
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Delete a key, if present.
+
+        Parameters:
+        - key (Hashable): The key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Delete every key.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+local_products = LocalCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TIMEOUT)
+
+
+def get_products_cache():
+    """
+    Get the cache storing the Product entries.
+
+    Returns:
+    - BaseCache: The 'products' cache.
+    """
+    return caches[CACHE_ALIAS]
+
+
+def get_catalog_version():
+    """
+    Get the current catalog version, initializing it if the cache does not hold one.
+
+    Returns:
+    - int: The current catalog version.
+    """
+    cache = get_products_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+
+    return version
+
+
+async def aget_catalog_version():
+    """
+    Get the current catalog version with the async cache API, initializing it if needed.
+
+    Returns:
+    - int: The current catalog version.
+    """
+    cache = get_products_cache()
+    version = await cache.aget(CATALOG_VERSION_KEY)
+
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(CATALOG_VERSION_KEY)
+
+    return version
+
+
+def bump_catalog_version():
+    """
+    Change the catalog version, invalidating every entry cached under the previous one.
+
+    The new version is a timestamp in nanoseconds rather than an increment of the previous one,
+    so that concurrent bumps from several processes can never produce a version that was
+    already used.
+    """
+    get_products_cache().set(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_request_fingerprint(request):
+    """
+    Get a digest of the normalized request, identifying the representation it asks for.
+
+    The digest is made of the path and of the normalized query params (sorted, without blank
+    values), along with the scheme and host the pagination links are built with.
+
+    Parameters:
+    - request (Request): The request.
+
+    Returns:
+    - str: The hexadecimal digest.
+    """
+    params = sorted(
+        (key, sorted(value for value in values if value))
+        for key, values in request.query_params.lists()
+    )
+    normalized = repr(
+        (
+            request.scheme,
+            request.get_host(),
+            request.path,
+            [item for item in params if item[1]],
+        )
+    )
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def get_list_cache_key(request, version):
+    """
+    Build the cache key of a product list request.
+
+    The key is made of the catalog version and of the request fingerprint.
+
+    Parameters:
+    - request (Request): The product list request.
+    - version (int): The catalog version the entry is computed under.
+
+    Returns:
+    - str: The cache key.
+    """
+    return f"products:list:{version}:{get_request_fingerprint(request)}"
+
+
+def get_object_generation():
+    """
+    Get the current object generation, initializing it if the cache does not hold one.
+
+    Returns:
+    - int: The current object generation.
+    """
+    cache = get_products_cache()
+    generation = cache.get(OBJECT_GENERATION_KEY)
+
+    if generation is None:
+        cache.add(OBJECT_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(OBJECT_GENERATION_KEY)
+
+    return generation
+
+
+def get_object_cache_key(pk):
+    """
+    Build the cache key of a single product.
+
+    Parameters:
+    - pk (int): The primary key of the product.
+
+    Returns:
+    - str: The cache key.
+    """
+    return f"products:object:{pk}"
+
+
+def get_object_version_key(pk):
+    """
+    Build the cache key of the version of a single product, changed by its invalidations.
+
+    Parameters:
+    - pk (int): The primary key of the product.
+
+    Returns:
+    - str: The cache key.
+    """
+    return f"products:object:{pk}:version"
+
+
+def get_object_version(pk):
+    """
+    Get the current version of a product, initializing it if the cache does not hold one.
+
+    Parameters:
+    - pk (int): The primary key of the product.
+
+    Returns:
+    - int: The current version of the product.
+    """
+    cache = get_products_cache()
+    key = get_object_version_key(pk)
+    cache.add(key, time.time_ns(), timeout=OBJECT_VERSION_TIMEOUT)
+    return cache.get(key)
+
+
+def is_current_entry(entry, generation, version):
+    """
+    Tell whether a shared cache entry was loaded under the current generation and version.
+
+    Parameters:
+    - entry (dict): The entry, or None.
+    - generation (int): The current object generation.
+    - version (int): The current version of the product.
+
+    Returns:
+    - bool: True if the entry can be served.
+    """
+    return (
+        entry is not None
+        and entry["generation"] == generation
+        and entry["version"] == version
+    )
+
+
+def load_product_entry(pk, generation, version):
+    """
+    Load a product from the database, as a shared cache entry.
+
+    Missing products are cached as well (as None), so that requests for unknown ids do not
+    reach the database either.
+
+    Parameters:
+    - pk (int): The primary key of the product.
+    - generation (int): The object generation the entry is loaded under.
+    - version (int): The version of the product the entry is loaded under.
+
+    Returns:
+    - dict: The entry, holding the 'product' (or None), its 'generation', its 'version' and the
+            time it is 'fresh_until'.
+    """
+    return {
+        "product": Product.objects.shard(pk).filter(pk=pk).first(),
+        "generation": generation,
+        "version": version,
+        "fresh_until": time.time() + OBJECT_FRESH_TIMEOUT,
+    }
+
+
+def refresh_product_entry(pk, generation, version, stale):
+    """
+    Reload the shared cache entry of a product, with a single process doing it at a time.
+
+    The process taking the lock reloads the entry and stores it. The other ones get the stale
+    entry if there is one, or else wait for the entry to be stored, and only load the product
+    themselves if it is not stored in time.
+
+    Parameters:
+    - pk (int): The primary key of the product.
+    - generation (int): The current object generation.
+    - version (int): The current version of the product.
+    - stale (dict): The expired entry of the current generation and version, or None.
+
+    Returns:
+    - dict: The entry.
+    """
+    cache = get_products_cache()
+    key = get_object_cache_key(pk)
+    lock_key = f"{key}:lock"
+
+    if cache.add(lock_key, True, timeout=OBJECT_LOCK_TIMEOUT):
+        try:
+            entry = load_product_entry(pk, generation, version)
+            cache.set(key, entry, timeout=OBJECT_STALE_TIMEOUT)
+            return entry
+        finally:
+            cache.delete(lock_key)
+
+    if stale is not None:
+        return stale
+
+    deadline = time.monotonic() + OBJECT_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(OBJECT_LOCK_POLL)
+        entry = cache.get(key)
+        if is_current_entry(entry, generation, version):
+            return entry
+
+    return load_product_entry(pk, generation, version)
+
+
+def get_cached_product(product_id, store=True):
+    """
+    Get a product through the local cache, then the shared cache, and then the database.
+
+    Parameters:
+    - product_id (str): The unique identifier of the product.
+    - store (bool): Whether a product read from the database is stored in the caches.
+
+    Returns:
+    - Product: The product.
+
+    Raises:
+    - Product.DoesNotExist: If the product does not exist.
+    - ValidationError: If the identifier is not a valid primary key.
+    """
+    pk = Product._meta.pk.to_python(product_id)
+    product = local_products.get(pk)
+
+    if product is None:
+        key = get_object_cache_key(pk)
+        version_key = get_object_version_key(pk)
+        entries = get_products_cache().get_many(
+            [OBJECT_GENERATION_KEY, key, version_key]
+        )
+        generation = entries.get(OBJECT_GENERATION_KEY) or get_object_generation()
+        version = entries.get(version_key) or get_object_version(pk)
+        entry = entries.get(key)
+
+        if not is_current_entry(entry, generation, version):
+            entry = None
+
+        if entry is None or entry["fresh_until"] <= time.time():
+            if store:
+                entry = refresh_product_entry(pk, generation, version, entry)
+            else:
+                entry = load_product_entry(pk, generation, version)
+
+        product = entry["product"]
+        if product is None:
+            raise Product.DoesNotExist(f"Product {pk} does not exist")
+
+        if store:
+            local_products.set(pk, product)
+
+    return product
+
+
+def invalidate_products(pks):
+    """
+    Invalidate the cached products, in the shared cache and in the local cache of the process.
+
+    The version of every changed product is changed as well, so that the entries stored
+    afterwards by the requests that read the products before the change are never served. Every
+    product is invalidated at once, by changing the object generation, when more than
+    MAX_INVALIDATED_OBJECTS products changed, so that the cost of an invalidation stays bounded.
+    The local caches of the other processes are not reached, and keep serving their entries
+    until they expire (see LOCAL_CACHE_TIMEOUT).
+
+    Parameters:
+    - pks (list): The primary keys of the changed products, or None to invalidate every product.
+    """
+    cache = get_products_cache()
+
+    if pks is None or len(pks) > MAX_INVALIDATED_OBJECTS:
+        cache.set(OBJECT_GENERATION_KEY, time.time_ns(), timeout=None)
+        local_products.clear()
+        return
+
+    version = time.time_ns()
+    cache.set_many(
+        {get_object_version_key(pk): version for pk in pks},
+        timeout=OBJECT_VERSION_TIMEOUT,
+    )
+    cache.delete_many([get_object_cache_key(pk) for pk in pks])
+    for pk in pks:
+        local_products.delete(pk)
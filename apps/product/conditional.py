@@ -0,0 +1,103 @@
+"""
+Module containing the conditional request helpers of the Product endpoints.
+
+Product responses carry a strong 'ETag' and a 'Last-Modified' header, computed from the
+'updated_at' column of the products they represent rather than from the rendered body. This lets
+the views answer 'If-None-Match' and 'If-Modified-Since' with a '304 Not Modified' after a query
+reading only that column, before anything is serialized. The product list validators are
+computed from the '(id, updated_at)' of the rows of the page (see 'summarize_rows'), already read
+to build it, rather than from an aggregate over every filtered product.
+
+The ETag also covers the request fingerprint (query params, scheme and host) and the accepted
+media type, so that two representations of the same products never share a validator, and
+responses vary on the 'Accept' header.
+
+Functions:
+- make_etag(request, *parts): Builds the strong ETag of a representation.
+- summarize_rows(rows): Summarizes the ids and last updates of listed rows.
+- evaluate_preconditions(request, etag, last_modified): Evaluates the request preconditions.
+- set_validators(response, etag, last_modified): Sets the validator headers of a response.
+"""
+import hashlib
+from calendar import timegm
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_request_fingerprint
+
+
+def make_etag(request, *parts):
+    """
+    Build the strong ETag of a representation.
+
+    Parameters:
+    - request (Request): The request the representation is built for.
+    - *parts: The values identifying the state of the represented products (e.g. their id,
+              count and last update).
+
+    Returns:
+    - str: The quoted ETag.
+    """
+    key = repr((get_request_fingerprint(request), request.accepted_media_type, *parts))
+    return quote_etag(hashlib.sha256(key.encode()).hexdigest())
+
+
+def summarize_rows(rows):
+    """
+    Summarize the ids and last updates of the rows of a list page.
+
+    Parameters:
+    - rows (list): The rows of the page, holding the 'id' and 'updated_at' of the products.
+
+    Returns:
+    - tuple: The digest of the '(id, updated_at)' pairs of the rows, and their last update (or
+             None if there is no row).
+    """
+    pairs = [(row.id, row.updated_at.isoformat()) for row in rows]
+    digest = hashlib.sha256(repr(pairs).encode()).hexdigest()
+    return digest, max((row.updated_at for row in rows), default=None)
+
+
+def evaluate_preconditions(request, etag, last_modified):
+    """
+    Evaluate the 'If-None-Match', 'If-Modified-Since' (and 'If-Match') request preconditions.
+
+    Parameters:
+    - request (Request): The request.
+    - etag (str): The current ETag of the representation.
+    - last_modified (datetime): The last update of the represented products, or None.
+
+    Returns:
+    - HttpResponse: A '304 Not Modified' (or '412 Precondition Failed') response holding the
+                    validator headers, or None if the full response must be sent.
+    """
+    response = set_validators(HttpResponse(), etag, last_modified)
+    conditional = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and timegm(last_modified.utctimetuple()),
+        response=response,
+    )
+    return None if conditional is response else conditional
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Set the 'ETag' and 'Last-Modified' headers of a response, and add 'Accept' to its 'Vary'
+    header.
+
+    Parameters:
+    - response (HttpResponse): The response.
+    - etag (str): The ETag of the representation.
+    - last_modified (datetime): The last update of the represented products, or None.
+
+    Returns:
+    - HttpResponse: The given response.
+    """
+    response["ETag"] = etag
+    patch_vary_headers(response, ["Accept"])
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,207 @@
+"""
+Module containing the count strategy of the paginated product lists.
+
+Counting the products matching wide filters costs more than fetching a page of them. Their
+number is computed once per filter shape (the filter query params, whatever the page, page size,
+ordering or fields) and cached under the catalog version (see the 'cache' module), so that the
+other pages of the same filters, and the requests made before the next product change, reuse
+it. Cursor pages have no total count, and do not need it.
+
+When the products are not filtered by name, their number is first read from the price
+statistics summary (see the 'stats' module), without querying the products table. Above
+ESTIMATE_THRESHOLD products, that number is used as is: it is exact when the price range covers
+its buckets, and estimated from the buckets crossing the range bounds otherwise. Below the
+threshold, the products are counted exactly, which is cheap for so few of them.
+
+Functions:
+- get_count_cache_key(request, version): Builds the cache key of the count of a filter shape.
+- get_price_filters(query_params): Returns the price range filters, unless filtered by name.
+- estimate_count(query_params): Reads the number of products matching the filters from the
+                                price statistics summary.
+- aestimate_count(query_params): Async version of 'estimate_count'.
+- get_estimated_state(counted): Returns the state of a list counted from the summary, if used.
+- get_list_state(request, queryset, estimate): Returns the count of the filtered products.
+- aget_list_state(request, queryset, estimate): Async version of 'get_list_state'.
+"""
+import hashlib
+
+from .cache import aget_catalog_version, get_catalog_version, get_products_cache
+from .filters import ProductFilterSerializer
+from .routers import acan_cache_reads, can_cache_reads
+from .stats import aestimate_price_count, estimate_price_count
+
+ESTIMATE_THRESHOLD = 10000
+
+# Query params selecting the page or the representation of the products, rather than the products.
+PAGE_PARAMS = (
+    "page",
+    "page_size",
+    "pagination",
+    "cursor",
+    "ordering",
+    "fields",
+    "format",
+)
+
+
+def get_count_cache_key(request, version):
+    """
+    Build the cache key of the count of a filter shape.
+
+    The key is made of the catalog version, the path and the normalized filter query params.
+
+    Parameters:
+    - request (Request): The list request.
+    - version (int): The catalog version the count is computed under.
+
+    Returns:
+    - str: The cache key.
+    """
+    params = sorted(
+        (key, sorted(value for value in values if value))
+        for key, values in request.query_params.lists()
+        if key not in PAGE_PARAMS
+    )
+    shape = repr((request.path, [item for item in params if item[1]]))
+    return f"products:count:{version}:{hashlib.sha256(shape.encode()).hexdigest()}"
+
+
+def get_price_filters(query_params):
+    """
+    Return the price range filters of a request, unless its products are filtered by name.
+
+    Parameters:
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - tuple: The 'min_price' and 'max_price' filters (None when not given), or None if the
+             products are filtered by name.
+
+    Raises:
+    - serializers.ValidationError: If any of the filter query params is invalid.
+    """
+    serializer = ProductFilterSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    filters = serializer.validated_data
+
+    if filters.get("name"):
+        return None
+    return filters.get("min_price"), filters.get("max_price")
+
+
+def estimate_count(query_params):
+    """
+    Read the number of products matching the filters from the price statistics summary.
+
+    Parameters:
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - tuple: The number of products and whether it is exact, or None if the products are
+             filtered by name.
+
+    Raises:
+    - serializers.ValidationError: If any of the filter query params is invalid.
+    """
+    price_filters = get_price_filters(query_params)
+    if price_filters is None:
+        return None
+    return estimate_price_count(*price_filters)
+
+
+async def aestimate_count(query_params):
+    """
+    Read the number of products matching the filters from the price statistics summary, with
+    the async ORM.
+
+    Parameters:
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - tuple: The number of products and whether it is exact, or None if the products are
+             filtered by name.
+
+    Raises:
+    - serializers.ValidationError: If any of the filter query params is invalid.
+    """
+    price_filters = get_price_filters(query_params)
+    if price_filters is None:
+        return None
+    return await aestimate_price_count(*price_filters)
+
+
+def get_estimated_state(counted):
+    """
+    Return the state of a list counted from the price statistics summary, if that count is used.
+
+    Parameters:
+    - counted (tuple): The number of products and whether it is exact, or None.
+
+    Returns:
+    - dict: The number of products ('count') and whether it is exact ('count_exact'), or None
+            if the products are to be counted exactly.
+    """
+    if counted is None or counted[0] < ESTIMATE_THRESHOLD:
+        return None
+    count, exact = counted
+    return {"count": count, "count_exact": exact}
+
+
+def get_list_state(request, queryset, estimate=True):
+    """
+    Return the count of the filtered products, through the cache.
+
+    Parameters:
+    - request (Request): The list request.
+    - queryset (QuerySet): The filtered Product queryset.
+    - estimate (bool): Whether the count can be read from the price statistics summary, which
+                       only holds for the product list filters.
+
+    Returns:
+    - dict: The number of products ('count') and whether it is exact ('count_exact').
+    """
+    cache = get_products_cache()
+    cache_key = get_count_cache_key(request, get_catalog_version())
+
+    state = cache.get(cache_key)
+    if state is not None:
+        return state
+
+    counted = estimate_count(request.query_params) if estimate else None
+    state = get_estimated_state(counted)
+    if state is None:
+        state = {"count": queryset.count(), "count_exact": True}
+
+    if can_cache_reads():
+        cache.set(cache_key, state)
+    return state
+
+
+async def aget_list_state(request, queryset, estimate=True):
+    """
+    Return the count of the filtered products, through the cache, with the async cache API and
+    ORM.
+
+    Parameters:
+    - request (Request): The list request.
+    - queryset (QuerySet): The filtered Product queryset.
+    - estimate (bool): Whether the count can be read from the price statistics summary.
+
+    Returns:
+    - dict: The number of products ('count') and whether it is exact ('count_exact').
+    """
+    cache = get_products_cache()
+    cache_key = get_count_cache_key(request, await aget_catalog_version())
+
+    state = await cache.aget(cache_key)
+    if state is not None:
+        return state
+
+    counted = await aestimate_count(request.query_params) if estimate else None
+    state = get_estimated_state(counted)
+    if state is None:
+        state = {"count": await queryset.acount(), "count_exact": True}
+
+    if await acan_cache_reads():
+        await cache.aset(cache_key, state)
+    return state
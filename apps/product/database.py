@@ -0,0 +1,186 @@
+"""
+Module containing the connection tuning and the maintenance of the SQLite databases.
+
+SQLite defaults suit embedded use rather than a web server: its rollback journal blocks the
+readers while a writer commits, every commit is synced to disk, and a connection meeting a lock
+fails at once with "database is locked". Every new SQLite connection is therefore given the
+profile of pragmas held by the 'PRAGMAS' entry of its database settings (see the DATABASES
+setting, and the 'configure_sqlite_connection' receiver of the 'signals' module), e.g.:
+- auto_vacuum: "incremental" lets 'incremental_vacuum' give the free pages back to the file
+               system. It only applies to new databases (it must be set before the journal mode
+               and the first table), or after a 'VACUUM'.
+- busy_timeout: Milliseconds a connection waits for a lock before failing.
+- journal_mode: "wal" lets the readers run alongside the (single) writer.
+- synchronous: "normal" only syncs the write-ahead log at checkpoints, which stays safe from
+               corruption in WAL mode, a power loss only rolling back the last commits.
+- cache_size: Pages (or KiB, when negative) of the page cache of each connection.
+- mmap_size: Bytes of the database file read through memory mapping rather than system calls.
+- temp_store: "memory" keeps the temporary tables and indexes (e.g. of sorts) in memory.
+
+The pragmas are applied in order, and None leaves a pragma unset, e.g. to drop it from a profile
+copied from another database.
+
+Attributes:
+- CHECKPOINT_MODES (tuple): The modes of the WAL checkpoints.
+
+Functions:
+- get_pragmas(settings_dict): Returns the pragma profile of a database.
+- apply_pragmas(cursor, pragmas): Sets pragmas on a connection.
+- configure_connection(connection): Applies the pragma profile of its database to a connection.
+- analyze(connection): Gathers the statistics of every table and index.
+- optimize(connection): Runs the optimizations SQLite deems worthwhile.
+- incremental_vacuum(connection, pages): Gives the free pages back to the file system.
+- full_vacuum(connection): Rewrites the database, enabling the incremental vacuum.
+- checkpoint(connection, mode): Copies the write-ahead log into the database.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+PRAGMA_NAME_PATTERN = re.compile(r"[a-z_]+")
+PRAGMA_VALUE_PATTERN = re.compile(r"-?\d+|[A-Za-z_]+")
+
+
+def get_pragmas(settings_dict):
+    """
+    Return the pragma profile of a database, from the 'PRAGMAS' entry of its settings.
+
+    Parameters:
+    - settings_dict (dict): The settings of the database.
+
+    Returns:
+    - dict: The pragmas to be set, in order.
+
+    Raises:
+    - ImproperlyConfigured: If a pragma name or value is invalid.
+    """
+    pragmas = settings_dict.get("PRAGMAS", {})
+
+    for name, value in pragmas.items():
+        if value is None:
+            continue
+        if not PRAGMA_NAME_PATTERN.fullmatch(
+            name
+        ) or not PRAGMA_VALUE_PATTERN.fullmatch(str(value)):
+            raise ImproperlyConfigured(f"Invalid SQLite pragma: {name}={value!r}")
+
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def apply_pragmas(cursor, pragmas):
+    """
+    Set pragmas on a connection.
+
+    Parameters:
+    - cursor (Cursor): A cursor of the connection (Django or sqlite3).
+    - pragmas (dict): The pragmas to be set, in order.
+    """
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+        # Some pragmas (e.g. 'journal_mode') return their new value, to be consumed.
+        cursor.fetchall()
+
+
+def configure_connection(connection):
+    """
+    Apply the pragma profile of its database to a new connection, if it is a SQLite one.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The new connection.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, get_pragmas(connection.settings_dict))
+
+
+def analyze(connection):
+    """
+    Gather the statistics of every table and index, used by the query planner.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The SQLite connection.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def optimize(connection):
+    """
+    Run the optimizations SQLite deems worthwhile, such as refreshing the stale statistics.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The SQLite connection.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA optimize")
+        cursor.fetchall()
+
+
+def incremental_vacuum(connection, pages=0):
+    """
+    Give the free pages of the database back to the file system.
+
+    It must run outside of any transaction, which it would commit.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The SQLite connection.
+    - pages (int): The maximum number of pages to be freed, or 0 for every free page.
+
+    Returns:
+    - int: The number of freed pages, or None if the incremental vacuum is not enabled.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            return None
+
+        cursor.execute("PRAGMA freelist_count")
+        free_pages = cursor.fetchone()[0]
+        # The sqlite3 module only steps this pragma once, freeing a single page, while a script
+        # is stepped to completion.
+        connection.connection.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+        cursor.execute("PRAGMA freelist_count")
+        return free_pages - cursor.fetchone()[0]
+
+
+def full_vacuum(connection):
+    """
+    Rewrite the whole database, enabling the incremental vacuum.
+
+    The database is locked, and its size is needed again as free disk space, while it runs.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The SQLite connection.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum = incremental")
+        cursor.execute("VACUUM")
+
+
+def checkpoint(connection, mode="TRUNCATE"):
+    """
+    Copy the write-ahead log into the database.
+
+    Parameters:
+    - connection (BaseDatabaseWrapper): The SQLite connection.
+    - mode (str): The checkpoint mode, one of CHECKPOINT_MODES. "TRUNCATE" also empties the log.
+
+    Returns:
+    - tuple: Whether the checkpoint was blocked by other connections, the number of pages in the
+             log and the number of pages copied into the database.
+
+    Raises:
+    - ValueError: If the mode is not supported.
+    """
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Checkpoint mode must be one of {list(CHECKPOINT_MODES)}")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA wal_checkpoint({mode})")
+        busy, log_pages, checkpointed_pages = cursor.fetchone()
+
+    return bool(busy), log_pages, checkpointed_pages
@@ -0,0 +1,211 @@
+"""
+Module containing the streaming export of the products catalog.
+
+Products are read from the database in chunks through 'QuerySet.iterator', encoded row by row
+and sent as soon as each chunk is encoded, so that memory stays flat whatever the size of the
+catalog, and the first bytes are sent before the query finishes.
+
+Under ASGI, Django consumes a synchronous streaming body as a whole (with 'sync_to_async(list)')
+before sending it. The chunks are then served by an asynchronous iterator instead, each one
+encoded in the thread running the synchronous code, which keeps the database cursor.
+
+Classes:
+- ExportContentNegotiation(BaseContentNegotiation): Content negotiation ignoring the 'Accept'
+                                                    header of the export requests.
+- EchoBuffer: Pseudo buffer used to stream the CSV writer output.
+
+Functions:
+- iter_ndjson(queryset): Encodes the products as newline-delimited JSON.
+- iter_csv(queryset): Encodes the products as CSV.
+- aiter_chunks(chunks): Iterates over chunks asynchronously.
+- export_products(queryset, output, asynchronous): Builds the streaming response of an export.
+"""
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .serializers import ProductSerializer
+
+CHUNK_SIZE = 2000
+
+OUTPUT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """
+    Content negotiation ignoring the 'Accept' header of the export requests.
+
+    The export body is not rendered by DRF, and its format is chosen through the 'output' query
+    param, so the first renderer is always selected (and only used for error responses).
+
+    Methods:
+    - select_parser(request, parsers): Selects the first parser.
+    - select_renderer(request, renderers, format_suffix): Selects the first renderer.
+    """
+
+    def select_parser(self, request, parsers):
+        """
+        Select the first parser.
+        """
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        """
+        Select the first renderer and its media type.
+        """
+        return (renderers[0], renderers[0].media_type)
+
+
+class EchoBuffer:
+    """
+    Pseudo buffer returning what is written to it, used to stream the CSV writer output.
+    """
+
+    def write(self, value):
+        """
+        Return the written value instead of storing it.
+        """
+        return value
+
+
+def get_columns():
+    """
+    Get the exported columns and their representation functions.
+
+    Each column is represented by the 'to_representation' method of its ProductSerializer
+    field, so that exported values are the same ones returned by the API.
+
+    Returns:
+    - list: List of '(name, to_representation)' tuples, in the ProductSerializer field order.
+    """
+    fields = ProductSerializer().fields
+    return [(name, field.to_representation) for name, field in fields.items()]
+
+
+def iter_rows(queryset, columns):
+    """
+    Iterate over the represented values of the products, read from the database in chunks.
+
+    Parameters:
+    - queryset (QuerySet): The filtered Product queryset.
+    - columns (list): The exported columns, as returned by 'get_columns'.
+
+    Yields:
+    - list: The represented values of a product, in the column order.
+    """
+    names = [name for name, _ in columns]
+    functions = [function for _, function in columns]
+
+    rows = queryset.values_list(*names).iterator(chunk_size=CHUNK_SIZE)
+    for row in rows:
+        yield [
+            None if value is None else function(value)
+            for function, value in zip(functions, row)
+        ]
+
+
+def iter_chunks(lines):
+    """
+    Group encoded lines into chunks, to avoid sending one tiny write per product.
+
+    Parameters:
+    - lines (Iterable): The encoded lines.
+
+    Yields:
+    - str: Chunks made of up to CHUNK_SIZE lines.
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def iter_ndjson(queryset):
+    """
+    Encode the products as newline-delimited JSON objects.
+
+    Parameters:
+    - queryset (QuerySet): The filtered Product queryset.
+
+    Yields:
+    - str: One JSON object per line.
+    """
+    columns = get_columns()
+    names = [name for name, _ in columns]
+
+    for values in iter_rows(queryset, columns):
+        yield json.dumps(
+            dict(zip(names, values)), ensure_ascii=False, separators=(",", ":")
+        ) + "\n"
+
+
+def iter_csv(queryset):
+    """
+    Encode the products as CSV lines, preceded by a header line.
+
+    Parameters:
+    - queryset (QuerySet): The filtered Product queryset.
+
+    Yields:
+    - str: One CSV line per product.
+    """
+    columns = get_columns()
+    writer = csv.writer(EchoBuffer())
+
+    yield writer.writerow([name for name, _ in columns])
+    for values in iter_rows(queryset, columns):
+        yield writer.writerow(values)
+
+
+async def aiter_chunks(chunks):
+    """
+    Iterate over chunks asynchronously, each one being produced in the thread running the
+    synchronous code, so that a single chunk is held in memory at a time.
+
+    Parameters:
+    - chunks (Iterator): The chunks, produced synchronously.
+
+    Yields:
+    - str: The chunks.
+    """
+    while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+        yield chunk
+
+
+OUTPUT_ENCODERS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+
+def export_products(queryset, output, asynchronous=False):
+    """
+    Build the streaming response exporting the given products.
+
+    Parameters:
+    - queryset (QuerySet): The filtered Product queryset.
+    - output (str): The output format, one of OUTPUT_ENCODERS keys.
+    - asynchronous (bool): Whether the response is served under ASGI, and must stream an
+                           asynchronous iterator.
+
+    Returns:
+    - StreamingHttpResponse: The response streaming the encoded products.
+    """
+    chunks = iter_chunks(OUTPUT_ENCODERS[output](queryset))
+    response = StreamingHttpResponse(
+        aiter_chunks(chunks) if asynchronous else chunks,
+        content_type=OUTPUT_CONTENT_TYPES[output],
+    )
+    response["Content-Disposition"] = f'attachment; filename="products.{output}"'
+    return response
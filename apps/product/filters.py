@@ -0,0 +1,77 @@
+"""
+Module containing the filters shared by the Product list and bulk mutation endpoints.
+
+Classes:
+- ProductFilterSerializer(Serializer): Validates the filter query params.
+
+Functions:
+- filter_products(queryset, query_params): Applies the filter query params to a queryset.
+- has_filters(query_params): Tells whether any filter query param was given.
+"""
+from rest_framework import serializers
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    """
+    Serializer validating the filter query params of the Product endpoints.
+
+    Attributes:
+    - name (str): Exact name of the products. Ignored when blank.
+    - min_price (Decimal): Lowest price of the products (inclusive). Ignored when missing.
+    - max_price (Decimal): Highest price of the products (inclusive). Ignored when missing.
+    """
+
+    name = serializers.CharField(required=False, allow_blank=True)
+    min_price = serializers.DecimalField(
+        max_digits=None, decimal_places=None, required=False
+    )
+    max_price = serializers.DecimalField(
+        max_digits=None, decimal_places=None, required=False
+    )
+
+
+def filter_products(queryset, query_params):
+    """
+    Apply the filter query params to a Product queryset.
+
+    Each filter is only applied when given: an unbounded price range would still lead SQLite to
+    read the products through the 'price' index, and then sort them all for an ordering the
+    '(created_at, id)' index could have served. Given filters are backed by the 'price' or the
+    '(name, price)' index.
+
+    Parameters:
+    - queryset (QuerySet): The Product queryset to be filtered.
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - QuerySet: The filtered queryset.
+
+    Raises:
+    - serializers.ValidationError: If any of the filter query params is invalid.
+    """
+    serializer = ProductFilterSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    filters = serializer.validated_data
+
+    if "min_price" in filters:
+        queryset = queryset.filter(price__gte=filters["min_price"])
+    if "max_price" in filters:
+        queryset = queryset.filter(price__lte=filters["max_price"])
+
+    if filters.get("name"):
+        queryset = queryset.filter(name__exact=filters["name"])
+
+    return queryset
+
+
+def has_filters(query_params):
+    """
+    Tell whether any filter query param was given.
+
+    Parameters:
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - bool: True if at least one filter query param holds a value.
+    """
+    return any(query_params.get(field) for field in ProductFilterSerializer().fields)
@@ -0,0 +1,129 @@
+"""
+Management command maintaining a SQLite database.
+
+The maintenance steps are run in the following order (see the 'database' module):
+- analyze: Gathers the statistics of every table and index, for the query planner.
+- optimize: Runs the optimizations SQLite deems worthwhile ('PRAGMA optimize').
+- vacuum: Gives the free pages of the database back to the file system, once its incremental
+          vacuum is enabled (by '--full-vacuum', once for the databases created before it).
+- checkpoint: Copies the write-ahead log into the database, and empties it.
+
+Usage:
+    python manage.py db_maintain --steps optimize vacuum checkpoint --vacuum-pages 1000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.product.database import (
+    CHECKPOINT_MODES,
+    analyze,
+    checkpoint,
+    full_vacuum,
+    incremental_vacuum,
+    optimize,
+)
+
+STEPS = ("analyze", "optimize", "vacuum", "checkpoint")
+
+
+class Command(BaseCommand):
+    """
+    Command maintaining a SQLite database.
+
+    Methods:
+    - add_arguments(parser): Declares the command arguments.
+    - handle(*args, **options): Runs the maintenance steps.
+    """
+
+    help = "Analyze, optimize, vacuum and checkpoint a SQLite database."
+
+    def add_arguments(self, parser):
+        """
+        Declare the command arguments.
+        """
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias of the maintained database. Defaults to 'default'.",
+        )
+        parser.add_argument(
+            "--steps",
+            nargs="+",
+            choices=STEPS,
+            default=STEPS,
+            help="Maintenance steps to be run. Defaults to every step.",
+        )
+        parser.add_argument(
+            "--vacuum-pages",
+            type=int,
+            default=0,
+            help="Maximum number of free pages to be vacuumed. Defaults to 0 (every page).",
+        )
+        parser.add_argument(
+            "--full-vacuum",
+            action="store_true",
+            help="Rewrite the whole database, enabling its incremental vacuum, instead of "
+            "vacuuming it incrementally. The database is locked while it runs.",
+        )
+        parser.add_argument(
+            "--checkpoint-mode",
+            choices=CHECKPOINT_MODES,
+            default="TRUNCATE",
+            help="Mode of the WAL checkpoint. Defaults to 'TRUNCATE'.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the maintenance steps.
+        """
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError(f"Database '{options['database']}' is not a SQLite one.")
+
+        steps = [step for step in STEPS if step in options["steps"]]
+
+        if "analyze" in steps:
+            analyze(connection)
+            self.stdout.write("Analyzed the tables and indexes.")
+
+        if "optimize" in steps:
+            optimize(connection)
+            self.stdout.write("Optimized the database.")
+
+        if "vacuum" in steps:
+            if options["full_vacuum"]:
+                full_vacuum(connection)
+                self.stdout.write(
+                    "Rewrote the database, enabling its incremental vacuum."
+                )
+            else:
+                freed_pages = incremental_vacuum(connection, options["vacuum_pages"])
+                if freed_pages is None:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            "Skipped the vacuum: the incremental vacuum is not enabled "
+                            "(run with '--full-vacuum' once)."
+                        )
+                    )
+                else:
+                    self.stdout.write(f"Vacuumed {freed_pages} free pages.")
+
+        if "checkpoint" in steps:
+            busy, log_pages, checkpointed_pages = checkpoint(
+                connection, options["checkpoint_mode"]
+            )
+            if log_pages < 0:
+                self.stdout.write(
+                    "Skipped the checkpoint: the database is not in WAL mode."
+                )
+            elif busy:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Checkpointed {checkpointed_pages} of {log_pages} log pages, "
+                        "blocked by other connections."
+                    )
+                )
+            else:
+                self.stdout.write(f"Checkpointed {checkpointed_pages} log pages.")
+
+        self.stdout.write(self.style.SUCCESS("Maintained the database."))
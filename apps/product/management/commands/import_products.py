@@ -0,0 +1,273 @@
+"""
+Management command importing products from a CSV or NDJSON file.
+
+The file is read as a stream and split into batches. Every row is validated with the same rules
+as ProductSerializer (see the 'validators' module), without building a serializer per row,
+optionally in a pool of worker processes. The valid rows of each batch are inserted with a
+single 'bulk_create' call inside their own transaction, and the rejected rows are written, along
+with their errors, to an optional NDJSON side file.
+
+Usage:
+    python manage.py import_products catalog.csv --batch-size 5000 --workers 4 \
+        --rejects rejected.ndjson
+"""
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.product.models import Product
+from apps.product.signals import products_changed
+from apps.product.validators import clean_product
+
+FORMATS = ("csv", "ndjson")
+
+
+def read_csv(stream):
+    """
+    Read the rows of a CSV stream, whose first line holds the field names.
+
+    Parameters:
+    - stream (TextIO): The CSV stream.
+
+    Yields:
+    - tuple: A '(line_number, row)' tuple per row.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(stream):
+    """
+    Read the rows of a newline-delimited JSON stream, skipping blank lines.
+
+    Lines that are not valid JSON objects are yielded as a string, to be rejected.
+
+    Parameters:
+    - stream (TextIO): The NDJSON stream.
+
+    Yields:
+    - tuple: A '(line_number, row)' tuple per row.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = line.rstrip("\n")
+
+        yield line_number, row
+
+
+READERS = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+def validate_batch(batch):
+    """
+    Validate a batch of rows.
+
+    This function runs in the worker processes when a pool is used, so it only takes and
+    returns picklable values.
+
+    Parameters:
+    - batch (list): List of '(line_number, row)' tuples.
+
+    Returns:
+    - tuple: A '(valid, rejected)' tuple, where 'valid' is the list of the cleaned product data
+             and 'rejected' the list of '(line_number, row, errors)' tuples of the invalid rows.
+    """
+    valid = []
+    rejected = []
+
+    for line_number, row in batch:
+        if not isinstance(row, dict):
+            rejected.append(
+                (line_number, row, {"non_field_errors": ["Expected a JSON object"]})
+            )
+            continue
+
+        data, errors = clean_product(row)
+        if errors:
+            rejected.append((line_number, row, errors))
+        else:
+            valid.append(data)
+
+    return valid, rejected
+
+
+def iter_batches(rows, batch_size):
+    """
+    Split an iterable of rows into lists of up to 'batch_size' rows.
+
+    Parameters:
+    - rows (Iterable): The rows to be split.
+    - batch_size (int): The maximum size of each batch.
+
+    Yields:
+    - list: The batches.
+    """
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def validate_in_pool(batches, workers):
+    """
+    Validate batches in a pool of worker processes, keeping the input order.
+
+    At most two batches per worker are in flight at a time, so that the file is still read as
+    a stream.
+
+    Parameters:
+    - batches (Iterable): The batches to be validated.
+    - workers (int): The number of worker processes.
+
+    Yields:
+    - tuple: The result of 'validate_batch' for each batch.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(validate_batch, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+class Command(BaseCommand):
+    """
+    Command importing products from a CSV or NDJSON file, in validated batches.
+
+    Methods:
+    - add_arguments(parser): Declares the command arguments.
+    - handle(*args, **options): Runs the import.
+    """
+
+    help = "Import products from a CSV or NDJSON file, in validated batches."
+
+    def add_arguments(self, parser):
+        """
+        Declare the command arguments.
+        """
+        parser.add_argument(
+            "path", help="Path of the file to be imported, or '-' for the stdin."
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format of the file. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows validated and inserted per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Number of worker processes validating the rows. "
+            "Defaults to 0, validating them in the command process.",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Path of the NDJSON file receiving the rejected rows and their errors.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the import.
+        """
+        file_format = options["format"] or Path(options["path"]).suffix.lstrip(".")
+        if file_format not in FORMATS:
+            raise CommandError(
+                f"Unknown file format '{file_format}', use --format with one of {FORMATS}"
+            )
+
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        if options["path"] == "-":
+            source = sys.stdin
+        else:
+            source = open(options["path"], encoding="utf-8", newline="")
+
+        rejects = None
+        if options["rejects"]:
+            rejects = open(options["rejects"], "w", encoding="utf-8")
+
+        try:
+            imported, rejected = self.import_rows(
+                READERS[file_format](source), rejects, options
+            )
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if rejects is not None:
+                rejects.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} products, rejected {rejected} rows."
+            )
+        )
+
+    def import_rows(self, rows, rejects, options):
+        """
+        Validate and insert the rows, batch by batch.
+
+        Parameters:
+        - rows (Iterable): The '(line_number, row)' tuples read from the file.
+        - rejects (TextIO): The side file receiving the rejected rows, or None.
+        - options (dict): The command options.
+
+        Returns:
+        - tuple: The numbers of imported products and of rejected rows.
+        """
+        batches = iter_batches(rows, options["batch_size"])
+
+        if options["workers"] > 0:
+            results = validate_in_pool(batches, options["workers"])
+        else:
+            results = map(validate_batch, batches)
+
+        imported = 0
+        rejected = 0
+
+        for valid, invalid in results:
+            with transaction.atomic():
+                products = Product.objects.sharded().bulk_create(
+                    [Product(**data) for data in valid],
+                    batch_size=options["batch_size"],
+                )
+                products_changed.send(
+                    sender=Product, action="create", instances=products
+                )
+
+            imported += len(valid)
+            rejected += len(invalid)
+
+            if rejects is not None:
+                for line_number, row, errors in invalid:
+                    rejects.write(
+                        json.dumps({"line": line_number, "row": row, "errors": errors})
+                        + "\n"
+                    )
+
+        return imported, rejected
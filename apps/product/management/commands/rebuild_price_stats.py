@@ -0,0 +1,44 @@
+"""
+Management command rebuilding the price statistics summary of the products.
+
+The summary is kept in sync with the products table by the Product signals, so this command is
+only needed after products were written without sending them (e.g. raw SQL or restored dumps).
+
+Usage:
+    python manage.py rebuild_price_stats
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.product.stats import rebuild_price_stats
+
+
+class Command(BaseCommand):
+    """
+    Command rebuilding the price statistics summary from the products table.
+
+    Methods:
+    - add_arguments(parser): Declares the command arguments.
+    - handle(*args, **options): Runs the rebuild.
+    """
+
+    help = "Rebuild the price statistics summary from the products table."
+
+    def add_arguments(self, parser):
+        """
+        Declare the command arguments.
+        """
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias of the database whose summary is rebuilt. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the rebuild.
+        """
+        with transaction.atomic(using=options["database"]):
+            rebuild_price_stats(using=options["database"])
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the product price statistics."))
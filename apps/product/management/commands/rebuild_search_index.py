@@ -0,0 +1,45 @@
+"""
+Management command rebuilding the full-text index of the products.
+
+The index is kept in sync with the products table by triggers, so this command is only needed to
+index products written while the triggers were missing (e.g. restored from a dump), or to merge
+the index segments after many changes.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.product.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Command rebuilding the full-text index of the products from the products table.
+
+    Methods:
+    - add_arguments(parser): Declares the command arguments.
+    - handle(*args, **options): Runs the rebuild.
+    """
+
+    help = "Rebuild the full-text index of the products from the products table."
+
+    def add_arguments(self, parser):
+        """
+        Declare the command arguments.
+        """
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias of the database whose index is rebuilt. Defaults to 'default'.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the rebuild.
+        """
+        with transaction.atomic(using=options["database"]):
+            rebuild_search_index(using=options["database"])
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the product search index."))
@@ -0,0 +1,212 @@
+"""
+Management command seeding the database with synthetic products, e.g. for load tests.
+
+The products are generated from a seeded random generator, so that a given '--seed' and
+'--count' always produce the same catalog:
+- Names combine an adjective, a material and a product type, whose frequencies follow Zipf's
+  law, so that a few names are shared by many products, like the best-selling ranges of a real
+  catalog, and most names by few of them.
+- Descriptions are one to three sentences built from templates; a few products have none.
+- Prices follow a log-normal distribution, the usual shape of retail prices, bounded by the
+  validated price range, and mostly end in .99 or .00.
+
+The products are inserted with a single 'bulk_create' call per batch, each one in its own
+transaction, without announcing them one by one: a single 'products_changed' signal is sent once
+the seeding ends, which rebuilds the price statistics and invalidates the caches and the
+autocomplete index at once.
+
+Usage:
+    python manage.py seed_products --count 1000000 --batch-size 10000 --seed 42 --clear
+"""
+import math
+import random
+from decimal import Decimal
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.product.models import Product
+from apps.product.signals import products_changed
+from apps.product.validators import PRICE_MIN_VALUE
+
+ADJECTIVES = (
+    "Classic Modern Compact Deluxe Rustic Premium Vintage Ergonomic Portable Sleek "
+    "Sturdy Elegant Foldable Smart Handmade Minimalist Industrial Cozy Professional "
+    "Eco"
+).split()
+MATERIALS = (
+    "Oak Steel Leather Cotton Bamboo Glass Walnut Aluminum Ceramic Wool Marble Linen "
+    "Copper Pine Velvet"
+).split()
+PRODUCT_TYPES = (
+    "Chair Table Lamp Desk Shelf Sofa Cabinet Stool Bench Mirror Rug Bed Wardrobe "
+    "Dresser Armchair Bookcase Ottoman Clock Vase Planter"
+).split()
+SENTENCES = (
+    "Made of {material} with a {adjective} finish.",
+    "A {adjective} {product_type} that fits any room.",
+    "Designed for daily use and built to last.",
+    "Easy to assemble, with every tool included.",
+    "Ships in recyclable packaging.",
+    "Covered by a two-year warranty.",
+    "Available while stocks last.",
+    "Pairs well with the rest of the {material} range.",
+)
+NO_DESCRIPTION_RATE = 0.05
+
+# Log-normal prices: half of them below the median, and a long tail of expensive products.
+PRICE_MEDIAN = 2500
+PRICE_SIGMA = 0.9
+PRICE_MAX_VALUE = Decimal("99999999.99")
+PRICE_ENDINGS = ((Decimal("0.99"), 0.6), (Decimal("0.00"), 0.25), (None, 0.15))
+
+
+def zipf_weights(size, exponent=1.1):
+    """
+    Return the weights of a Zipf distribution over ranked choices.
+
+    Parameters:
+    - size (int): The number of choices.
+    - exponent (float): The exponent of the distribution, skewing it as it grows.
+
+    Returns:
+    - list: The weight of every choice, by rank.
+    """
+    return [1 / rank**exponent for rank in range(1, size + 1)]
+
+
+def build_price(rng):
+    """
+    Draw a price from the log-normal distribution, with a usual ending.
+
+    Parameters:
+    - rng (Random): The random generator.
+
+    Returns:
+    - Decimal: The price, within the validated price range.
+    """
+    value = rng.lognormvariate(math.log(PRICE_MEDIAN), PRICE_SIGMA)
+    ending = rng.choices(
+        [ending for ending, _ in PRICE_ENDINGS],
+        [weight for _, weight in PRICE_ENDINGS],
+    )[0]
+    if ending is None:
+        ending = Decimal(rng.randrange(100)) / 100
+
+    price = Decimal(int(value)) + ending
+    return min(max(price, Decimal(PRICE_MIN_VALUE)), PRICE_MAX_VALUE)
+
+
+def generate_products(count, seed=None):
+    """
+    Generate the data of synthetic products.
+
+    Parameters:
+    - count (int): The number of products.
+    - seed (int): The seed of the random generator, or None for a random catalog.
+
+    Yields:
+    - dict: The 'name', 'description' and 'price' of a product.
+    """
+    rng = random.Random(seed)
+    words_and_weights = [
+        (words, zipf_weights(len(words)))
+        for words in (ADJECTIVES, MATERIALS, PRODUCT_TYPES)
+    ]
+
+    for _ in range(count):
+        adjective, material, product_type = (
+            rng.choices(words, weights)[0] for words, weights in words_and_weights
+        )
+        words = {
+            "adjective": adjective.lower(),
+            "material": material.lower(),
+            "product_type": product_type.lower(),
+        }
+
+        description = None
+        if rng.random() >= NO_DESCRIPTION_RATE:
+            sentences = rng.sample(SENTENCES, rng.randint(1, 3))
+            description = " ".join(sentence.format(**words) for sentence in sentences)
+
+        yield {
+            "name": f"{adjective} {material} {product_type}",
+            "description": description,
+            "price": build_price(rng),
+        }
+
+
+class Command(BaseCommand):
+    """
+    Command seeding the database with synthetic products, in batches.
+
+    Methods:
+    - add_arguments(parser): Declares the command arguments.
+    - handle(*args, **options): Runs the seeding.
+    """
+
+    help = "Seed the database with synthetic products, e.g. for load tests."
+
+    def add_arguments(self, parser):
+        """
+        Declare the command arguments.
+        """
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10000,
+            help="Number of products to be created (e.g. 10000 to 10000000).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of products inserted per transaction.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Seed of the random generator, making the catalog reproducible.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete every product before seeding.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Run the seeding.
+        """
+        if options["count"] < 1:
+            raise CommandError("--count must be a positive integer")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        if options["clear"]:
+            products = Product.objects.sharded()
+            with transaction.atomic():
+                deleted = products._raw_delete(products.db)
+                products_changed.send(sender=Product, action="delete", instances=None)
+            self.stdout.write(f"Deleted {deleted} products.")
+
+        rows = generate_products(options["count"], options["seed"])
+        created = 0
+        try:
+            while batch := list(islice(rows, options["batch_size"])):
+                with transaction.atomic():
+                    products = Product.objects.sharded().bulk_create(
+                        [Product(**data) for data in batch]
+                    )
+
+                created += len(products)
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"Created {created} products.")
+        finally:
+            # Also announces the batches committed before a failure.
+            with transaction.atomic():
+                products_changed.send(sender=Product, action="create", instances=None)
+
+        self.stdout.write(self.style.SUCCESS(f"Seeded {created} products."))
@@ -0,0 +1,42 @@
+"""
+This Django migration class was generated by Django 5.2 on 2026-10-18.
+It represents a database migration that adds to the 'Product' model the indexes backing the
+filters and orderings of the product list.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Attributes:
+    - dependencies: A list of dependencies, indicating other migrations that must be applied
+    before this one.
+    - operations: A list of migration operations, including the creation of the indexes.
+
+    The following indexes are created on the 'Product' model:
+    - product_price_idx: Index on 'price', backing the price range filter.
+    - product_name_price_idx: Index on 'name' and 'price', backing the name filter combined
+    with the price range.
+    - product_created_at_id_idx: Index on 'created_at' and 'id', backing the list ordering.
+    """
+
+    dependencies = [
+        ("product", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["price"], name="product_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["name", "price"], name="product_name_price_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["created_at", "id"], name="product_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+"""
+This Django migration class was written by hand for Django 5.2 on 2026-10-18.
+It represents a database migration that creates the SQLite FTS5 full-text index of the 'Product'
+model, along with the triggers keeping it in sync with the products table, and fills it with the
+existing products.
+"""
+from django.db import migrations
+
+FTS_TABLE = "product_product_fts"
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        name, description,
+        content='product_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON product_product BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON product_product BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE OF name, description ON product_product
+    BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE} (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+class Migration(migrations.Migration):
+    """
+    Attributes:
+    - dependencies: A list of dependencies, indicating other migrations that must be applied
+    before this one.
+    - operations: A list of migration operations, including the creation of the full-text index.
+
+    The following objects are created in the database:
+    - product_product_fts: FTS5 virtual table indexing the 'name' and 'description' of the
+    products, reading their content from the products table (external content table).
+    - product_product_fts_insert, product_product_fts_delete and product_product_fts_update:
+    Triggers indexing the inserted, deleted and updated products, whatever the code path
+    (ORM, bulk operations or raw SQL).
+    """
+
+    dependencies = [
+        ("product", "0002_product_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_SQL, reverse_sql=DROP_SQL),
+    ]
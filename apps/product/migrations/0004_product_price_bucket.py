@@ -0,0 +1,65 @@
+"""
+This Django migration class was generated by Django 5.2 on 2026-10-18.
+It represents a database migration that creates the 'ProductPriceBucket' summary table, serving
+the catalog price statistics, and fills it from the existing products.
+"""
+from django.db import migrations, models
+
+
+def fill_price_buckets(apps, schema_editor):
+    """
+    Fill the summary table from the existing products.
+
+    Parameters:
+    - apps (StateApps): The historical models.
+    - schema_editor (BaseDatabaseSchemaEditor): The schema editor of the migrated database.
+    """
+    # pylint: disable=import-outside-toplevel
+    from apps.product.stats import price_cents, summarize
+
+    product_model = apps.get_model("product", "Product")
+    bucket_model = apps.get_model("product", "ProductPriceBucket")
+    using = schema_editor.connection.alias
+
+    summary = summarize(price_cents(product_model.objects.using(using)))
+    bucket_model.objects.using(using).bulk_create(
+        bucket_model(
+            bucket=bucket, count=count, total=total, lowest=lowest, highest=highest
+        )
+        for bucket, (count, total, lowest, highest) in summary.items()
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Attributes:
+    - dependencies: A list of dependencies, indicating other migrations that must be applied
+    before this one.
+    - operations: A list of migration operations, including the creation and the filling of the
+    summary table.
+
+    The following table is created in the database:
+    - product_productpricebucket: Number of products, sum of their prices, and lowest and highest
+    price (in cents) of each price bucket.
+    """
+
+    dependencies = [
+        ("product", "0003_product_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductPriceBucket",
+            fields=[
+                (
+                    "bucket",
+                    models.PositiveSmallIntegerField(primary_key=True, serialize=False),
+                ),
+                ("count", models.BigIntegerField()),
+                ("total", models.BigIntegerField()),
+                ("lowest", models.BigIntegerField()),
+                ("highest", models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(fill_price_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+"""
+This Django migration class was generated by Django 5.2 on 2026-10-18.
+It represents a database migration that creates the 'ProductSequence' table, handing out the
+product ids when the products are sharded.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Attributes:
+    - dependencies: A list of dependencies, indicating other migrations that must be applied
+    before this one.
+    - operations: A list of migration operations, including the creation of the sequence table.
+
+    The following table is created in the database (but not in the shards):
+    - product_productsequence: Last product id reserved across the shards.
+    """
+
+    dependencies = [
+        ("product", "0004_product_price_bucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_id", models.BigIntegerField()),
+            ],
+        ),
+    ]
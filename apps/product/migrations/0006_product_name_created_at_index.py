@@ -0,0 +1,34 @@
+"""
+This Django migration class was generated by Django 5.2 on 2026-10-18.
+It represents a database migration that adds to the 'Product' model the index backing the name
+filter with the default ordering of the product list.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Attributes:
+    - dependencies: A list of dependencies, indicating other migrations that must be applied
+    before this one.
+    - operations: A list of migration operations, including the creation of the index.
+
+    The following index is created on the 'Product' model:
+    - product_name_created_at_id_idx: Index on 'name', 'created_at' and 'id', backing the name
+    filter combined with the 'created_at' ordering, so that its pages are read in order rather
+    than sorted.
+    """
+
+    dependencies = [
+        ("product", "0005_product_sequence"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["name", "created_at", "id"],
+                name="product_name_created_at_id_idx",
+            ),
+        ),
+    ]
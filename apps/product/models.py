@@ -1,8 +1,99 @@
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
+from django.db.models import Max
+
+from .sharding import ID_BLOCK_SIZE, IdBlocks, ShardedQuerySet, get_shards, shard_for
 
 objects = models.Manager()
 
 
+class ProductQuerySet(models.QuerySet):
+    """
+    Queryset of the products.
+
+    Methods:
+    - delete(): Deletes the products with a single statement, announcing them with a single
+                'products_changed' signal.
+    """
+
+    def delete(self):
+        """
+        Delete the products with a single DELETE statement, in the transaction of the caller if
+        any.
+
+        Unlike 'QuerySet.delete', the products are not fetched again to send their
+        'post_delete' signals, nor deleted by batches of primary keys (Product has no relation
+        to cascade). Their id, name and price are read by a single query beforehand, and
+        announced by a single 'products_changed' signal, so that its receivers update the
+        caches, the price statistics and the autocomplete index with these products only.
+
+        Returns:
+        - tuple: The number of deleted objects, and their number per model.
+
+        Raises:
+        - TypeError: If the queryset is sliced.
+        """
+        # pylint: disable=import-outside-toplevel
+        from .signals import products_changed
+
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with delete().")
+
+        using = self._db or router.db_for_write(self.model)
+        products = self.using(using).order_by()
+        with transaction.atomic(using=using):
+            instances = list(products.only("id", "name", "price"))
+            deleted = products._raw_delete(using)
+            products_changed.send(
+                sender=self.model, action="delete", instances=instances
+            )
+
+        return deleted, {self.model._meta.label: deleted}
+
+
+class ProductManager(models.Manager.from_queryset(ProductQuerySet)):
+    """
+    Manager of the products, spreading their queries over the shards when sharded (see the
+    'sharding' module).
+
+    Methods:
+    - sharded(): Returns the products of every shard.
+    - shard(pk): Returns the products of the shard owning a product id.
+    """
+
+    def sharded(self):
+        """
+        Return the products of every shard, whose reads are scattered and gathered.
+
+        Returns:
+        - ShardedQuerySet | QuerySet: The products of every shard, or of the database when not
+                                      sharded.
+        """
+        shards = get_shards()
+        if not shards:
+            return self.all()
+
+        return ShardedQuerySet(
+            {alias: self.using(alias) for alias in shards}, product_ids.allocate
+        )
+
+    def shard(self, pk):
+        """
+        Return the products of the shard owning a product id, to read that product.
+
+        Parameters:
+        - pk (int | str): The id of the product.
+
+        Returns:
+        - QuerySet: The products of its shard, or of the database when not sharded.
+
+        Raises:
+        - ValidationError: If the id is not an integer.
+        """
+        if not get_shards():
+            return self.all()
+        return self.using(shard_for(self.model._meta.pk.to_python(pk)))
+
+
 class Product(models.Model):
     """
     Model representing a product.
@@ -19,7 +110,14 @@ class Product(models.Model):
     - updated_at (DateTime): The date and time when the product was last updated,
                              automatically updated to the current date and time on each update.
 
+    Indexes:
+    - price: Backs the 'min_price'/'max_price' range filter and the price ordering.
+    - (name, price): Backs the exact 'name' filter combined with the price range or ordering.
+    - (name, created_at, id): Backs the exact 'name' filter with the default ordering.
+    - (created_at, id): Backs the default, deterministic ordering of the product list.
+
     Methods:
+    - save(*args, **kwargs): Saves the product, in the shard owning its id when sharded.
     - __str__(): Returns a string representation of the product with its name,
                  description, and price.
     """
@@ -30,7 +128,105 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["price"], name="product_price_idx"),
+            models.Index(fields=["name", "price"], name="product_name_price_idx"),
+            models.Index(
+                fields=["name", "created_at", "id"],
+                name="product_name_created_at_id_idx",
+            ),
+            models.Index(fields=["created_at", "id"], name="product_created_at_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the product. When sharded, a new product is given its id before being inserted,
+        and the product is written to the shard owning its id, whatever database it was meant
+        for (e.g. 'default' for 'Product.objects.create').
+        """
+        if get_shards():
+            if self.pk is None:
+                self.pk = product_ids.allocate(1)[0]
+                kwargs["force_insert"] = True
+            kwargs["using"] = shard_for(self.pk)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return (
             f"Name: {self.name} | Description: {self.description} | Price: {self.price}"
         )
+
+
+class ProductPriceBucket(models.Model):
+    """
+    Model summarizing the products of a price bucket, serving the catalog statistics.
+
+    The rows are maintained by the 'stats' module: they are not meant to be written directly.
+    Prices are stored in cents, as integers, so that their sum stays exact.
+
+    Attributes:
+    - bucket (int): The index of the price bucket (see 'stats.BUCKET_EDGES').
+    - count (int): The number of products whose price falls in the bucket.
+    - total (int): The sum of their prices, in cents.
+    - lowest (int): The lowest of their prices, in cents.
+    - highest (int): The highest of their prices, in cents.
+    """
+
+    bucket = models.PositiveSmallIntegerField(primary_key=True)
+    count = models.BigIntegerField()
+    total = models.BigIntegerField()
+    lowest = models.BigIntegerField()
+    highest = models.BigIntegerField()
+
+
+class ProductSequence(models.Model):
+    """
+    Model holding the last product id handed out, so that the ids stay unique across the shards.
+
+    The single row is stored in the 'default' database, and is only written when sharded, by
+    the 'product_ids' allocator, a block of ids at a time.
+
+    Attributes:
+    - last_id (int): The last reserved product id.
+
+    Methods:
+    - reserve(count): Reserves a block of ids.
+    """
+
+    last_id = models.BigIntegerField()
+
+    @classmethod
+    def reserve(cls, count):
+        """
+        Reserve a block of ids in the 'default' database, in the transaction of the caller if
+        any.
+
+        The block starts after the highest id stored in the databases as well, so that the
+        products created before the sharding keep their ids, and the ids of products committed
+        to a shard while the reservation was rolled back are never handed out again.
+
+        Parameters:
+        - count (int): The number of ids.
+
+        Returns:
+        - tuple: The first and last ids of the block.
+        """
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            sequence, _ = cls.objects.using(DEFAULT_DB_ALIAS).get_or_create(
+                pk=1, defaults={"last_id": 0}
+            )
+            highest = [
+                Product.objects.using(alias).aggregate(id=Max("id"))["id"] or 0
+                for alias in {DEFAULT_DB_ALIAS, *get_shards()}
+            ]
+            first = max(sequence.last_id, *highest) + 1
+            sequence.last_id = first + count - 1
+            sequence.save(update_fields=["last_id"])
+
+        return first, sequence.last_id
+
+
+product_ids = IdBlocks(ProductSequence.reserve, ID_BLOCK_SIZE)
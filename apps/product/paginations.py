@@ -1,4 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+import sys
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class CustomNumberPagination(PageNumberPagination):
@@ -15,9 +21,339 @@ class CustomNumberPagination(PageNumberPagination):
     - max_page_size (int): The maximum allowed value for the page size. Defaults to 15.
     - page_query_param (str): The query parameter to determine the requested page number.
                             Defaults to "page".
+
+    - known_count (int): The number of items, when already known (e.g. cached or estimated by
+                         the view), so that no count query is made. Defaults to None.
+    - count_exact (bool): Whether 'known_count' is exact, rather than estimated. Defaults to
+                          True.
+
+    Methods:
+    - paginate_queryset(queryset, request, view=None): Returns the objects of the requested page,
+                                                       counting them unless the count is known.
+    - apaginate_queryset(queryset, request, view=None): Async version of 'paginate_queryset',
+                                                        querying with the async ORM.
+    - get_paginated_response(data): Returns the page, along with whether its count is exact.
+    - get_paginated_response_schema(schema): Returns the schema of the paginated response.
     """
 
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 15
     page_query_param = "page"
+    known_count = None
+    count_exact = True
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate a queryset, using the known count rather than counting the items.
+
+        When the known count is estimated, the requested page is fetched along with the first
+        item of the following one. The count is then corrected to cover them, and made exact on
+        the last page, so that the page links stay consistent with the actual items.
+
+        Parameters:
+        - queryset (QuerySet): The ordered queryset to be paginated.
+        - request (Request): The request.
+        - view (View): The view.
+
+        Returns:
+        - list: The objects of the requested page.
+
+        Raises:
+        - NotFound: If the requested page does not exist.
+        """
+        if self.known_count is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        paginator, number, page_slice = self.start_page(queryset, request)
+        return self.end_page(paginator, number, list(queryset[page_slice]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate a queryset with the async ORM, for the async views.
+
+        The count (unless known) and the page are fetched with 'acount' and async iteration, and
+        the page is then exposed like 'paginate_queryset' does, so that 'get_paginated_response'
+        builds the same response.
+
+        Parameters:
+        - queryset (QuerySet): The ordered queryset to be paginated.
+        - request (Request): The request.
+        - view (View): The view.
+
+        Returns:
+        - list: The objects of the requested page.
+
+        Raises:
+        - NotFound: If the requested page does not exist.
+        """
+        if self.known_count is None:
+            self.known_count = await queryset.acount()
+            self.count_exact = True
+
+        paginator, number, page_slice = self.start_page(queryset, request)
+        object_list = [obj async for obj in queryset[page_slice]]
+        return self.end_page(paginator, number, object_list)
+
+    def start_page(self, queryset, request):
+        """
+        Validate the requested page number against the known count.
+
+        An estimated count does not bound the page number, as more items than estimated may
+        exist: pages past the actual items are detected once fetched.
+
+        Parameters:
+        - queryset (QuerySet): The ordered queryset to be paginated.
+        - request (Request): The request.
+
+        Returns:
+        - tuple: The Django paginator, the page number and the slice of the items to be fetched.
+
+        Raises:
+        - NotFound: If the requested page does not exist.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = self.known_count
+
+        page_number = self.get_page_number(request, paginator)
+        if not self.count_exact:
+            paginator.count = sys.maxsize
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            ) from exc
+
+        bottom = (number - 1) * page_size
+        top = bottom + page_size + (0 if self.count_exact else 1)
+        return paginator, number, slice(bottom, top)
+
+    def end_page(self, paginator, number, object_list):
+        """
+        Expose the fetched page, correcting an estimated count.
+
+        Parameters:
+        - paginator (Paginator): The Django paginator.
+        - number (int): The page number.
+        - object_list (list): The fetched items.
+
+        Returns:
+        - list: The objects of the requested page.
+
+        Raises:
+        - NotFound: If the requested page is past the actual items.
+        """
+        if not self.count_exact:
+            paginator = self.django_paginator_class(
+                paginator.object_list, paginator.per_page
+            )
+            bottom = (number - 1) * paginator.per_page
+            if len(object_list) > paginator.per_page:
+                paginator.count = max(self.known_count, bottom + len(object_list))
+                object_list = object_list[: paginator.per_page]
+            elif object_list or number == 1:
+                paginator.count = bottom + len(object_list)
+                self.count_exact = True
+            else:
+                raise NotFound(
+                    self.invalid_page_message.format(
+                        page_number=number,
+                        message=paginator.error_messages["no_results"],
+                    )
+                )
+
+        self.page = Page(object_list, number, paginator)
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return object_list
+
+    def get_paginated_response(self, data):
+        """
+        Return the page, along with whether its count is exact or estimated.
+
+        Parameters:
+        - data (list): The serialized objects of the page.
+
+        Returns:
+        - Response: The paginated response.
+        """
+        response = super().get_paginated_response(data)
+        response.data = {
+            "count": response.data["count"],
+            "count_exact": self.count_exact,
+            **response.data,
+        }
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Return the schema of the paginated response.
+
+        Parameters:
+        - schema (dict): The schema of the serialized objects.
+
+        Returns:
+        - dict: The schema of the paginated response.
+        """
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        response_schema["properties"] = {
+            "count": properties["count"],
+            "count_exact": {"type": "boolean", "example": True},
+            **properties,
+        }
+        return response_schema
+
+
+class CustomCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination class based on CursorPagination in Django Rest Framework.
+
+    Pages are addressed by an opaque cursor holding the position of the last item
+    seen, as a '(value, id)' pair of the ordering columns. Every page is fetched
+    with an index range scan starting at that position, so deep pages cost the
+    same as the first one, and no total count is ever computed.
+
+    Attributes:
+    - page_size (int): The number of items to include on each page. Defaults to 5.
+    - page_size_query_param (str): The query parameter to determine the page size.
+                                  Defaults to "page_size".
+    - max_page_size (int): The maximum allowed value for the page size. Defaults to 15.
+    - cursor_query_param (str): The query parameter holding the opaque cursor.
+                              Defaults to "cursor".
+    - ordering (tuple): The ordering used when none is requested. Defaults to
+                        ("created_at", "id").
+
+    Methods:
+    - paginate_queryset(queryset, request, view): Returns the page following (or
+                                                  preceding) the requested cursor.
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 15
+    cursor_query_param = "cursor"
+    ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate the queryset using the composite '(value, id)' keyset position.
+
+        Parameters:
+        - queryset (QuerySet): The filtered queryset to paginate.
+        - request (Request): The request object holding the cursor.
+        - view (APIView): The view requesting the pagination.
+
+        Returns:
+        - list: The items of the requested page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(current_position, ordering)
+            )
+
+        try:
+            results = list(queryset[offset : offset + self.page_size + 1])
+        except (DjangoValidationError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_position_filter(self, position, ordering):
+        """
+        Build the filter selecting the items placed after 'position' in 'ordering'.
+
+        Parameters:
+        - position (str): The encoded '(value, id)' position of the cursor.
+        - ordering (tuple): The ordering the queryset is sorted by.
+
+        Returns:
+        - Q: The keyset condition, led by a range on the first ordering column so
+             the database can seek straight into the index.
+
+        Raises:
+        - NotFound: If the position cannot be decoded.
+        """
+        value, separator, pk = position.rpartition("|")
+        if not separator or not pk.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+
+        field = ordering[0].lstrip("-")
+        direction = "lt" if ordering[0].startswith("-") else "gt"
+        inclusive = "lte" if direction == "lt" else "gte"
+
+        return Q(**{f"{field}__{inclusive}": value}) & (
+            Q(**{f"{field}__{direction}": value}) | Q(**{f"id__{direction}": pk})
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        field_name = ordering[0].lstrip("-")
+        if isinstance(instance, dict):
+            return f"{instance[field_name]}|{instance['id']}"
+        return f"{getattr(instance, field_name)}|{instance.id}"
+
+
+def reverse_ordering(ordering):
+    """
+    Reverse the direction of every column in an ordering tuple.
+
+    Parameters:
+    - ordering (tuple): The ordering tuple, e.g. ("price", "id").
+
+    Returns:
+    - tuple: The reversed ordering tuple, e.g. ("-price", "-id").
+    """
+    return tuple(
+        column[1:] if column.startswith("-") else f"-{column}" for column in ordering
+    )
@@ -0,0 +1,221 @@
+"""
+Module containing the renderers of the API responses.
+
+Responses are rendered as JSON by DRF's 'JSONRenderer', built on the standard 'json' module.
+The JSON renderer of this module renders them with 'orjson' instead, which encodes the same data
+several times faster, and falls back to 'JSONRenderer' when 'orjson' is not installed.
+
+Responses can also be rendered in the compact binary formats MessagePack and CBOR, selected
+through the 'Accept' header ('application/msgpack' or 'application/cbor'), for the service
+consumers that do not need JSON. Those formats carry the same values as JSON: prices are
+decimal strings (e.g. "650.50") and timestamps are RFC 3339 strings (e.g.
+"2024-01-02T03:04:05.678000Z"), which both keep their exact value. Their renderers are enabled
+in the settings only when their library ('msgpack' or 'cbor2') is installed.
+
+Classes:
+- ORJSONRenderer(JSONRenderer): JSON renderer encoding with 'orjson'.
+- MessagePackRenderer(BaseRenderer): MessagePack renderer encoding with 'msgpack'.
+- CBORRenderer(BaseRenderer): CBOR renderer encoding with 'cbor2'.
+
+Functions:
+- encode_default(obj): Represents the values the binary formats do not encode natively.
+"""
+import decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+json_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding with 'orjson', with the output of DRF's 'JSONRenderer'.
+
+    The types 'orjson' encodes natively (str, int, float, bool, None, dict, list, tuple, UUID)
+    are encoded the same way as the 'json' module does, and every other type (Decimal, datetime,
+    date, time, lazy strings, querysets...) is handed to the 'default' method of DRF's
+    'JSONEncoder', so that e.g. aware datetimes end with 'Z' and Decimals become numbers.
+    Keys that are not strings are converted like the 'json' module does.
+
+    The renderer falls back to 'JSONRenderer' when 'orjson' is not installed, when an indented
+    or non-compact output or ASCII-only output is requested, and when 'orjson' fails to encode
+    the data (e.g. integers beyond 64 bits), so that the output is always the one of
+    'JSONRenderer'. Floats are the only exception: those written in exponent notation may be
+    written differently (e.g. '1e-7' rather than '1e-07', with the same value), and non-finite
+    ones are rendered as 'null' instead of raising an error. The API represents its Decimals
+    and datetimes as strings anyway.
+
+    Methods:
+    - render(data, accepted_media_type, renderer_context): Renders data as JSON bytes.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data as JSON bytes.
+
+        Parameters:
+        - data (object): The data.
+        - accepted_media_type (str): The accepted media type, possibly holding an 'indent'.
+        - renderer_context (dict): The renderer context, possibly holding an 'indent'.
+
+        Returns:
+        - bytes: The JSON document, or an empty string if data is None.
+        """
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b""
+
+        try:
+            ret = orjson.dumps(
+                data, default=json_encoder.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like 'JSONRenderer', fully escape U+2028 and U+2029, so that the output is a strict
+        # JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
+
+
+def encode_default(obj):
+    """
+    Represent the values the binary formats do not encode natively, like the JSON renderers
+    do, except for Decimals, which are represented as exact decimal strings.
+
+    Parameters:
+    - obj (object): The value.
+
+    Returns:
+    - object: The represented value.
+
+    Raises:
+    - TypeError: If the value cannot be represented.
+    """
+    if isinstance(obj, decimal.Decimal):
+        return f"{obj:f}"
+
+    return json_encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer encoding with 'msgpack'.
+
+    Strings are encoded as 'str' and bytes as 'bin'. Decimals and datetimes are encoded as
+    strings, like in JSON (see 'encode_default').
+
+    Attributes:
+    - media_type (str): The media type of the format ('application/msgpack').
+    - format (str): The name of the format ('msgpack').
+    - charset (None): No charset, the format being binary.
+    - render_style (str): The 'binary' style.
+
+    Methods:
+    - render(data, accepted_media_type, renderer_context): Renders data as MessagePack bytes.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data as MessagePack bytes.
+
+        Parameters:
+        - data (object): The data.
+        - accepted_media_type (str): The accepted media type.
+        - renderer_context (dict): The renderer context.
+
+        Returns:
+        - bytes: The MessagePack document, or an empty string if data is None.
+        """
+        if data is None:
+            return b""
+
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class CBORRenderer(BaseRenderer):
+    """
+    CBOR renderer encoding with 'cbor2'.
+
+    The values of the API are encoded as strings, like in JSON. Decimals and datetimes that are
+    not already represented as strings are encoded as CBOR decimal fractions (tag 4) and
+    standard date/time strings (tag 0), which keep their exact value.
+
+    Attributes:
+    - media_type (str): The media type of the format ('application/cbor').
+    - format (str): The name of the format ('cbor').
+    - charset (None): No charset, the format being binary.
+    - render_style (str): The 'binary' style.
+
+    Methods:
+    - render(data, accepted_media_type, renderer_context): Renders data as CBOR bytes.
+    - encode_default(encoder, obj): Encodes the values 'cbor2' does not encode natively.
+    """
+
+    media_type = "application/cbor"
+    format = "cbor"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render data as CBOR bytes.
+
+        Parameters:
+        - data (object): The data.
+        - accepted_media_type (str): The accepted media type.
+        - renderer_context (dict): The renderer context.
+
+        Returns:
+        - bytes: The CBOR document, or an empty string if data is None.
+        """
+        if data is None:
+            return b""
+
+        return cbor2.dumps(data, default=self.encode_default)
+
+    @staticmethod
+    def encode_default(encoder, obj):
+        """
+        Encode the values 'cbor2' does not encode natively (see 'encode_default').
+
+        Parameters:
+        - encoder (CBOREncoder): The encoder.
+        - obj (object): The value.
+        """
+        encoder.encode(encode_default(obj))
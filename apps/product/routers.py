@@ -0,0 +1,506 @@
+"""
+Module containing the routing of the product reads to the read replicas of the database.
+
+The reads of the 'product' application made while serving a GET (or HEAD, OPTIONS) request are
+sent to one of the replicas listed by the READ_REPLICAS setting, which scales the read throughput
+with the number of replicas. Every other query goes to the primary ('default') database:
+- The writes, and every read of the requests changing data (which often read before writing).
+- The reads outside of any request (e.g. management commands and shell sessions).
+- The reads of the other applications (e.g. users and sessions, read by the authentication).
+- The reads of a user made less than READ_REPLICA_MAX_LAG seconds after their last write.
+
+The last rule gives every user, through the API or the admin, their own changes back although
+the replicas lag behind, while the reads of the other users keep being served by the replicas.
+The time of the last write of each user is stored in the 'products' cache (see the 'cache'
+module), shared by every process, for READ_REPLICA_MAX_LAG seconds. Once they have passed, the
+replicas lagging less than that hold the change.
+
+The product responses are cached for every user under the catalog version: a replica read made
+right after a change would cache the previous products under the new version, for as long as
+the cache keeps them. The reads from a replica made less than READ_REPLICA_MAX_LAG seconds
+after the products last changed are therefore served without filling the caches (see
+'can_cache_reads').
+
+READ_REPLICA_SELECTION chooses the replica of each read:
+- "round_robin": The replicas are used in turn.
+- "least_lag": The replica lagging the least behind the primary is used, in turn among equals.
+
+The lag of a replica is measured by the 'LAG_QUERY' entry of its database settings, a query
+returning its lag in seconds (e.g. from the replication tool), run at most every
+LAG_CHECK_INTERVAL seconds per process. Replicas without a 'LAG_QUERY' are deemed within
+READ_REPLICA_MAX_LAG. Replicas lagging more, or failing their lag query, are left out until their
+next check, the primary serving the reads when no replica is left.
+
+Settings:
+- READ_REPLICAS (list): The aliases of the replica databases. Defaults to no replica.
+- READ_REPLICA_SELECTION (str): "round_robin" (default) or "least_lag".
+- READ_REPLICA_MAX_LAG (float): The maximum lag (in seconds) of the used replicas, during which
+                                the reads of a user go to the primary after their writes.
+                                Defaults to 10.
+
+The 'ShardRouter' sends the reads and writes of a product to the shard owning it when the
+products are sharded (see the 'sharding' module), and is placed before the 'ReplicaRouter',
+which only applies to an unsharded catalog.
+
+Classes:
+- ShardRouter: Database router sending the products to their shard.
+- ReplicaRouter: Database router sending the product reads to the replicas.
+- ReplicaRoutingMiddleware: Middleware exposing the current request to the router.
+
+Functions:
+- get_max_lag(): Returns the maximum lag of the used replicas.
+- get_write_key(request): Builds the cache key of the last write of the user of a request.
+- record_write(request, response): Stores the time of the last write of the user of a request.
+- reads_from_primary(request): Tells whether the product reads of a request go to the primary.
+- areads_from_primary(request): Async version of 'reads_from_primary'.
+- is_recent_write(written_at): Tells whether the last write of a user is recent.
+- can_cache_reads(): Tells whether the product reads of the current request can be cached.
+- acan_cache_reads(): Async version of 'can_cache_reads'.
+- get_replica_lag(alias): Returns the lag of a replica, measured at most every interval.
+- select_replica(): Returns the replica serving the next read, or None.
+"""
+import itertools
+import math
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import aget_catalog_version, get_catalog_version, get_products_cache
+from .models import Product
+from .sharding import get_shards, shard_for
+
+REPLICATED_APPS = ("product",)
+SHARDED_APPS = ("product",)
+MAX_LAG = 10
+LAG_CHECK_INTERVAL = 5
+
+current_request = ContextVar("current_request", default=None)
+turns = itertools.count()
+replica_lags = {}
+
+
+def get_max_lag():
+    """
+    Return the maximum lag of the used replicas.
+
+    Returns:
+    - float: The READ_REPLICA_MAX_LAG setting (in seconds).
+    """
+    return getattr(settings, "READ_REPLICA_MAX_LAG", MAX_LAG)
+
+
+def get_write_key(request):
+    """
+    Build the cache key of the last write of the user of a request.
+
+    Parameters:
+    - request (HttpRequest): The request.
+
+    Returns:
+    - str: The cache key, or None if the user of the request is not authenticated.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    return f"products:last-write:{user.pk}"
+
+
+def record_write(request, response):
+    """
+    Store the time of the last write of the user of a request changing data, for
+    READ_REPLICA_MAX_LAG seconds.
+
+    Parameters:
+    - request (HttpRequest): The served request.
+    - response (HttpResponse): Its response.
+    """
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    if not getattr(settings, "READ_REPLICAS", None):
+        return
+
+    key = get_write_key(request)
+    if key is not None:
+        get_products_cache().set(key, time.time(), timeout=math.ceil(get_max_lag()))
+
+
+def reads_from_primary(request):
+    """
+    Tell whether the product reads of a request go to the primary, which is decided once per
+    request so that all of its reads see the same data.
+
+    Parameters:
+    - request (HttpRequest): The request, or None outside of any request.
+
+    Returns:
+    - bool: True outside of any request, for the requests changing data, and for the requests
+            of a user made less than READ_REPLICA_MAX_LAG seconds after their last write.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return True
+
+    if not hasattr(request, "_reads_from_primary"):
+        key = get_write_key(request)
+        written_at = None if key is None else get_products_cache().get(key)
+        request._reads_from_primary = is_recent_write(written_at)
+
+    return request._reads_from_primary
+
+
+async def areads_from_primary(request):
+    """
+    Tell whether the product reads of a request go to the primary, like 'reads_from_primary',
+    with the async cache API.
+
+    Parameters:
+    - request (HttpRequest): The request, or None outside of any request.
+
+    Returns:
+    - bool: True if the product reads of the request go to the primary.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return True
+
+    if not hasattr(request, "_reads_from_primary"):
+        key = get_write_key(request)
+        written_at = None if key is None else await get_products_cache().aget(key)
+        request._reads_from_primary = is_recent_write(written_at)
+
+    return request._reads_from_primary
+
+
+def is_recent_write(written_at):
+    """
+    Tell whether the last write of a user was made less than READ_REPLICA_MAX_LAG seconds ago.
+
+    Parameters:
+    - written_at (float): The time of the last write of the user, or None.
+
+    Returns:
+    - bool: True if the write is recent.
+    """
+    return written_at is not None and time.time() - written_at < get_max_lag()
+
+
+def can_cache_reads():
+    """
+    Tell whether the product reads of the current request can fill the caches.
+
+    Returns:
+    - bool: False if the request reads from the replicas less than READ_REPLICA_MAX_LAG seconds
+            after the products last changed, as the replica may not hold the change yet.
+    """
+    if not getattr(settings, "READ_REPLICAS", None):
+        return True
+    if reads_from_primary(current_request.get()):
+        return True
+
+    # The catalog version is the time (in nanoseconds) of the last change of the products.
+    changed_at = get_catalog_version() / 1e9
+    return time.time() - changed_at >= get_max_lag()
+
+
+async def acan_cache_reads():
+    """
+    Tell whether the product reads of the current request can fill the caches, like
+    'can_cache_reads', with the async cache API.
+
+    Returns:
+    - bool: False if the request reads from the replicas less than READ_REPLICA_MAX_LAG seconds
+            after the products last changed.
+    """
+    if not getattr(settings, "READ_REPLICAS", None):
+        return True
+    if await areads_from_primary(current_request.get()):
+        return True
+
+    changed_at = await aget_catalog_version() / 1e9
+    return time.time() - changed_at >= get_max_lag()
+
+
+def get_replica_lag(alias):
+    """
+    Return the lag of a replica, measured by its 'LAG_QUERY' at most every LAG_CHECK_INTERVAL
+    seconds per process.
+
+    Parameters:
+    - alias (str): The alias of the replica.
+
+    Returns:
+    - float: The lag of the replica (in seconds), 0 if it has no 'LAG_QUERY', or infinity if
+             its lag query failed.
+    """
+    lag_query = connections.settings[alias].get("LAG_QUERY")
+    if lag_query is None:
+        return 0
+
+    lag, checked_at = replica_lags.get(alias, (None, -math.inf))
+    if time.monotonic() - checked_at < LAG_CHECK_INTERVAL:
+        return lag
+
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(lag_query)
+            lag = float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        lag = math.inf
+
+    replica_lags[alias] = (lag, time.monotonic())
+    return lag
+
+
+def select_replica():
+    """
+    Return the replica serving the next read, according to the READ_REPLICA_SELECTION setting.
+
+    Returns:
+    - str: The alias of the replica, or None if no replica lags less than READ_REPLICA_MAX_LAG
+           seconds.
+    """
+    max_lag = get_max_lag()
+    lags = {alias: get_replica_lag(alias) for alias in settings.READ_REPLICAS}
+    replicas = [alias for alias, lag in lags.items() if lag <= max_lag]
+    if not replicas:
+        return None
+
+    if getattr(settings, "READ_REPLICA_SELECTION", "round_robin") == "least_lag":
+        least_lag = min(lags[alias] for alias in replicas)
+        replicas = [alias for alias in replicas if lags[alias] == least_lag]
+
+    return replicas[next(turns) % len(replicas)]
+
+
+class ShardRouter:
+    """
+    Database router sending the products (and the objects read from a shard) to their shard,
+    and keeping the tables that are not sharded out of the shards.
+
+    Methods:
+    - db_for_instance(model, instance): Returns the shard of an object.
+    - db_for_read(model, **hints): Returns the shard of a read made from an object.
+    - db_for_write(model, **hints): Returns the shard of a written object.
+    - allow_migrate(db, app_label, model_name=None, **hints): Only creates the product tables
+                                                              in the shards.
+    """
+
+    def db_for_instance(self, model, instance):
+        """
+        Return the shard of an object: the one owning its id for a product, or the one it was
+        read from for the other sharded objects (e.g. the price statistics buckets).
+
+        Parameters:
+        - model (class): The model.
+        - instance (Model): The object the query is made from, if any.
+
+        Returns:
+        - str: The alias of the shard, or None if the products are not sharded, or the object
+               is not sharded or has no shard yet.
+        """
+        shards = get_shards()
+        if not shards or not isinstance(instance, model):
+            return None
+        if model is Product and instance.pk is not None:
+            return shard_for(instance.pk)
+        if instance._state.db in shards:
+            return instance._state.db
+        return None
+
+    def db_for_read(self, model, **hints):
+        """
+        Return the shard of a read made from an object (e.g. 'refresh_from_db').
+
+        Parameters:
+        - model (class): The read model.
+        - **hints: The routing hints (e.g. the 'instance' the read is made from).
+
+        Returns:
+        - str: The alias of the shard, or None.
+        """
+        return self.db_for_instance(model, hints.get("instance"))
+
+    def db_for_write(self, model, **hints):
+        """
+        Return the shard of a written object (e.g. 'save' and 'delete').
+
+        Parameters:
+        - model (class): The written model.
+        - **hints: The routing hints (e.g. the written 'instance').
+
+        Returns:
+        - str: The alias of the shard, or None.
+        """
+        return self.db_for_instance(model, hints.get("instance"))
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Only create the tables of the 'product' application in the shards, apart from the id
+        sequence, which is stored in the 'default' database.
+
+        Parameters:
+        - db (str): The alias of the database.
+        - app_label (str): The label of the migrated application.
+        - model_name (str): The name of the migrated model, if any.
+
+        Returns:
+        - bool: Whether the shard is migrated, or None for the other databases.
+        """
+        if db not in get_shards():
+            return None
+        return app_label in SHARDED_APPS and model_name != "productsequence"
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of the 'product' application to the read replicas.
+
+    Methods:
+    - db_for_read(model, **hints): Returns the database of a read.
+    - db_for_write(model, **hints): Returns the database of a write, always the primary.
+    - allow_relation(obj1, obj2, **hints): Allows relations between the primary and replicas.
+    - allow_migrate(db, app_label, model_name=None, **hints): Forbids migrating the replicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Return the database of a read.
+
+        Parameters:
+        - model (class): The read model.
+        - **hints: The routing hints (e.g. the 'instance' the read is made from).
+
+        Returns:
+        - str: The alias of the database.
+        """
+        if not getattr(settings, "READ_REPLICAS", None):
+            return DEFAULT_DB_ALIAS
+
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db is not None:
+            return instance._state.db
+
+        if model._meta.app_label not in REPLICATED_APPS:
+            return DEFAULT_DB_ALIAS
+        if reads_from_primary(current_request.get()):
+            return DEFAULT_DB_ALIAS
+
+        return select_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """
+        Return the database of a write, always the primary.
+
+        Parameters:
+        - model (class): The written model.
+
+        Returns:
+        - str: The alias of the primary database.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Allow relations between objects read from the primary or the replicas, as they hold the
+        same data.
+
+        Parameters:
+        - obj1 (Model): The first object.
+        - obj2 (Model): The second object.
+
+        Returns:
+        - bool: True if both objects come from the primary or the replicas, or None.
+        """
+        databases = {DEFAULT_DB_ALIAS, *getattr(settings, "READ_REPLICAS", ())}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Forbid migrating the replicas, which are copies of the primary.
+
+        Parameters:
+        - db (str): The alias of the database.
+        - app_label (str): The label of the migrated application.
+
+        Returns:
+        - bool: False for the replicas, or None.
+        """
+        if db in getattr(settings, "READ_REPLICAS", ()):
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware exposing the current request to the router, whose product reads go to the
+    primary outside of any request, and recording the writes of the users.
+
+    Attributes:
+    - sync_capable (bool): Whether the middleware can serve synchronous requests.
+    - async_capable (bool): Whether the middleware can serve asynchronous requests.
+
+    Methods:
+    - __call__(request): Serves a request.
+    - __acall__(request): Serves a request, asynchronously.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Parameters:
+        - get_response (callable): The next middleware or view.
+        """
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Serve a request.
+
+        Parameters:
+        - request (HttpRequest): The request.
+
+        Returns:
+        - HttpResponse: The response.
+        """
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+        record_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        """
+        Serve a request, asynchronously.
+
+        Parameters:
+        - request (HttpRequest): The request.
+
+        Returns:
+        - HttpResponse: The response.
+        """
+        token = current_request.set(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+        # The user may be loaded lazily from the session, which queries the database.
+        await sync_to_async(record_write)(request, response)
+        return response
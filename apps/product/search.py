@@ -0,0 +1,88 @@
+"""
+Module containing the full-text search of the Product endpoints.
+
+Products are indexed by the 'product_product_fts' SQLite FTS5 table, created by the
+'0003_product_search' migration. It is an external content table: it stores the index of the
+'name' and 'description' columns only, and is kept in sync with the products table by triggers,
+so that every code path changing the products (including bulk operations and raw SQL) updates
+it.
+
+Functions:
+- build_match_query(text): Builds the FTS5 query matching a search text.
+- search_products(queryset, text): Restricts a queryset to the products matching a search text.
+- rebuild_search_index(using): Rebuilds the full-text index from the products table.
+"""
+import re
+
+from django.db import connections
+
+FTS_TABLE = "product_product_fts"
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def build_match_query(text):
+    """
+    Build the FTS5 query matching a search text.
+
+    The text is split into its words, which must all be found in the name or the description of
+    the products. The last word is matched as a prefix, so that a partially typed word matches.
+    Words are quoted, so that the FTS5 query syntax (operators, column filters, quotes) can not
+    be injected through the text.
+
+    Parameters:
+    - text (str): The search text.
+
+    Returns:
+    - str: The FTS5 query, or None if the text holds no word.
+    """
+    terms = [f'"{term}"' for term in TERM_PATTERN.findall(text)]
+    if not terms:
+        return None
+
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_products(queryset, text):
+    """
+    Restrict a Product queryset to the products matching a search text, best matches first.
+
+    Products are ranked by BM25, with the words found in the name weighing more than the ones
+    found in the description, and then by id, so that pages are deterministic. The rank is
+    available as the 'rank' attribute of the products (lower is better).
+
+    Parameters:
+    - queryset (QuerySet): The Product queryset to be searched (e.g. already filtered by price).
+    - text (str): The search text.
+
+    Returns:
+    - QuerySet: The matching products, or an empty queryset if the text holds no word.
+    """
+    match_query = build_match_query(text)
+    if match_query is None:
+        return queryset.none()
+
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        select={"rank": f"bm25({FTS_TABLE}, %s, %s)"},
+        select_params=(NAME_WEIGHT, DESCRIPTION_WEIGHT),
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE} MATCH %s", f"{FTS_TABLE}.rowid = {table}.id"],
+        params=[match_query],
+        order_by=["rank", "id"],
+    )
+
+
+def rebuild_search_index(using="default"):
+    """
+    Rebuild the full-text index from the products table, and merge its segments.
+
+    Parameters:
+    - using (str): The alias of the database.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
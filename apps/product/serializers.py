@@ -1,6 +1,180 @@
-from rest_framework import serializers
+import decimal
+from collections import defaultdict
 
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from . import validators
 from .models import Product
+from .signals import products_changed
+
+
+class ProductListSerializer(serializers.ListSerializer):
+    """
+    List serializer used by ProductSerializer when it is built with 'many=True'.
+
+    Unlike the default ListSerializer, an invalid item does not reject the whole list: every item
+    is validated in a single pass, the valid ones are kept and the errors of the invalid ones are
+    recorded by their index, so that a bulk request can partially succeed.
+
+    When built with an instance (a Product queryset), the list serializer performs a bulk
+    update: every item must then carry the 'id' of the product it updates, and only the fields it
+    holds are validated and written.
+
+    Attributes:
+    - batch_size (int): The number of rows written by each INSERT or UPDATE statement.
+                        Defaults to 500.
+    - item_errors (dict): The validation errors of the invalid items, keyed by their index.
+    - missing_ids (list): The ids of the bulk update items with no matching product.
+
+    Methods:
+    - to_internal_value(self, data): Validates every item, collecting the per-item errors.
+    - create(self, validated_data): Inserts the valid items with batched 'bulk_create' calls
+                                    inside a single transaction.
+    - update(self, instance, validated_data): Writes the changed columns of the valid items with
+                                              batched 'bulk_update' calls inside a single
+                                              transaction.
+    """
+
+    batch_size = 500
+
+    def to_internal_value(self, data):
+        """
+        Validate every item of the list, without stopping at the first invalid one.
+
+        Args:
+        - data (list): The list of items to be validated.
+
+        Returns:
+        - list: The validated data of the valid items.
+
+        Raises:
+        - serializers.ValidationError: If 'data' is not a list.
+        """
+        if not isinstance(data, list):
+            message = self.error_messages["not_a_list"].format(
+                input_type=type(data).__name__
+            )
+            raise serializers.ValidationError({"non_field_errors": [message]})
+
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages["max_length"].format(
+                max_length=self.max_length
+            )
+            raise serializers.ValidationError({"non_field_errors": [message]})
+
+        self.item_errors = {}
+        validated_data = []
+
+        for index, item in enumerate(data):
+            try:
+                attrs = self.child.run_validation(item)
+                if self.instance is not None:
+                    attrs["id"] = self.validate_item_id(item)
+            except serializers.ValidationError as exc:
+                self.item_errors[index] = exc.detail
+            else:
+                validated_data.append(attrs)
+
+        return validated_data
+
+    def validate_item_id(self, item):
+        """
+        Validate the 'id' of a bulk update item.
+
+        Args:
+        - item (dict): The bulk update item.
+
+        Returns:
+        - int: The id of the product to be updated.
+
+        Raises:
+        - serializers.ValidationError: If the 'id' is missing or is not a positive integer.
+        """
+        try:
+            return serializers.IntegerField(min_value=1).run_validation(
+                item.get("id", serializers.empty)
+            )
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({"id": exc.detail}) from exc
+
+    def create(self, validated_data):
+        """
+        Insert the validated items with batched 'bulk_create' calls in a single transaction.
+
+        Args:
+        - validated_data (list): The validated data of the items to be created.
+
+        Returns:
+        - list: The created Product instances, with their primary keys set.
+        """
+        model = self.child.Meta.model
+        products = [model(**attrs) for attrs in validated_data]
+
+        with transaction.atomic():
+            products = model.objects.sharded().bulk_create(
+                products, batch_size=self.batch_size
+            )
+            products_changed.send(sender=model, action="create", instances=products)
+
+        return products
+
+    def update(self, instance, validated_data):
+        """
+        Write the validated items with batched 'bulk_update' calls in a single transaction.
+
+        Products are fetched with a single query, and grouped by the set of columns whose value
+        actually changes, so that each UPDATE statement only touches those columns (plus
+        'updated_at'). Items whose 'id' matches no product are skipped and recorded in
+        'missing_ids'.
+
+        Args:
+        - instance (QuerySet): The queryset of the products that can be updated.
+        - validated_data (list): The validated data of the items, each one holding an 'id'.
+
+        Returns:
+        - list: The updated Product instances, in the order they were first referenced.
+        """
+        ids = list(dict.fromkeys(attrs["id"] for attrs in validated_data))
+        products = instance.in_bulk(ids)
+        self.missing_ids = [pk for pk in ids if pk not in products]
+
+        changed_fields = defaultdict(set)
+        previous_prices = {}
+        for attrs in validated_data:
+            product = products.get(attrs["id"])
+            if product is None:
+                continue
+
+            for field, value in attrs.items():
+                if field != "id" and getattr(product, field) != value:
+                    if field == "price":
+                        previous_prices.setdefault(product.pk, product.price)
+                    setattr(product, field, value)
+                    changed_fields[product.pk].add(field)
+
+        updated_at = timezone.now()
+        groups = defaultdict(list)
+        for pk, fields in changed_fields.items():
+            products[pk].updated_at = updated_at
+            groups[tuple(sorted(fields))].append(products[pk])
+
+        with transaction.atomic():
+            for fields, group in groups.items():
+                instance.bulk_update(
+                    group, [*fields, "updated_at"], batch_size=self.batch_size
+                )
+
+            products_changed.send(
+                sender=instance.model,
+                action="update",
+                instances=[products[pk] for pk in changed_fields],
+                previous_prices=previous_prices,
+            )
+
+        return [products[pk] for pk in ids if pk in products]
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -10,13 +184,22 @@ class ProductSerializer(serializers.ModelSerializer):
     This serializer is used to convert Product model instances to JSON and validate
     incoming data during deserialization.
 
+    It accepts an optional 'fields' argument, restricting the serialized output to the given
+    field names (see 'ProductFieldsSerializer'). With 'many=True', it applies to every item.
+
     Attributes:
     - Meta (class): A inner class specifying metadata for the serializer.
         - model (class): The model class that the serializer is based on (Product).
         - fields (str or tuple): Specifies the fields to include in the serialized output.
                                  In this case, "__all__" includes all fields.
+        - list_serializer_class (class): The serializer used with 'many=True'
+                                         (ProductListSerializer).
+
+    The custom validation rules are defined in the 'validators' module.
 
     Methods:
+    - __init__(self, *args, fields=None, **kwargs): Drops the fields missing from 'fields'.
+
     - validate_name(self, value): Custom validation for the 'name' field.
                                   Raises a ValidationError if the length is less than 3.
 
@@ -30,6 +213,20 @@ class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = "__all__"
+        list_serializer_class = ProductListSerializer
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        Build the serializer, dropping the fields missing from 'fields'.
+
+        Args:
+        - fields (tuple): The names of the fields to be serialized, or None for every field.
+        """
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def validate_name(self, value):
         """
@@ -39,14 +236,9 @@ class ProductSerializer(serializers.ModelSerializer):
         - value (str): The value of the 'name' field.
 
         Raises:
-        - serializers.ValidationError: If the length of 'name' is less than 3.
+        - ValidationError: If the length of 'name' is less than 3.
         """
-        if len(value) < 3:
-            raise serializers.ValidationError(
-                "Field 'name' must have at least 3 characters"
-            )
-
-        return value
+        return validators.validate_name(value)
 
     def validate_description(self, value):
         """
@@ -56,14 +248,9 @@ class ProductSerializer(serializers.ModelSerializer):
         - value (str): The value of the 'description' field.
 
         Raises:
-        - serializers.ValidationError: If the length of 'description' is less than 10.
+        - ValidationError: If the length of 'description' is less than 10.
         """
-        if len(value) < 10:
-            raise serializers.ValidationError(
-                "Field 'description' must have at least 10 characters"
-            )
-
-        return value
+        return validators.validate_description(value)
 
     def validate_price(self, value):
         """
@@ -73,9 +260,379 @@ class ProductSerializer(serializers.ModelSerializer):
         - value (float): The value of the 'price' field.
 
         Raises:
-        - serializers.ValidationError: If the 'price' is less than 500.
+        - ValidationError: If the 'price' is less than 500.
+        """
+        return validators.validate_price(value)
+
+
+class ProductRepriceSerializer(serializers.Serializer):
+    """
+    Serializer validating the payload of a bulk price adjustment.
+
+    Attributes:
+    - factor (Decimal): The factor every matching price is multiplied by, with up to 6 decimal
+                        places.
+
+    Methods:
+    - validate_factor(self, value): Custom validation for the 'factor' field.
+                                    Raises a ValidationError if the value is not positive.
+
+    - validate_prices(self, lowest, highest): Validates the adjusted price range.
+                                              Raises a ValidationError if a price would fall
+                                              below 500 or exceed the 'price' column capacity.
+    """
+
+    factor = serializers.DecimalField(max_digits=12, decimal_places=6)
+
+    def validate_factor(self, value):
+        """
+        Validate the 'factor' field.
+
+        Args:
+        - value (Decimal): The value of the 'factor' field.
+
+        Raises:
+        - serializers.ValidationError: If the 'factor' is not higher than 0.
         """
-        if value < 500:
-            raise serializers.ValidationError("Field 'price' must be higher than 500")
+        if value <= 0:
+            raise serializers.ValidationError("Field 'factor' must be higher than 0")
 
         return value
+
+    def validate_prices(self, lowest, highest):
+        """
+        Validate the lowest and highest prices resulting from the adjustment.
+
+        Args:
+        - lowest (Decimal): The lowest adjusted price.
+        - highest (Decimal): The highest adjusted price.
+
+        Raises:
+        - serializers.ValidationError: If the lowest price is less than 500, or the highest one
+                                       does not fit in the 'price' column.
+        """
+        price_field = Product._meta.get_field("price")
+        price_limit = 10 ** (price_field.max_digits - price_field.decimal_places)
+
+        if lowest < validators.PRICE_MIN_VALUE:
+            raise serializers.ValidationError(
+                {
+                    "factor": [
+                        "Field 'factor' would take a price lower than "
+                        f"{validators.PRICE_MIN_VALUE}"
+                    ]
+                }
+            )
+
+        if highest >= price_limit:
+            raise serializers.ValidationError(
+                {"factor": [f"Field 'factor' would take a price above {price_limit}"]}
+            )
+
+
+class ProductAutocompleteSerializer(serializers.Serializer):
+    """
+    Serializer validating the query params of the product name autocomplete.
+
+    Attributes:
+    - q (str): The prefix the product names must start with.
+    - limit (int): The maximum number of names returned, from 1 to 50. Defaults to 10.
+    """
+
+    q = serializers.CharField(max_length=50)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class ProductPriceBucketSerializer(serializers.Serializer):
+    """
+    Serializer representing a bucket of the price histogram of the catalog statistics.
+
+    Attributes:
+    - lower (Decimal): The lowest price of the bucket (inclusive).
+    - upper (Decimal): The highest price of the bucket (exclusive).
+    - count (int): The number of products whose price falls in the bucket.
+    """
+
+    lower = serializers.DecimalField(max_digits=None, decimal_places=2)
+    upper = serializers.DecimalField(max_digits=None, decimal_places=2)
+    count = serializers.IntegerField()
+
+
+class ProductStatsSerializer(serializers.Serializer):
+    """
+    Serializer representing the price statistics of the catalog.
+
+    Attributes:
+    - count (int): The number of products.
+    - min_price (Decimal): The lowest price of the products, or None if there is none.
+    - max_price (Decimal): The highest price of the products, or None if there is none.
+    - avg_price (Decimal): The average price of the products, rounded to 2 decimal places, or
+                           None if there is none.
+    - histogram (list): The number of products per price bucket, for the non-empty buckets.
+    """
+
+    count = serializers.IntegerField()
+    min_price = serializers.DecimalField(
+        max_digits=None, decimal_places=2, allow_null=True
+    )
+    max_price = serializers.DecimalField(
+        max_digits=None, decimal_places=2, allow_null=True
+    )
+    avg_price = serializers.DecimalField(
+        max_digits=None, decimal_places=2, allow_null=True
+    )
+    histogram = ProductPriceBucketSerializer(many=True)
+
+
+class ProductFieldsSerializer(serializers.Serializer):
+    """
+    Serializer validating the 'fields' query param, which restricts the product representations
+    to a comma-separated list of fields (e.g. 'fields=id,name,price').
+
+    Attributes:
+    - fields (str): The comma-separated names of the fields. Ignored when blank.
+
+    Methods:
+    - validate_fields(self, value): Splits the field names and checks them against the Product
+                                    fields. Raises a ValidationError if one is unknown.
+    """
+
+    fields = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_fields(self, value):
+        """
+        Validate the 'fields' query param.
+
+        Args:
+        - value (str): The comma-separated names of the fields.
+
+        Returns:
+        - tuple: The names of the fields, without duplicates, or None if the value is blank.
+
+        Raises:
+        - serializers.ValidationError: If any of the names is not a Product field.
+        """
+        names = [name.strip() for name in value.split(",")]
+        names = tuple(dict.fromkeys(name for name in names if name))
+        if not names:
+            return None
+
+        allowed = [field.name for field in Product._meta.concrete_fields]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields {unknown}, fields must be among {allowed}"
+            )
+
+        return names
+
+
+def get_requested_fields(query_params):
+    """
+    Get the fields requested through the 'fields' query param.
+
+    Args:
+    - query_params (QueryDict): The query params of the request.
+
+    Returns:
+    - tuple: The names of the requested fields, or None if every field is requested.
+
+    Raises:
+    - serializers.ValidationError: If any of the requested fields is not a Product field.
+    """
+    serializer = ProductFieldsSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data.get("fields")
+
+
+def defer_unrequested(queryset, fields, *required):
+    """
+    Load only the requested fields of a Product queryset, plus the required ones.
+
+    Args:
+    - queryset (QuerySet): The Product queryset.
+    - fields (tuple): The names of the requested fields, or None for every field.
+    - required (str): The names of the fields needed anyway (e.g. the ordering ones), possibly
+                      prefixed by '-'.
+
+    Returns:
+    - QuerySet: The queryset, loading only the requested and required columns.
+    """
+    if fields is None:
+        return queryset
+
+    return queryset.only(*fields, *(name.lstrip("-") for name in required))
+
+
+def compile_decimal(field):
+    """
+    Compile the representation function of a DecimalField, for the values read from the
+    database.
+
+    The quantization context and exponent are built once, rather than on every value as
+    'DecimalField.to_representation' does. Fields whose output is not a plain string (not
+    coerced to string, localized or normalized) keep their 'to_representation' method.
+
+    Args:
+    - field (serializers.DecimalField): The serializer field.
+
+    Returns:
+    - callable: The function representing a Decimal value.
+    """
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if (
+        not coerce_to_string
+        or field.localize
+        or field.normalize_output
+        or field.decimal_places is None
+    ):
+        return field.to_representation
+
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    rounding = field.rounding
+
+    def to_representation(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+    return to_representation
+
+
+def compile_datetime(field):
+    """
+    Compile the representation function of a DateTimeField, for the values read from the
+    database.
+
+    The output format and the time zone are resolved once, rather than on every value as
+    'DateTimeField.to_representation' does. Fields with a custom output format or without time
+    zone, and naive values, keep the 'to_representation' method.
+
+    Args:
+    - field (serializers.DateTimeField): The serializer field.
+
+    Returns:
+    - callable: The function representing a datetime value.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if field_timezone is None:
+        return field.to_representation
+
+    fallback = field.to_representation
+
+    def to_representation(value):
+        if value.tzinfo is None:
+            return fallback(value)
+
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            return value[:-6] + "Z"
+        return value
+
+    return to_representation
+
+
+def compile_converter(field):
+    """
+    Compile the representation function of a serializer field, equivalent to its
+    'to_representation' method for the values read from the database.
+
+    Args:
+    - field (serializers.Field): The serializer field.
+
+    Returns:
+    - callable: The function representing a value of the field.
+    """
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.BigIntegerField:
+        coerce_to_string = getattr(
+            field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING
+        )
+        return str if coerce_to_string else int
+    if type(field) is serializers.CharField:
+        return str
+    if type(field) is serializers.DecimalField:
+        return compile_decimal(field)
+    if type(field) is serializers.DateTimeField:
+        return compile_datetime(field)
+
+    return field.to_representation
+
+
+class ProductReadSerializer:
+    """
+    Read-only serializer producing the same representation as ProductSerializer from rows read
+    with 'values_list', for the read endpoints.
+
+    ProductSerializer builds a Product instance per row and calls 'to_representation' on every
+    field of every instance, which dominates the time of large pages. This serializer reads
+    plain tuples instead, and represents each column with a function compiled once per
+    serializer (see 'compile_converter').
+
+    Attributes:
+    - names (tuple): The names of the serialized fields, in the ProductSerializer order.
+    - converters (tuple): The representation functions of the serialized fields.
+
+    Methods:
+    - select(queryset, *required): Reads the serialized fields of a queryset as rows.
+    - to_representation(rows): Represents the rows as dicts.
+    """
+
+    def __init__(self, fields=None):
+        """
+        Build the serializer.
+
+        Args:
+        - fields (tuple): The names of the fields to be serialized, or None for every field.
+        """
+        serializer_fields = ProductSerializer(fields=fields).fields
+        self.names = tuple(serializer_fields)
+        self.converters = tuple(
+            compile_converter(field) for field in serializer_fields.values()
+        )
+
+    def select(self, queryset, *required):
+        """
+        Read the serialized fields of a Product queryset as named rows.
+
+        Args:
+        - queryset (QuerySet): The Product queryset.
+        - required (str): The names of the fields needed anyway (e.g. the ordering ones),
+                          possibly prefixed by '-'. They are read after the serialized ones.
+
+        Returns:
+        - QuerySet: The queryset of the named rows.
+        """
+        extra = [name.lstrip("-") for name in required]
+        extra = [name for name in dict.fromkeys(extra) if name not in self.names]
+        return queryset.values_list(*self.names, *extra, named=True)
+
+    def to_representation(self, rows):
+        """
+        Represent rows read by 'select' as dicts.
+
+        Args:
+        - rows (Iterable): The rows.
+
+        Returns:
+        - list: The represented rows, like 'ProductSerializer(products, many=True).data'.
+        """
+        names = self.names
+        converters = self.converters
+        return [
+            {
+                name: None if value is None else convert(value)
+                for name, convert, value in zip(names, converters, row)
+            }
+            for row in rows
+        ]
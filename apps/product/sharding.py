@@ -0,0 +1,741 @@
+"""
+Module containing the hash sharding of the products across several databases.
+
+A single SQLite file takes one writer at a time, which caps the write throughput of the catalog.
+When the PRODUCT_SHARDS setting lists several database aliases, every product is stored in the
+shard its id hashes to (see 'shard_for'), so that the writes to different shards run side by
+side. The ids stay unique across the shards: they are handed out by a sequence stored in the
+'default' database, in blocks reserved by each process (see 'IdBlocks'), and are set before
+the products are inserted, since they tell their shard.
+
+Reads addressing a single product (e.g. by id) go straight to its shard. Reads spanning the
+products (lists, counts, aggregates) go through a 'ShardedQuerySet': the query is run on every
+shard in parallel, by a pool of worker threads holding their own connections, and the ordered
+results are merged (k-way merge), so that the pages of an ordered list are the same as the ones
+of a single database. A page of offset O and size S reads the first O + S rows of every shard;
+keyset (cursor) pagination reads S + 1 rows of every shard, whatever the page.
+
+The shards hold the products, their full-text index and their price statistics summary; the
+other tables (users, sessions, id sequence) stay in 'default' (see 'routers.ShardRouter'). There
+is no transaction spanning several shards: the writes of a shard are atomic, the ones of a bulk
+request touching several shards are not. The products are hashed over the number of shards, so
+shards can not be added once products are stored without moving them.
+
+Settings:
+- PRODUCT_SHARDS (list): The aliases of the shard databases. Defaults to no shard, every product
+                         being stored in 'default'.
+
+Classes:
+- IdBlocks: Hands out unique ids from blocks reserved in the database.
+- ShardedQuerySet: Queryset spread over the shards, whose reads are scattered and gathered.
+
+Functions:
+- get_shards(): Returns the aliases of the shard databases.
+- shard_for(pk): Returns the shard owning a product id.
+- get_executor(): Returns the pool of worker threads querying the shards.
+- scatter(function, items): Runs a function on every item in parallel, in the worker threads.
+"""
+import contextvars
+import functools
+import hashlib
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    close_old_connections,
+    connections,
+    transaction,
+)
+from django.db.models.query import (
+    FlatValuesListIterable,
+    ValuesIterable,
+    ValuesListIterable,
+)
+
+MAX_WORKERS = 16
+ID_BLOCK_SIZE = 100
+
+# Aggregates whose per-shard results combine into the result over every shard.
+COMBINERS = {"Count": sum, "Sum": sum, "Min": min, "Max": max}
+
+
+def get_shards():
+    """
+    Return the aliases of the shard databases.
+
+    Returns:
+    - list: The aliases listed by the PRODUCT_SHARDS setting, empty when not sharded.
+    """
+    return list(getattr(settings, "PRODUCT_SHARDS", ()))
+
+
+def shard_for(pk):
+    """
+    Return the shard owning a product id.
+
+    The id is hashed rather than taken modulo the number of shards, so that the products are
+    spread evenly whatever the pattern of the ids.
+
+    Parameters:
+    - pk (int): The id of the product.
+
+    Returns:
+    - str: The alias of the shard.
+    """
+    shards = get_shards()
+    digest = hashlib.blake2b(str(int(pk)).encode(), digest_size=8).digest()
+    return shards[int.from_bytes(digest, "big") % len(shards)]
+
+
+@functools.cache
+def get_executor():
+    """
+    Return the pool of worker threads querying the shards, created on first use.
+
+    Every worker thread holds its own connections, kept open like the ones of the request
+    threads (see the CONN_MAX_AGE database setting).
+
+    Returns:
+    - ThreadPoolExecutor: The pool.
+    """
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="shard")
+
+
+def run_task(function, *args):
+    """
+    Run a function in a worker thread, after closing its unusable or expired connections, like
+    Django does before every request.
+
+    Parameters:
+    - function (callable): The function.
+    - *args: Its arguments.
+
+    Returns:
+    - object: The result of the function.
+    """
+    close_old_connections()
+    return function(*args)
+
+
+def submit(function, *args):
+    """
+    Submit a function to the worker threads, in a copy of the current context.
+
+    Parameters:
+    - function (callable): The function.
+    - *args: Its arguments.
+
+    Returns:
+    - Future: The future result of the function.
+    """
+    context = contextvars.copy_context()
+    return get_executor().submit(context.run, run_task, function, *args)
+
+
+def scatter(function, items):
+    """
+    Run a function on every item in parallel, in the worker threads.
+
+    A single item is run in the calling thread, sparing the hand-off.
+
+    Parameters:
+    - function (callable): The function, taking an item.
+    - items (Iterable): The items (e.g. the querysets of the shards).
+
+    Returns:
+    - list: The results, in the order of the items.
+    """
+    items = list(items)
+    if len(items) == 1:
+        return [function(items[0])]
+
+    futures = [submit(function, item) for item in items]
+    return [future.result() for future in futures]
+
+
+class IdBlocks:
+    """
+    Hands out unique ids from blocks reserved in the database, so that the database is written
+    once per block rather than once per id.
+
+    The ids are reserved through the connection of the caller, which may hold a transaction
+    (and, with SQLite, the write lock) on the database. A block is only kept for the following
+    calls when reserved outside of any transaction, as a block reserved inside one would be
+    released by its rollback while its remaining ids are still handed out: such a reservation is
+    limited to the requested ids. The ids of a block left unused when the process exits are
+    skipped.
+
+    Attributes:
+    - reserve (callable): The function reserving a block, taking its size and returning its
+                          first and last id.
+    - block_size (int): The number of ids reserved at once.
+    - using (str): The alias of the database the blocks are reserved in.
+
+    Methods:
+    - allocate(count): Returns unique ids.
+    """
+
+    def __init__(self, reserve, block_size=ID_BLOCK_SIZE, using=DEFAULT_DB_ALIAS):
+        self.reserve = reserve
+        self.block_size = block_size
+        self.using = using
+        self._next = 1
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def allocate(self, count):
+        """
+        Return unique ids, from the kept block, and then from a new one.
+
+        Parameters:
+        - count (int): The number of ids.
+
+        Returns:
+        - list: The ids, increasing.
+        """
+        with self._lock:
+            taken = min(count, self._last - self._next + 1)
+            ids = list(range(self._next, self._next + taken))
+            self._next += taken
+            if len(ids) == count:
+                return ids
+
+            missing = count - len(ids)
+            if connections[self.using].in_atomic_block:
+                first, last = self.reserve(missing)
+            else:
+                first, last = self.reserve(max(self.block_size, missing))
+                self._next, self._last = first + missing, last
+
+        return ids + list(range(first, first + missing))
+
+
+def chained(name):
+    """
+    Build a ShardedQuerySet method applying a chainable QuerySet method to every shard.
+
+    Parameters:
+    - name (str): The name of the QuerySet method (e.g. "filter").
+
+    Returns:
+    - function: The method, returning a new ShardedQuerySet.
+    """
+
+    def method(self, *args, **kwargs):
+        self.check_not_sliced(name)
+        return self.map(lambda queryset: getattr(queryset, name)(*args, **kwargs))
+
+    method.__name__ = name
+    method.__doc__ = f"Apply 'QuerySet.{name}' to the queryset of every shard."
+    return method
+
+
+def get_ordering(queryset):
+    """
+    Return the ordering of a queryset, as field names possibly prefixed by '-'.
+
+    Parameters:
+    - queryset (QuerySet): The queryset.
+
+    Returns:
+    - tuple: The ordering, empty when the queryset is not ordered.
+
+    Raises:
+    - TypeError: If the queryset is ordered by expressions rather than field names.
+    """
+    query = queryset.query
+    if query.order_by:
+        ordering = query.order_by
+    elif query.extra_order_by:
+        ordering = query.extra_order_by
+    elif query.default_ordering:
+        ordering = queryset.model._meta.ordering
+    else:
+        ordering = ()
+
+    if not all(isinstance(name, str) for name in ordering):
+        raise TypeError("Sharded querysets can only be ordered by field names")
+
+    pk_name = queryset.model._meta.pk.attname
+    return tuple(
+        name.replace("pk", pk_name) if name.lstrip("-") == "pk" else name
+        for name in ordering
+    )
+
+
+def get_row_key(queryset, names):
+    """
+    Build the function reading the ordering values of the rows of a queryset.
+
+    Parameters:
+    - queryset (QuerySet): The queryset.
+    - names (list): The names of the ordering fields, without direction.
+
+    Returns:
+    - callable: The function, returning the ordering values of a row as a tuple.
+
+    Raises:
+    - TypeError: If the rows do not hold the ordering fields.
+    """
+    iterable = queryset._iterable_class
+
+    if issubclass(iterable, ValuesIterable):
+        return lambda row: tuple(row[name] for name in names)
+
+    if issubclass(iterable, FlatValuesListIterable):
+        if len(names) != 1 or list(queryset._fields) != names:
+            raise TypeError("Flat rows can only be merged on their single field")
+        return lambda row: (row,)
+
+    if issubclass(iterable, ValuesListIterable):
+        query = queryset.query
+        fields = list(queryset._fields) or [
+            *query.extra_select,
+            *query.values_select,
+            *query.annotation_select,
+        ]
+        if not set(names) <= set(fields):
+            raise TypeError("Merged rows must hold the ordering fields")
+        positions = [fields.index(name) for name in names]
+        return lambda row: tuple(row[position] for position in positions)
+
+    return lambda row: tuple(getattr(row, name) for name in names)
+
+
+def merge(queryset, iterables):
+    """
+    Merge the rows of the shards, each one ordered like the queryset, into a single ordered
+    sequence (k-way merge).
+
+    Parameters:
+    - queryset (QuerySet): The queryset of any shard, telling the ordering and the row type.
+    - iterables (list): The ordered rows of every shard.
+
+    Returns:
+    - iterator: The merged rows, or the rows of one shard after the other when the queryset is
+                not ordered.
+    """
+    ordering = get_ordering(queryset)
+    if not ordering:
+        return itertools.chain.from_iterable(iterables)
+
+    names = [name.lstrip("-") for name in ordering]
+    descending = [name.startswith("-") for name in ordering]
+    row_key = get_row_key(queryset, names)
+
+    if len(set(descending)) == 1:
+        return heapq.merge(*iterables, key=row_key, reverse=descending[0])
+
+    def compare(left, right):
+        # Mixed directions: the values are compared field by field, the descending ones
+        # reversed.
+        for left_value, right_value, reverse in zip(left, right, descending):
+            if left_value != right_value:
+                order = -1 if left_value < right_value else 1
+                return -order if reverse else order
+        return 0
+
+    key = functools.cmp_to_key(compare)
+    return heapq.merge(*iterables, key=lambda row: key(row_key(row)))
+
+
+class ShardedQuerySet:
+    """
+    Queryset spread over the shards, whose reads are scattered and gathered.
+
+    The chainable methods (e.g. 'filter', 'order_by', 'values_list') are applied to the
+    queryset of every shard. The reads run on every shard in parallel, in the worker threads,
+    and combine their results: the counts add up, the aggregates are combined, and the rows are
+    merged in the order of the queryset. A slice reads the rows up to its end from every shard,
+    and keeps the merged rows within its bounds.
+
+    The writes run in the calling thread, shard after shard, so that they join the transactions
+    it holds on the shards; the ones of every shard are atomic. New products are given their
+    id, which tells their shard, by 'allocate' before they are inserted.
+
+    Attributes:
+    - querysets (dict): The queryset of every shard, by alias.
+    - allocate (callable): The function returning unique ids for the new objects.
+    - model (class): The model of the querysets.
+
+    Methods:
+    - map(function): Returns a ShardedQuerySet of the querysets transformed by a function.
+    - count(): Returns the number of objects of every shard.
+    - acount(): Returns the number of objects of every shard, asynchronously.
+    - exists(): Tells whether any shard holds an object.
+    - aggregate(*args, **kwargs): Returns the aggregates combined over every shard.
+    - iterator(chunk_size=None): Iterates over the merged objects, streamed from every shard.
+    - first(): Returns the first object, or None.
+    - in_bulk(id_list=None): Returns the objects of some ids, read from their shards.
+    - bulk_create(objs, batch_size=None, **kwargs): Inserts objects in their shards.
+    - bulk_update(objs, fields, batch_size=None): Updates objects in their shards.
+    - update(**kwargs): Updates the objects of every shard.
+    - delete(): Deletes the objects of every shard.
+    """
+
+    all = chained("all")
+    filter = chained("filter")
+    exclude = chained("exclude")
+    order_by = chained("order_by")
+    values = chained("values")
+    values_list = chained("values_list")
+    only = chained("only")
+    defer = chained("defer")
+    annotate = chained("annotate")
+    extra = chained("extra")
+    none = chained("none")
+
+    def __init__(self, querysets, allocate=None, bounds=(0, None)):
+        """
+        Build the sharded queryset.
+
+        Parameters:
+        - querysets (dict): The queryset of every shard, by alias.
+        - allocate (callable): The function returning unique ids for the new objects.
+        - bounds (tuple): The start and stop of the slice taken, stop being None if unbounded.
+        """
+        self.querysets = dict(querysets)
+        self.allocate = allocate
+        self.model = next(iter(self.querysets.values())).model
+        self._bounds = bounds
+        self._result_cache = None
+
+    def __repr__(self):
+        return f"<ShardedQuerySet of {len(self.querysets)} shards>"
+
+    def map(self, function):
+        """
+        Return a ShardedQuerySet of the querysets transformed by a function.
+
+        Parameters:
+        - function (callable): The function, taking and returning a queryset.
+
+        Returns:
+        - ShardedQuerySet: The transformed sharded queryset.
+        """
+        return ShardedQuerySet(
+            {alias: function(queryset) for alias, queryset in self.querysets.items()},
+            self.allocate,
+        )
+
+    def check_not_sliced(self, operation):
+        """
+        Refuse to change the query once a slice was taken, like a QuerySet does.
+
+        Parameters:
+        - operation (str): The name of the refused operation.
+
+        Raises:
+        - TypeError: If a slice was taken.
+        """
+        if self._bounds != (0, None):
+            raise TypeError(f"Cannot {operation} a query once a slice has been taken.")
+
+    @property
+    def ordered(self):
+        """
+        Tell whether the querysets are ordered, so that the merged rows are.
+        """
+        return all(queryset.ordered for queryset in self.querysets.values())
+
+    @property
+    def db(self):
+        """
+        Return the database of the queryset: None, as it spans the shards.
+        """
+        return None
+
+    def scatter(self, function):
+        """
+        Run a function on the queryset of every shard, in parallel.
+
+        Parameters:
+        - function (callable): The function, taking a queryset.
+
+        Returns:
+        - list: The results, in the order of the shards.
+        """
+        return scatter(function, self.querysets.values())
+
+    def __getitem__(self, key):
+        """
+        Take a slice of the merged objects, or one of them.
+
+        Parameters:
+        - key (int | slice): The index or the slice, without step.
+
+        Returns:
+        - object | ShardedQuerySet: The object, or the sliced sharded queryset.
+
+        Raises:
+        - IndexError: If the index is past the objects.
+        - TypeError: If the key is negative or has a step.
+        """
+        if isinstance(key, int):
+            if key < 0:
+                raise TypeError("Negative indexing is not supported.")
+            return list(self[key : key + 1])[0]
+
+        if key.step is not None or (key.start or 0) < 0 or (key.stop or 0) < 0:
+            raise TypeError("Negative indexing and steps are not supported.")
+
+        start, stop = self._bounds
+        new_start = start + (key.start or 0)
+        new_stop = stop if key.stop is None else start + key.stop
+        if stop is not None and new_stop is not None:
+            new_stop = min(new_stop, stop)
+        if new_stop is not None:
+            new_start = min(new_start, new_stop)
+
+        return ShardedQuerySet(self.querysets, self.allocate, (new_start, new_stop))
+
+    def fetch(self):
+        """
+        Read the objects within the bounds of the slice from every shard, in parallel, and
+        merge them.
+
+        Returns:
+        - list: The merged objects.
+        """
+        if self._result_cache is None:
+            start, stop = self._bounds
+            rows = self.scatter(
+                lambda queryset: list(queryset if stop is None else queryset[:stop])
+            )
+            merged = merge(next(iter(self.querysets.values())), rows)
+            self._result_cache = list(itertools.islice(merged, start, stop))
+        return self._result_cache
+
+    def __iter__(self):
+        return iter(self.fetch())
+
+    async def __aiter__(self):
+        for row in await sync_to_async(self.fetch)():
+            yield row
+
+    def __len__(self):
+        return len(self.fetch())
+
+    def __bool__(self):
+        return bool(self.fetch())
+
+    def iterator(self, chunk_size=None):
+        """
+        Iterate over the merged objects, streamed from every shard in chunks, without holding
+        them all in memory (e.g. for exports).
+
+        Parameters:
+        - chunk_size (int): The number of rows fetched at once from each shard.
+
+        Returns:
+        - iterator: The merged objects.
+        """
+        start, stop = self._bounds
+        iterables = [
+            queryset.iterator(chunk_size=chunk_size)
+            for queryset in self.querysets.values()
+        ]
+        merged = merge(next(iter(self.querysets.values())), iterables)
+        return itertools.islice(merged, start, stop)
+
+    def count(self):
+        """
+        Return the number of objects of every shard, counted in parallel.
+
+        Returns:
+        - int: The number of objects.
+        """
+        if self._result_cache is not None or self._bounds != (0, None):
+            return len(self.fetch())
+        return sum(self.scatter(lambda queryset: queryset.count()))
+
+    async def acount(self):
+        """
+        Return the number of objects of every shard, for the async views.
+
+        Returns:
+        - int: The number of objects.
+        """
+        return await sync_to_async(self.count)()
+
+    def exists(self):
+        """
+        Tell whether any shard holds an object.
+
+        Returns:
+        - bool: True if an object exists.
+        """
+        return any(self.scatter(lambda queryset: queryset.exists()))
+
+    def aggregate(self, *args, **kwargs):
+        """
+        Return the aggregates computed by every shard, in parallel, and combined.
+
+        Parameters:
+        - *args: The aggregates named by their default alias.
+        - **kwargs: The aggregates, by name.
+
+        Returns:
+        - dict: The combined aggregates, by name.
+
+        Raises:
+        - TypeError: If an aggregate can not be combined (e.g. averages or distinct counts).
+        """
+        self.check_not_sliced("aggregate")
+        aggregates = {**{arg.default_alias: arg for arg in args}, **kwargs}
+        for expression in aggregates.values():
+            name = type(expression).__name__
+            if name not in COMBINERS or getattr(expression, "distinct", False):
+                raise TypeError(f"{name} can not be combined across shards")
+
+        results = self.scatter(lambda queryset: queryset.aggregate(**aggregates))
+
+        combined = {}
+        for name, expression in aggregates.items():
+            values = [result[name] for result in results if result[name] is not None]
+            combine = COMBINERS[type(expression).__name__]
+            combined[name] = combine(values) if values else None
+        return combined
+
+    def first(self):
+        """
+        Return the first object, ordered by primary key unless otherwise ordered.
+
+        Returns:
+        - object: The first object, or None.
+        """
+        queryset = self if self.ordered else self.order_by("pk")
+        rows = list(queryset[:1])
+        return rows[0] if rows else None
+
+    def group_by_shard(self, objs):
+        """
+        Group objects by the shard owning their primary key.
+
+        Parameters:
+        - objs (Iterable): The objects (or primary keys).
+
+        Returns:
+        - dict: The objects of every shard owning some, by alias.
+        """
+        groups = defaultdict(list)
+        for obj in objs:
+            groups[shard_for(getattr(obj, "pk", obj))].append(obj)
+        return groups
+
+    def in_bulk(self, id_list=None):
+        """
+        Return the objects of some ids, read from the shards owning them, in parallel.
+
+        Parameters:
+        - id_list (Iterable): The ids, or None for every object.
+
+        Returns:
+        - dict: The objects, by id.
+        """
+        self.check_not_sliced("in_bulk")
+        if id_list is None:
+            results = self.scatter(lambda queryset: queryset.in_bulk())
+        else:
+            groups = self.group_by_shard(id_list)
+            results = scatter(
+                lambda alias: self.querysets[alias].in_bulk(groups[alias]), groups
+            )
+        return {pk: obj for result in results for pk, obj in result.items()}
+
+    def bulk_create(self, objs, batch_size=None, **kwargs):
+        """
+        Insert objects in the shards owning them, giving the new ones their id first.
+
+        Parameters:
+        - objs (Iterable): The objects.
+        - batch_size (int): The number of rows inserted by each INSERT statement.
+        - **kwargs: The other arguments of 'QuerySet.bulk_create'.
+
+        Returns:
+        - list: The inserted objects, in the given order.
+        """
+        objs = list(objs)
+        new = [obj for obj in objs if obj.pk is None]
+        for obj, pk in zip(new, self.allocate(len(new)) if new else ()):
+            obj.pk = pk
+
+        for alias, group in self.group_by_shard(objs).items():
+            with transaction.atomic(using=alias):
+                self.querysets[alias].bulk_create(group, batch_size, **kwargs)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Update the given fields of objects in the shards owning them.
+
+        Parameters:
+        - objs (Iterable): The objects.
+        - fields (list): The names of the updated fields.
+        - batch_size (int): The number of rows updated by each UPDATE statement.
+
+        Returns:
+        - int: The number of updated rows.
+        """
+        updated = 0
+        for alias, group in self.group_by_shard(objs).items():
+            with transaction.atomic(using=alias):
+                updated += self.querysets[alias].bulk_update(group, fields, batch_size)
+        return updated
+
+    def update(self, **kwargs):
+        """
+        Update the objects of every shard.
+
+        Parameters:
+        - **kwargs: The updated fields and their values.
+
+        Returns:
+        - int: The number of updated rows.
+        """
+        self.check_not_sliced("update")
+        updated = 0
+        for alias, queryset in self.querysets.items():
+            with transaction.atomic(using=alias):
+                updated += queryset.update(**kwargs)
+        return updated
+
+    def delete(self):
+        """
+        Delete the objects of every shard, each shard deleting them like its queryset does
+        (e.g. 'ProductQuerySet.delete').
+
+        Returns:
+        - tuple: The number of deleted objects, and their number per model.
+        """
+        self.check_not_sliced("delete")
+        deleted, per_model = 0, defaultdict(int)
+        for alias, queryset in self.querysets.items():
+            with transaction.atomic(using=alias):
+                count, counts = queryset.delete()
+            deleted += count
+            for label, value in counts.items():
+                per_model[label] += value
+        return deleted, dict(per_model)
+
+    def _raw_delete(self, using=None):
+        """
+        Delete the rows of every shard with a single DELETE statement per shard, like
+        'QuerySet._raw_delete', without sending the model signals.
+
+        Parameters:
+        - using (str): Ignored, every shard deleting from its own database.
+
+        Returns:
+        - int: The number of deleted rows.
+        """
+        self.check_not_sliced("delete")
+        return sum(
+            queryset._raw_delete(queryset.db) for queryset in self.querysets.values()
+        )
@@ -0,0 +1,291 @@
+"""
+Module containing the signals of the 'product' application, and their receivers.
+
+Signals:
+- products_changed: Sent by the bulk code paths, which change many products at once without
+                    sending the 'post_save' and 'post_delete' model signals. Its receivers get
+                    the 'action' ("create", "update" or "delete") and the affected 'instances',
+                    or None when they are not known (e.g. for filter-based mutations). The
+                    "update" senders may also give the 'previous_prices' of the updated products
+                    whose price changed, by primary key, or else the 'price_range' holding their
+                    previous and new prices, and the 'update_fields' they changed. It is also
+                    sent by the queryset deletions of the products (see
+                    'ProductQuerySet.delete').
+
+Receivers:
+- invalidate_catalog_version(sender, **kwargs): Bumps the catalog version once the transaction
+                                                 changing the products is committed.
+- invalidate_cached_products(sender, **kwargs): Invalidates the cached changed products once the
+                                                 transaction changing them is committed.
+- update_product_names(sender, **kwargs): Updates the autocomplete index of the product names
+                                           once the transaction changing them is committed.
+- remember_previous_price(sender, instance, **kwargs): Reads the stored price of a product about
+                                                      to be updated.
+- update_price_stats(sender, **kwargs): Updates the price statistics summary in the transaction
+                                         changing the products.
+- configure_sqlite_connection(sender, connection, **kwargs): Applies the pragma profile of its
+                                                            database to a new SQLite connection.
+- forget_cached_user(sender, instance, **kwargs): Evicts a saved or deleted user from the cache
+                                                   of the authentication, once the transaction
+                                                   changing it is committed.
+
+Functions:
+- group_by_database(products): Groups products by the database holding them.
+"""
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import forget_user
+from .autocomplete import product_names
+from .cache import bump_catalog_version, invalidate_products
+from .database import configure_connection
+from .models import Product
+from .sharding import get_shards
+from .stats import (
+    add_prices,
+    rebuild_price_buckets,
+    rebuild_price_stats,
+    remove_prices,
+    to_cents,
+)
+
+products_changed = Signal()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(products_changed, sender=Product)
+def invalidate_catalog_version(sender, **kwargs):
+    """
+    Bump the catalog version once the transaction changing the products is committed.
+
+    Bumping it after the commit guarantees that no request can cache the previous state of the
+    products under the new version.
+
+    Parameters:
+    - sender (class): The Product model.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(products_changed, sender=Product)
+def invalidate_cached_products(sender, instance=None, instances=None, **kwargs):
+    """
+    Invalidate the cached changed products once the transaction changing them is committed.
+
+    Every cached product is invalidated when the changed products are not known.
+
+    Parameters:
+    - sender (class): The Product model.
+    - instance (Product): The saved or deleted product, for the model signals.
+    - instances (list): The changed products, or None, for the 'products_changed' signal.
+    """
+    if instance is not None:
+        instances = [instance]
+
+    pks = [product.pk for product in instances] if instances is not None else None
+    if pks is not None and None in pks:
+        pks = None
+
+    transaction.on_commit(partial(invalidate_products, pks))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(products_changed, sender=Product)
+def update_product_names(
+    sender,
+    signal,
+    instance=None,
+    instances=None,
+    action=None,
+    update_fields=None,
+    **kwargs,
+):
+    """
+    Update the autocomplete index of the product names once the transaction is committed.
+
+    The index is left untouched when the names were not changed, and marked to be reloaded when
+    the changed products are not known.
+
+    Parameters:
+    - sender (class): The Product model.
+    - signal (Signal): The received signal.
+    - instance (Product): The saved or deleted product, for the model signals.
+    - instances (list): The changed products, or None, for the 'products_changed' signal.
+    - action (str): The change ("create", "update" or "delete"), for the 'products_changed'
+                    signal.
+    - update_fields (frozenset): The changed fields, or None for every field, for 'post_save'
+                                 and the 'products_changed' signal.
+    """
+    if update_fields is not None and "name" not in update_fields:
+        return
+
+    if instance is not None:
+        instances = [instance]
+        action = "delete" if signal is post_delete else "update"
+
+    if instances is None or any(product.pk is None for product in instances):
+        transaction.on_commit(product_names.invalidate)
+    elif action == "delete":
+        pks = [product.pk for product in instances]
+        transaction.on_commit(partial(product_names.remove, pks))
+    else:
+        products = [(product.pk, product.name) for product in instances]
+        transaction.on_commit(partial(product_names.update, products))
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_price(
+    sender, instance, using=DEFAULT_DB_ALIAS, update_fields=None, **kwargs
+):
+    """
+    Read the stored price of a product about to be updated, so that the price statistics can
+    move it out of its previous bucket.
+
+    Parameters:
+    - sender (class): The Product model.
+    - instance (Product): The product about to be saved.
+    - using (str): The alias of the database.
+    - update_fields (frozenset): The saved fields, or None for every field.
+    """
+    if instance._state.adding:
+        return
+    if update_fields is not None and "price" not in update_fields:
+        return
+
+    instance._previous_price = (
+        Product.objects.using(using)
+        .filter(pk=instance.pk)
+        .values_list("price", flat=True)
+        .first()
+    )
+
+
+def group_by_database(products):
+    """
+    Group products by the database they were read from or written to (their shard when sharded).
+
+    Parameters:
+    - products (list): The products.
+
+    Returns:
+    - dict: The products of every database, by alias.
+    """
+    groups = defaultdict(list)
+    for product in products:
+        groups[product._state.db or DEFAULT_DB_ALIAS].append(product)
+    return groups
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(products_changed, sender=Product)
+def update_price_stats(
+    sender,
+    signal,
+    instance=None,
+    instances=None,
+    action=None,
+    previous_prices=None,
+    price_range=None,
+    using=DEFAULT_DB_ALIAS,
+    update_fields=None,
+    **kwargs,
+):
+    """
+    Update the price statistics summary in the transaction changing the products, so that it is
+    rolled back along with them.
+
+    The summary is rebuilt when the changed products, or the previous prices of the updated
+    ones, are not known, or only its buckets holding the 'price_range' of the updated products
+    when it is given. When sharded, the summary of every shard is updated with the products it
+    holds, or rebuilt.
+
+    Parameters:
+    - sender (class): The Product model.
+    - signal (Signal): The received signal.
+    - instance (Product): The saved or deleted product, for the model signals.
+    - instances (list): The changed products, or None, for the 'products_changed' signal.
+    - action (str): The change ("create", "update" or "delete"), for the 'products_changed'
+                    signal.
+    - previous_prices (dict): The previous price of the updated products whose price changed,
+                              by primary key, for the 'products_changed' signal.
+    - price_range (tuple): The lowest and highest of the previous and new prices of the updated
+                           products, when they are not known, for the 'products_changed' signal.
+    - using (str): The alias of the database.
+    - update_fields (frozenset): The saved fields, or None for every field, for 'post_save'.
+    """
+    if signal is post_delete:
+        remove_prices([instance.price], using)
+    elif signal is post_save:
+        if update_fields is not None and "price" not in update_fields:
+            return
+
+        previous = instance.__dict__.pop("_previous_price", None)
+        if previous is not None:
+            if to_cents(previous) == to_cents(instance.price):
+                return
+            remove_prices([previous], using)
+        add_prices([instance.price], using)
+    elif instances is None and price_range is not None:
+        for alias in get_shards() or [DEFAULT_DB_ALIAS]:
+            with transaction.atomic(using=alias):
+                rebuild_price_buckets(*price_range, alias)
+    elif instances is None or (
+        action not in ("create", "delete") and previous_prices is None
+    ):
+        for alias in get_shards() or [DEFAULT_DB_ALIAS]:
+            with transaction.atomic(using=alias):
+                rebuild_price_stats(alias)
+    else:
+        for alias, products in group_by_database(instances).items():
+            if action == "create":
+                add_prices([product.price for product in products], alias)
+            elif action == "delete":
+                remove_prices([product.price for product in products], alias)
+            else:
+                changed = [
+                    product for product in products if product.pk in previous_prices
+                ]
+                remove_prices(
+                    [previous_prices[product.pk] for product in changed], alias
+                )
+                add_prices([product.price for product in changed], alias)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Apply the pragma profile of its database (e.g. WAL journal and busy timeout) to a new SQLite
+    connection, before any query runs on it.
+
+    Parameters:
+    - sender (class): The class of the database backend.
+    - connection (BaseDatabaseWrapper): The new connection.
+    """
+    configure_connection(connection)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_cached_user(sender, instance, **kwargs):
+    """
+    Evict a saved or deleted user from the cache of the authentication once the transaction
+    changing it is committed, so that its deactivation or password change takes effect.
+
+    Parameters:
+    - sender (class): The user model.
+    - instance (User): The saved or deleted user.
+    """
+    user_id = getattr(instance, jwt_settings.USER_ID_FIELD)
+    transaction.on_commit(partial(forget_user, user_id))
@@ -0,0 +1,522 @@
+"""
+Module containing the price statistics of the products catalog.
+
+The statistics (number of products, lowest, highest and average price, and price histogram) are
+served from the 'ProductPriceBucket' summary table, which holds the number of products, the sum
+of their prices and their lowest and highest price for each price bucket. Answering a request
+reads a few dozen rows, whatever the size of the catalog.
+
+The buckets follow the leading digit of the prices: [1.00, 2.00), [2.00, 3.00), ...,
+[10.00, 20.00), ..., [90000000.00, 100000000.00), after a first bucket holding the prices below
+0.01. Prices are handled in cents, as integers, so that their sums stay exact.
+
+The summary is updated incrementally by the Product signals (see the 'signals' module), inside
+the transaction changing the products, so that it is rolled back along with them. Changes whose
+products or previous prices are not known rebuild it from the 'price' index, with a vectorized
+computation when NumPy is installed, or only rebuild the buckets of the changed price range when
+it is known (e.g. filter-based price adjustments).
+
+When the products are sharded (see the 'sharding' module), every shard holds the summary of its
+own products, updated in its transactions, and the summaries of the shards are combined.
+
+Statistics filtered by price read the buckets lying inside the price range from the summary,
+and the prices of the (at most two) buckets crossing its bounds from the 'price' index.
+Statistics filtered by name are computed from the '(name, price)' index. The products table
+itself is never scanned.
+
+Functions:
+- to_cents(price): Converts a price to cents.
+- get_bucket(cents): Returns the bucket of a price in cents.
+- get_bucket_bounds(bucket): Returns the lowest and highest prices in cents of a bucket.
+- price_cents(queryset): Reads the prices in cents of the products of a queryset.
+- filter_cents(queryset, lowest, highest): Restricts a queryset to a price range in cents.
+- summarize(cents): Summarizes prices in cents per bucket.
+- add_prices(prices, using): Adds prices to the summary.
+- remove_prices(prices, using): Removes prices from the summary.
+- rebuild_price_stats(using): Rebuilds the summary from the products table.
+- rebuild_price_buckets(lowest, highest, using): Rebuilds the buckets holding a price range.
+- get_summary_sources(): Returns the querysets of the summary rows of the shards.
+- combine_summary(rows): Combines the summary rows of the shards.
+- read_summary(): Reads the summary, combined over the shards.
+- aread_summary(): Async version of 'read_summary'.
+- get_price_stats(name, min_price, max_price): Computes the statistics of the products.
+- estimate_price_count(min_price, max_price, summary): Estimates the number of products in a
+                                                       price range.
+- aestimate_price_count(min_price, max_price): Async version of 'estimate_price_count'.
+"""
+import itertools
+import math
+from bisect import bisect_right
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import BigIntegerField, F, Max, Min
+from django.db.models.functions import Cast, Greatest, Least, Round
+
+from .models import Product, ProductPriceBucket
+from .sharding import get_shards
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+CENT = Decimal("0.01")
+CHUNK_SIZE = 10000
+
+# Lowest price in cents of each bucket. The first bucket starts at the lowest price a product can
+# hold (10 digits, 2 of them decimal places), and the last one ends at the highest.
+BUCKET_EDGES = [-(10**10) + 1] + [
+    digit * 10**exponent for exponent in range(10) for digit in range(1, 10)
+]
+HIGHEST_CENTS = 10**10 - 1
+
+SUMMARY_FIELDS = ("count", "total", "lowest", "highest")
+
+
+def to_cents(price):
+    """
+    Convert a price to cents.
+
+    Parameters:
+    - price (Decimal | float | int | str): The price, as held by a Product.
+
+    Returns:
+    - int: The price in cents, rounded like the database rounds it.
+    """
+    return int(Decimal(str(price)).quantize(CENT).scaleb(2))
+
+
+def get_bucket(cents):
+    """
+    Return the bucket of a price in cents.
+
+    Parameters:
+    - cents (int): The price in cents.
+
+    Returns:
+    - int: The index of the bucket in BUCKET_EDGES.
+    """
+    return max(bisect_right(BUCKET_EDGES, cents) - 1, 0)
+
+
+def get_bucket_bounds(bucket):
+    """
+    Return the lowest and highest prices in cents of a bucket.
+
+    Parameters:
+    - bucket (int): The index of the bucket.
+
+    Returns:
+    - tuple: The lowest and highest prices in cents (both inclusive).
+    """
+    if bucket + 1 < len(BUCKET_EDGES):
+        return BUCKET_EDGES[bucket], BUCKET_EDGES[bucket + 1] - 1
+    return BUCKET_EDGES[bucket], HIGHEST_CENTS
+
+
+def price_cents(queryset):
+    """
+    Read the prices in cents of the products of a queryset.
+
+    Only the price is selected, so that the query is answered from the 'price' (or the
+    '(name, price)') index, without reading the products table.
+
+    Parameters:
+    - queryset (QuerySet): The Product queryset.
+
+    Returns:
+    - iterator: The prices in cents.
+    """
+    return (
+        queryset.order_by()
+        .annotate(cents=Cast(Round(F("price") * 100), BigIntegerField()))
+        .values_list("cents", flat=True)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def filter_cents(queryset, lowest, highest):
+    """
+    Restrict a Product queryset to a price range in cents.
+
+    Parameters:
+    - queryset (QuerySet): The Product queryset.
+    - lowest (int): The lowest price in cents (inclusive).
+    - highest (int): The highest price in cents (inclusive).
+
+    Returns:
+    - QuerySet: The filtered queryset.
+    """
+    return queryset.filter(
+        price__range=(Decimal(lowest) * CENT, Decimal(highest) * CENT)
+    )
+
+
+def summarize(cents):
+    """
+    Summarize prices in cents per bucket.
+
+    With NumPy, the prices are sorted once: the buckets are then contiguous slices of the sorted
+    prices, found with a binary search of the bucket edges, their lowest and highest prices are
+    the bounds of the slices, and their sums are computed with a single 'reduceat'.
+
+    Parameters:
+    - cents (iterable): The prices in cents.
+
+    Returns:
+    - dict: The number of products, the sum, and the lowest and highest price of each non-empty
+            bucket, as a tuple.
+    """
+    if numpy is None:
+        summary = {}
+        for value in cents:
+            bucket = get_bucket(value)
+            entry = summary.get(bucket)
+            if entry is None:
+                summary[bucket] = [1, value, value, value]
+            else:
+                entry[0] += 1
+                entry[1] += value
+                entry[2] = min(entry[2], value)
+                entry[3] = max(entry[3], value)
+        return {bucket: tuple(entry) for bucket, entry in summary.items()}
+
+    values = numpy.fromiter(cents, dtype=numpy.int64)
+    if not values.size:
+        return {}
+
+    values.sort()
+    starts = numpy.searchsorted(values, BUCKET_EDGES, side="left")
+    starts[0] = 0
+    ends = numpy.append(starts[1:], values.size)
+    buckets = numpy.flatnonzero(ends > starts)
+    starts, ends = starts[buckets], ends[buckets]
+    totals = numpy.add.reduceat(values, starts)
+
+    return {
+        int(bucket): (
+            int(end - start),
+            int(total),
+            int(values[start]),
+            int(values[end - 1]),
+        )
+        for bucket, start, end, total in zip(buckets, starts, ends, totals)
+    }
+
+
+def add_prices(prices, using=DEFAULT_DB_ALIAS):
+    """
+    Add the prices of created (or updated) products to the summary.
+
+    Parameters:
+    - prices (iterable): The prices.
+    - using (str): The alias of the database.
+    """
+    buckets = ProductPriceBucket.objects.using(using)
+    summary = summarize(map(to_cents, prices))
+
+    def increment(bucket, count, total, lowest, highest):
+        return buckets.filter(bucket=bucket).update(
+            count=F("count") + count,
+            total=F("total") + total,
+            lowest=Least(F("lowest"), lowest),
+            highest=Greatest(F("highest"), highest),
+        )
+
+    missing = {
+        bucket: entry
+        for bucket, entry in summary.items()
+        if not increment(bucket, *entry)
+    }
+    if not missing:
+        return
+
+    try:
+        with transaction.atomic(using=using):
+            buckets.bulk_create(
+                ProductPriceBucket(
+                    bucket=bucket,
+                    count=count,
+                    total=total,
+                    lowest=lowest,
+                    highest=highest,
+                )
+                for bucket, (count, total, lowest, highest) in missing.items()
+            )
+    except IntegrityError:
+        # Some of the buckets were created concurrently: they are incremented instead.
+        for bucket, entry in missing.items():
+            if not increment(bucket, *entry):
+                buckets.create(bucket=bucket, **dict(zip(SUMMARY_FIELDS, entry)))
+
+
+def remove_prices(prices, using=DEFAULT_DB_ALIAS):
+    """
+    Remove the prices of deleted (or updated) products from the summary.
+
+    Emptied buckets are deleted. When a removed price was the lowest or the highest one of its
+    bucket, the new one is read from the 'price' index, within the bounds of the bucket.
+
+    Parameters:
+    - prices (iterable): The prices.
+    - using (str): The alias of the database.
+    """
+    buckets = ProductPriceBucket.objects.using(using)
+
+    summary = summarize(map(to_cents, prices))
+    for bucket, (count, total, lowest, highest) in summary.items():
+        buckets.filter(bucket=bucket).update(
+            count=F("count") - count, total=F("total") - total
+        )
+        row = buckets.filter(bucket=bucket).first()
+        if row is None:
+            continue
+
+        if row.count <= 0:
+            row.delete()
+        elif lowest <= row.lowest or highest >= row.highest:
+            products = filter_cents(
+                Product.objects.using(using), *get_bucket_bounds(bucket)
+            )
+            bounds = products.aggregate(lowest=Min("price"), highest=Max("price"))
+            if bounds["lowest"] is None:
+                row.delete()
+            else:
+                row.lowest = to_cents(bounds["lowest"])
+                row.highest = to_cents(bounds["highest"])
+                row.save(update_fields=["lowest", "highest"])
+
+
+def rebuild_price_stats(using=DEFAULT_DB_ALIAS):
+    """
+    Rebuild the summary from the 'price' index of the products table.
+
+    It should run inside the transaction changing the products, or inside its own one.
+
+    Parameters:
+    - using (str): The alias of the database.
+    """
+    summary = summarize(price_cents(Product.objects.using(using)))
+
+    buckets = ProductPriceBucket.objects.using(using)
+    buckets.all().delete()
+    buckets.bulk_create(
+        ProductPriceBucket(
+            bucket=bucket, count=count, total=total, lowest=lowest, highest=highest
+        )
+        for bucket, (count, total, lowest, highest) in summary.items()
+    )
+
+
+def rebuild_price_buckets(lowest, highest, using=DEFAULT_DB_ALIAS):
+    """
+    Rebuild the buckets of the summary holding a price range, from the 'price' index of the
+    products within their bounds.
+
+    It should run inside the transaction changing the products, or inside its own one.
+
+    Parameters:
+    - lowest (Decimal): The lowest price of the range.
+    - highest (Decimal): The highest price of the range.
+    - using (str): The alias of the database.
+    """
+    first, last = get_bucket(to_cents(lowest)), get_bucket(to_cents(highest))
+    products = filter_cents(
+        Product.objects.using(using),
+        get_bucket_bounds(first)[0],
+        get_bucket_bounds(last)[1],
+    )
+    summary = summarize(price_cents(products))
+
+    buckets = ProductPriceBucket.objects.using(using)
+    buckets.filter(bucket__range=(first, last)).delete()
+    buckets.bulk_create(
+        ProductPriceBucket(
+            bucket=bucket, count=count, total=total, lowest=lowest, highest=highest
+        )
+        for bucket, (count, total, lowest, highest) in summary.items()
+    )
+
+
+def get_summary_sources():
+    """
+    Return the querysets of the summary rows, one per shard when the products are sharded.
+
+    Returns:
+    - list: The ProductPriceBucket querysets.
+    """
+    sources = [ProductPriceBucket.objects.using(alias) for alias in get_shards()]
+    return sources or [ProductPriceBucket.objects.all()]
+
+
+def combine_summary(rows):
+    """
+    Combine the summary rows of the shards, adding up the rows of the same bucket.
+
+    Parameters:
+    - rows (iterable): The ProductPriceBucket rows.
+
+    Returns:
+    - dict: The number of products, the sum, and the lowest and highest price of each non-empty
+            bucket, as a tuple, like 'summarize' returns.
+    """
+    summary = {}
+    for row in rows:
+        entry = (row.count, row.total, row.lowest, row.highest)
+        if row.bucket in summary:
+            count, total, lowest, highest = summary[row.bucket]
+            entry = (
+                count + row.count,
+                total + row.total,
+                min(lowest, row.lowest),
+                max(highest, row.highest),
+            )
+        summary[row.bucket] = entry
+    return summary
+
+
+def read_summary():
+    """
+    Read the summary, combined over the shards when the products are sharded.
+
+    Returns:
+    - dict: The summary of each non-empty bucket, like 'combine_summary' returns.
+    """
+    return combine_summary(itertools.chain(*get_summary_sources()))
+
+
+async def aread_summary():
+    """
+    Read the summary with the async ORM, combined over the shards when the products are
+    sharded.
+
+    Returns:
+    - dict: The summary of each non-empty bucket, like 'combine_summary' returns.
+    """
+    rows = []
+    for source in get_summary_sources():
+        rows.extend([row async for row in source])
+    return combine_summary(rows)
+
+
+def get_price_stats(name=None, min_price=None, max_price=None):
+    """
+    Compute the statistics of the products, optionally filtered by name or price range.
+
+    Parameters:
+    - name (str): The exact name of the products, if any.
+    - min_price (Decimal): The lowest price of the products (inclusive), if any.
+    - max_price (Decimal): The highest price of the products (inclusive), if any.
+
+    Returns:
+    - dict: The number of products ('count'), their lowest, highest and average price
+            ('min_price', 'max_price' and 'avg_price', None when there is no product), and the
+            number of products per price bucket ('histogram', holding the non-empty buckets
+            with their 'lower' and 'upper' price, upper excluded).
+    """
+    lowest = BUCKET_EDGES[0] if min_price is None else math.ceil(min_price * 100)
+    highest = HIGHEST_CENTS if max_price is None else math.floor(max_price * 100)
+    lowest, highest = max(lowest, BUCKET_EDGES[0]), min(highest, HIGHEST_CENTS)
+
+    if name:
+        products = filter_cents(
+            Product.objects.sharded().filter(name__exact=name), lowest, highest
+        )
+        summary = summarize(price_cents(products))
+    else:
+        summary = {}
+        for bucket, entry in read_summary().items():
+            lower, upper = get_bucket_bounds(bucket)
+            if upper < lowest or lower > highest:
+                continue
+            if lowest <= lower and upper <= highest:
+                summary[bucket] = entry
+            else:
+                products = filter_cents(
+                    Product.objects.sharded(), max(lower, lowest), min(upper, highest)
+                )
+                summary.update(summarize(price_cents(products)))
+
+    count = sum(entry[0] for entry in summary.values())
+    if not count:
+        return {
+            "count": 0,
+            "min_price": None,
+            "max_price": None,
+            "avg_price": None,
+            "histogram": [],
+        }
+
+    total = sum(entry[1] for entry in summary.values())
+    histogram = []
+    for bucket in sorted(summary):
+        lower, upper = get_bucket_bounds(bucket)
+        histogram.append(
+            {
+                "lower": Decimal(lower) * CENT,
+                "upper": Decimal(upper + 1) * CENT,
+                "count": summary[bucket][0],
+            }
+        )
+
+    return {
+        "count": count,
+        "min_price": Decimal(min(entry[2] for entry in summary.values())) * CENT,
+        "max_price": Decimal(max(entry[3] for entry in summary.values())) * CENT,
+        "avg_price": Decimal(total) / count * CENT,
+        "histogram": histogram,
+    }
+
+
+def estimate_price_count(min_price=None, max_price=None, summary=None):
+    """
+    Estimate the number of products in a price range, from the summary only.
+
+    The buckets lying inside the range are counted exactly. The products of the buckets crossing
+    its bounds are assumed to be evenly spread between the lowest and the highest price of their
+    bucket.
+
+    Parameters:
+    - min_price (Decimal): The lowest price of the products (inclusive), if any.
+    - max_price (Decimal): The highest price of the products (inclusive), if any.
+    - summary (dict): The summary, as returned by 'read_summary'. Read when not given.
+
+    Returns:
+    - tuple: The number of products, and whether it is exact (no bucket crosses the bounds).
+    """
+    if summary is None:
+        summary = read_summary()
+
+    lowest = BUCKET_EDGES[0] if min_price is None else math.ceil(min_price * 100)
+    highest = HIGHEST_CENTS if max_price is None else math.floor(max_price * 100)
+
+    count, exact = 0, True
+    for bucket_count, _, bucket_lowest, bucket_highest in summary.values():
+        if bucket_highest < lowest or bucket_lowest > highest:
+            continue
+        if lowest <= bucket_lowest and bucket_highest <= highest:
+            count += bucket_count
+        else:
+            covered = min(highest, bucket_highest) - max(lowest, bucket_lowest) + 1
+            count += round(
+                bucket_count * covered / (bucket_highest - bucket_lowest + 1)
+            )
+            exact = False
+
+    return count, exact
+
+
+async def aestimate_price_count(min_price=None, max_price=None):
+    """
+    Estimate the number of products in a price range, like 'estimate_price_count', reading the
+    summary with the async ORM.
+
+    Parameters:
+    - min_price (Decimal): The lowest price of the products (inclusive), if any.
+    - max_price (Decimal): The highest price of the products (inclusive), if any.
+
+    Returns:
+    - tuple: The number of products, and whether it is exact (no bucket crosses the bounds).
+    """
+    return estimate_price_count(min_price, max_price, await aread_summary())
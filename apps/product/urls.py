@@ -1,8 +1,34 @@
 from django.urls import path
 
-from .views import ProductDetail, ProductList
+from .async_views import AsyncProductDetail, AsyncProductList
+from .views import (
+    ProductAutocomplete,
+    ProductBulk,
+    ProductDetail,
+    ProductExport,
+    ProductList,
+    ProductReprice,
+    ProductSearch,
+    ProductStats,
+)
 
 urlpatterns = [
     path("products/", ProductList.as_view(), name="products_list"),
+    path("products/bulk", ProductBulk.as_view(), name="products_bulk"),
+    path("products/export", ProductExport.as_view(), name="products_export"),
+    path(
+        "products/autocomplete",
+        ProductAutocomplete.as_view(),
+        name="products_autocomplete",
+    ),
+    path("products/search", ProductSearch.as_view(), name="products_search"),
+    path("products/reprice", ProductReprice.as_view(), name="products_reprice"),
+    path("products/stats", ProductStats.as_view(), name="products_stats"),
     path("products/<str:product_id>", ProductDetail.as_view(), name="products_details"),
+    path("async/products/", AsyncProductList.as_view(), name="async_products_list"),
+    path(
+        "async/products/<str:product_id>",
+        AsyncProductDetail.as_view(),
+        name="async_products_details",
+    ),
 ]
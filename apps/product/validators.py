@@ -0,0 +1,114 @@
+"""
+Module containing the validation rules of the Product fields.
+
+The rules are plain functions, so that they can be shared by ProductSerializer and by the code
+paths that validate products without building a serializer (e.g. the 'import_products'
+management command). They raise Django's ValidationError, which Django Rest Framework reports
+exactly like its own.
+
+Functions:
+- validate_name(value): Validates the 'name' field.
+- validate_description(value): Validates the 'description' field.
+- validate_price(value): Validates the 'price' field.
+- clean_product(row): Converts and validates a raw product row.
+"""
+from django.core.exceptions import ValidationError
+
+from .models import Product
+
+NAME_MIN_LENGTH = 3
+DESCRIPTION_MIN_LENGTH = 10
+PRICE_MIN_VALUE = 500
+
+
+def validate_name(value):
+    """
+    Validate the 'name' field.
+
+    Args:
+    - value (str): The value of the 'name' field.
+
+    Raises:
+    - ValidationError: If the length of 'name' is less than 3.
+    """
+    if len(value) < NAME_MIN_LENGTH:
+        raise ValidationError(
+            f"Field 'name' must have at least {NAME_MIN_LENGTH} characters"
+        )
+
+    return value
+
+
+def validate_description(value):
+    """
+    Validate the 'description' field.
+
+    Args:
+    - value (str): The value of the 'description' field.
+
+    Raises:
+    - ValidationError: If the length of 'description' is less than 10.
+    """
+    if value is not None and len(value) < DESCRIPTION_MIN_LENGTH:
+        raise ValidationError(
+            f"Field 'description' must have at least {DESCRIPTION_MIN_LENGTH} characters"
+        )
+
+    return value
+
+
+def validate_price(value):
+    """
+    Validate the 'price' field.
+
+    Args:
+    - value (Decimal): The value of the 'price' field.
+
+    Raises:
+    - ValidationError: If the 'price' is less than 500.
+    """
+    if value < PRICE_MIN_VALUE:
+        raise ValidationError(f"Field 'price' must be higher than {PRICE_MIN_VALUE}")
+
+    return value
+
+
+FIELD_VALIDATORS = {
+    "name": validate_name,
+    "description": validate_description,
+    "price": validate_price,
+}
+
+
+def clean_product(row):
+    """
+    Convert and validate a raw product row, as read from a CSV or NDJSON file.
+
+    Every field is converted and checked against the constraints of its model field (type,
+    length, digits), and then against its validation rule. Blank values of nullable fields are
+    read as null.
+
+    Args:
+    - row (dict): The raw product row, mapping field names to values.
+
+    Returns:
+    - tuple: A '(data, errors)' tuple, where 'data' maps the field names to their cleaned values
+             and 'errors' maps the names of the invalid fields to their error messages.
+    """
+    data = {}
+    errors = {}
+
+    for name, validate in FIELD_VALIDATORS.items():
+        field = Product._meta.get_field(name)
+        value = row.get(name)
+
+        if value == "" and field.null:
+            value = None
+
+        try:
+            value = field.clean(value, None)
+            data[name] = validate(value) if value is not None else value
+        except ValidationError as exc:
+            errors[name] = exc.messages
+
+    return data, errors
@@ -6,6 +6,12 @@ Views are designed to handle Create, Read, Update and Delete operations for the
 
 Classes:
 - ProductList(APIView): A view class for listing and creating products.
+- ProductSearch(APIView): A view class for the full-text search of products.
+- ProductAutocomplete(APIView): A view class for completing product names from a prefix.
+- ProductExport(APIView): A view class for streaming the export of products.
+- ProductBulk(APIView): A view class for bulk operations over many products.
+- ProductReprice(APIView): A view class for adjusting the price of many products at once.
+- ProductStats(APIView): A view class for the price statistics of the products.
 - ProductDetail(APIView): A view class for retrieving, updating, and deleting a specific product.
 
 Permissions:
@@ -13,25 +19,76 @@ Permissions:
 
 Attributes:
 - pagination_class (class): Custom pagination class ('CustomNumberPagination') used in ProductList.
+- pagination_classes (dict): Page-number and cursor pagination classes selectable in ProductList.
 
 Methods:
 - ProductList.get(request): Handles GET requests for listing products.
 - ProductList.post(request): Handles POST requests for creating a new product.
 
+- ProductSearch.get(request): Handles GET requests for searching products by words.
+
+- ProductAutocomplete.get(request): Handles GET requests for completing product names.
+
+- ProductExport.get(request): Handles GET requests for exporting products as NDJSON or CSV.
+
+- ProductBulk.post(request): Handles POST requests for creating many products at once.
+- ProductBulk.patch(request): Handles PATCH requests for partially updating many products at once.
+- ProductBulk.delete(request): Handles DELETE requests for deleting every matching product.
+
+- ProductStats.get(request): Handles GET requests for the price statistics of the products.
+
+- ProductReprice.post(request): Handles POST requests for multiplying the price of every
+matching product.
+
 - ProductDetail.get(request, product_id): Handles GET requests for retrieving a specific product.
 - ProductDetail.patch(request, product_id): Handles PATCH requests for partially updating a product.
 - ProductDetail.put(request, product_id): Handles PUT requests for updating a product.
 - ProductDetail.delete(request, product_id): Handles DELETE requests for deleting a product.
 """
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.db.models.functions import Round
 from django.http import Http404
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .autocomplete import product_names
+from .cache import (
+    get_cached_product,
+    get_catalog_version,
+    get_list_cache_key,
+    get_products_cache,
+)
+from .conditional import (
+    evaluate_preconditions,
+    make_etag,
+    set_validators,
+    summarize_rows,
+)
+from .counts import get_list_state
+from .exports import OUTPUT_ENCODERS, ExportContentNegotiation, export_products
+from .filters import ProductFilterSerializer, filter_products, has_filters
 from .models import Product
-from .paginations import CustomNumberPagination
-from .serializers import ProductSerializer
+from .paginations import CustomCursorPagination, CustomNumberPagination
+from .routers import can_cache_reads
+from .search import build_match_query, search_products
+from .serializers import (
+    ProductAutocompleteSerializer,
+    ProductReadSerializer,
+    ProductRepriceSerializer,
+    ProductSerializer,
+    ProductStatsSerializer,
+    defer_unrequested,
+    get_requested_fields,
+)
+from .signals import products_changed
+from .stats import get_price_stats
 
 
 class ProductList(APIView):
@@ -44,54 +101,138 @@ class ProductList(APIView):
     Attributes:
     - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
     - pagination_class (class): Custom pagination class ('CustomNumberPagination').
+    - pagination_classes (dict): Pagination classes selectable through the 'pagination' query
+                                 param ("page" or "cursor").
+    - orderings (dict): Orderings selectable through the 'ordering' query param, each one
+                        ending on 'id' so that pages are deterministic.
 
     Methods:
+    - get_paginator(request): Builds the paginator for the requested pagination mode.
     - get(request): Handles GET requests for listing products.
     - post(request): Handles POST requests for creating a new product.
     """
 
     permission_classes = (IsAuthenticated,)
     pagination_class = CustomNumberPagination
-
-    def get(self, request):
+    pagination_classes = {
+        "page": CustomNumberPagination,
+        "cursor": CustomCursorPagination,
+    }
+    orderings = {
+        "created_at": ("created_at", "id"),
+        "-created_at": ("-created_at", "-id"),
+        "price": ("price", "id"),
+        "-price": ("-price", "-id"),
+    }
+
+    def get_paginator(self, request):
         """
-        Handle GET requests for listing products.
+        Build the paginator for the mode requested through the 'pagination' query param.
 
         Parameters:
         - request (HttpRequest): The HTTP request object.
 
         Returns:
-        - Response: JSON response containing the serialized product data.
+        - BasePagination: A 'CustomNumberPagination' instance for the "page" mode (default),
+                          or a 'CustomCursorPagination' instance for the "cursor" mode.
+
+        Raises:
+        - ValidationError: If the pagination mode or the ordering is not supported.
         """
-        paginator = self.pagination_class()
+        mode = request.query_params.get("pagination", "page")
+        ordering = request.query_params.get("ordering", "created_at")
+
+        if mode not in self.pagination_classes:
+            raise ValidationError(
+                {
+                    "pagination": [
+                        f"Pagination mode must be one of {list(self.pagination_classes)}"
+                    ]
+                }
+            )
 
-        product_name = request.GET.get("name", None)
+        if ordering not in self.orderings:
+            raise ValidationError(
+                {"ordering": [f"Ordering must be one of {list(self.orderings)}"]}
+            )
 
-        min_price = request.GET.get("min_price", 0)
-        max_price = request.GET.get("max_price", 99999999999999999)
+        paginator = self.pagination_classes[mode]()
+        paginator.ordering = self.orderings[ordering]
+        return paginator
 
-        if product_name:
-            products = Product.objects.filter(
-                price__range=(min_price, max_price), name__exact=product_name
-            )
-            page = paginator.paginate_queryset(products, request)
+    def get(self, request):
+        """
+        Handle GET requests for listing products.
 
-            if page is not None:
-                serializer = ProductSerializer(page, many=True)
-                return paginator.get_paginated_response(serializer.data)
+        Page-number pagination is used by default. Passing 'pagination=cursor' switches to
+        keyset pagination, which returns opaque 'next'/'previous' cursors and no total count.
 
-            return Response(serializer.errors, status=status.HTTP_404_NOT_FOUND)
+        Passing 'fields' (e.g. 'fields=id,name,price') restricts the products to the given
+        fields, both in the response and in the columns read from the database.
 
-        products = Product.objects.filter(price__range=(min_price, max_price))
+        The page is read as plain rows and represented by 'ProductReadSerializer', which gives
+        the same output as 'ProductSerializer' without building a Product per row.
 
-        page = paginator.paginate_queryset(products, request)
+        Responses are cached under the normalized query params and the current catalog version,
+        so that repeated requests skip the database until a product changes.
+
+        The number of filtered products is cached per filter shape, so that the other pages of
+        the same filters are not counted again. Above 'ESTIMATE_THRESHOLD' products filtered by
+        price only, it is read from the price statistics summary instead (see the 'counts'
+        module), and 'count_exact' tells whether it was estimated.
+
+        Responses carry an 'ETag', computed from the catalog version and the ids and last updates
+        of the products of the page, and a 'Last-Modified' header holding the last update of
+        those products. Requests whose 'If-None-Match' or 'If-Modified-Since' header matches them
+        are answered with a 304, without serializing the page. Since deleting a product does not
+        move the last update of the remaining ones, clients should prefer 'If-None-Match'.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the serialized product data, or an empty 304
+                    response if the client already holds it.
+        """
+        cache = get_products_cache()
+        version = get_catalog_version()
+        cache_key = get_list_cache_key(request, version)
+        entry = cache.get(cache_key)
+
+        if entry is None:
+            paginator = self.get_paginator(request)
+            fields = get_requested_fields(request.query_params)
+
+            products = filter_products(Product.objects.sharded(), request.query_params)
+            if isinstance(paginator, CustomNumberPagination):
+                state = get_list_state(request, products)
+                paginator.known_count = state["count"]
+                paginator.count_exact = state["count_exact"]
+
+            serializer = ProductReadSerializer(fields)
+            products = products.order_by(*paginator.ordering)
+            products = serializer.select(products, *paginator.ordering, "updated_at")
+            page = paginator.paginate_queryset(products, request)
 
-        if page is not None:
-            serializer = ProductSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+            rows, last_modified = summarize_rows(page)
+            etag = make_etag(request, version, rows)
+            not_modified = evaluate_preconditions(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
 
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data)
+            results = serializer.to_representation(page)
+            data = paginator.get_paginated_response(results).data
+
+            entry = {"data": data, "rows": rows, "last_modified": last_modified}
+            if can_cache_reads():
+                cache.set(cache_key, entry)
+        else:
+            etag = make_etag(request, version, entry["rows"])
+            not_modified = evaluate_preconditions(request, etag, entry["last_modified"])
+            if not_modified is not None:
+                return not_modified
+
+        return set_validators(Response(entry["data"]), etag, entry["last_modified"])
 
     def post(self, request):
         """
@@ -114,6 +255,398 @@ class ProductList(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ProductSearch(APIView):
+    """
+    View for searching products by the words of their name and description.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+    - pagination_class (class): Custom pagination class ('CustomNumberPagination').
+
+    Methods:
+    - get(request): Handles GET requests for searching products.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    pagination_class = CustomNumberPagination
+
+    def get(self, request):
+        """
+        Handle GET requests for searching products with the 'q' query param.
+
+        Products are matched through the full-text index of their name and description (see the
+        'search' module), ranked by relevance with BM25, and paginated. They can be filtered
+        with the same query params as the product list ('name', 'min_price' and 'max_price'),
+        and restricted to some fields with 'fields'. The number of matching products is cached
+        per search and filters, like the one of the product list.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the serialized matching products, best first.
+
+        Raises:
+        - ValidationError: If 'q' holds no word, or any of the filters or fields is invalid.
+        """
+        text = request.query_params.get("q", "")
+        if build_match_query(text) is None:
+            raise ValidationError({"q": ["Field 'q' must hold at least one word"]})
+
+        fields = get_requested_fields(request.query_params)
+        products = filter_products(Product.objects.sharded(), request.query_params)
+        products = defer_unrequested(search_products(products, text), fields)
+        state = get_list_state(request, products, estimate=False)
+
+        paginator = self.pagination_class()
+        paginator.known_count = state["count"]
+        page = paginator.paginate_queryset(products, request)
+        serializer = ProductSerializer(page, many=True, fields=fields)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ProductAutocomplete(APIView):
+    """
+    View for completing product names from a prefix.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+
+    Methods:
+    - get(request): Handles GET requests for completing product names.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """
+        Handle GET requests for completing product names from the 'q' query param.
+
+        Names are served from the in-process index of the product names (see the
+        'autocomplete' module), ignoring case and accents, without querying the database.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing up to 'limit' names, in alphabetical order.
+
+        Raises:
+        - ValidationError: If 'q' is missing or blank, or 'limit' is invalid.
+        """
+        serializer = ProductAutocompleteSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        return Response({"results": product_names.search(params["q"], params["limit"])})
+
+
+class ProductExport(APIView):
+    """
+    View for exporting every product matching the filter query params as a stream.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+    - content_negotiation_class (class): Content negotiation ignoring the 'Accept' header, as
+                                         the output format is chosen through the 'output'
+                                         query param.
+
+    Methods:
+    - get(request): Handles GET requests for exporting products.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    content_negotiation_class = ExportContentNegotiation
+
+    def get(self, request):
+        """
+        Handle GET requests for exporting products as NDJSON (default) or CSV.
+
+        Products are streamed in chunks as they are read from the database, in price order, and
+        can be filtered with the same query params as the product list ('name', 'min_price' and
+        'max_price'). Under ASGI, the chunks are streamed by an asynchronous iterator.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - StreamingHttpResponse: Response streaming the exported products.
+
+        Raises:
+        - ValidationError: If the output format or any of the filters is invalid.
+        """
+        output = request.query_params.get("output", "ndjson")
+
+        if output not in OUTPUT_ENCODERS:
+            raise ValidationError(
+                {"output": [f"Output must be one of {list(OUTPUT_ENCODERS)}"]}
+            )
+
+        products = filter_products(Product.objects.sharded(), request.query_params)
+        return export_products(
+            products.order_by("price", "id"),
+            output,
+            asynchronous=isinstance(request._request, ASGIRequest),
+        )
+
+
+class ProductBulk(APIView):
+    """
+    View for bulk operations over many products in a single request.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+    - max_items (int): The maximum number of items accepted in a single request.
+
+    Methods:
+    - post(request): Handles POST requests for creating many products at once.
+    - patch(request): Handles PATCH requests for partially updating many products at once.
+    - delete(request): Handles DELETE requests for deleting every product matching the filters.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    max_items = 10000
+
+    def post(self, request):
+        """
+        Handle POST requests for creating many products at once.
+
+        The payload is a list of products, validated in a single pass. Valid products are
+        inserted with batched INSERT statements inside one transaction, while invalid ones are
+        reported by their index in the payload, so that a few bad items do not reject the batch.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the created products and the per-item errors, with
+                    status 201 if every item was created, 207 if only some of them were, or 400
+                    if none was.
+        """
+        serializer = ProductSerializer(
+            data=request.data, many=True, max_length=self.max_items
+        )
+        serializer.is_valid(raise_exception=True)
+
+        if serializer.validated_data:
+            serializer.save()
+
+        errors = [
+            {"index": index, "errors": item_errors}
+            for index, item_errors in serializer.item_errors.items()
+        ]
+
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif serializer.validated_data:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        return Response(
+            {
+                "created": serializer.data if serializer.validated_data else [],
+                "errors": errors,
+            },
+            status=response_status,
+        )
+
+    def patch(self, request):
+        """
+        Handle PATCH requests for partially updating many products at once.
+
+        The payload is a list of partial products, each one holding the 'id' of the product it
+        updates. Fields are validated with the same rules as the single product PATCH, and the
+        changed columns are written with batched UPDATE statements inside one transaction.
+        Invalid items are reported by their index in the payload, and unknown ids are reported
+        in 'not_found', without rejecting the rest of the batch.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the updated products, the unknown ids and the
+                    per-item errors, with status 200 if every item was applied, 207 if only some
+                    of them were, or 400 (invalid items) or 404 (unknown ids) if none was.
+        """
+        serializer = ProductSerializer(
+            Product.objects.sharded(),
+            data=request.data,
+            many=True,
+            partial=True,
+            max_length=self.max_items,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        updated = serializer.data
+        not_found = serializer.missing_ids
+        errors = [
+            {"index": index, "errors": item_errors}
+            for index, item_errors in serializer.item_errors.items()
+        ]
+
+        if not errors and not not_found:
+            response_status = status.HTTP_200_OK
+        elif updated:
+            response_status = status.HTTP_207_MULTI_STATUS
+        elif errors:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_404_NOT_FOUND
+
+        return Response(
+            {"updated": updated, "not_found": not_found, "errors": errors},
+            status=response_status,
+        )
+
+    def delete(self, request):
+        """
+        Handle DELETE requests for deleting every product matching the filter query params.
+
+        The products are deleted with a single DELETE statement, and announced with a single
+        'products_changed' signal (see 'ProductQuerySet.delete'). The filter query params are
+        the same as the ones of the product list ('name', 'min_price' and 'max_price'); at least
+        one of them is required, unless 'all=true' is passed to delete every product.
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the number of deleted products.
+
+        Raises:
+        - ValidationError: If no filter was given without 'all=true', or a filter is invalid.
+        """
+        if (
+            not has_filters(request.query_params)
+            and request.query_params.get("all") != "true"
+        ):
+            raise ValidationError(
+                {"non_field_errors": ["At least one filter is required, or 'all=true'"]}
+            )
+
+        products = filter_products(Product.objects.sharded(), request.query_params)
+
+        with transaction.atomic():
+            deleted, _ = products.delete()
+
+        return Response({"deleted": deleted}, status=status.HTTP_200_OK)
+
+
+class ProductReprice(APIView):
+    """
+    View for adjusting the price of every product matching the filter query params.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+
+    Methods:
+    - post(request): Handles POST requests for multiplying the price of the matching products.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        """
+        Handle POST requests for multiplying the price of the matching products by a factor.
+
+        The prices are updated with a single UPDATE statement, computing the new price from the
+        current one in the database (rounded to 2 decimal places). The bounds of the current and
+        new prices are read beforehand by a single aggregate query, to validate the new prices
+        and to rebuild only the price statistics of that range. The filter query params are
+        the same as the ones of the product list ('name', 'min_price' and 'max_price').
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object, whose payload holds the 'factor'.
+
+        Returns:
+        - Response: JSON response containing the number of updated products, or error messages
+                    if the factor is invalid or would take a price out of the allowed range.
+        """
+        serializer = ProductRepriceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        factor = serializer.validated_data["factor"]
+
+        products = filter_products(Product.objects.sharded(), request.query_params)
+
+        new_price = Round(F("price") * factor, 2)
+        with transaction.atomic():
+            prices = products.aggregate(
+                lowest=Min("price"),
+                highest=Max("price"),
+                new_lowest=Min(new_price),
+                new_highest=Max(new_price),
+            )
+            if prices["lowest"] is not None:
+                serializer.validate_prices(prices["new_lowest"], prices["new_highest"])
+
+            updated = products.update(price=new_price, updated_at=timezone.now())
+            if updated:
+                products_changed.send(
+                    sender=Product,
+                    action="update",
+                    instances=None,
+                    update_fields={"price", "updated_at"},
+                    price_range=(
+                        min(prices["lowest"], prices["new_lowest"]),
+                        max(prices["highest"], prices["new_highest"]),
+                    ),
+                )
+
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+
+class ProductStats(APIView):
+    """
+    View for the price statistics of the products.
+
+    Authentication is required, and 'IsAuthenticated' permission is enforced.
+
+    Attributes:
+    - permission_classes (tuple): Tuple specifying required permissions (IsAuthenticated).
+
+    Methods:
+    - get(request): Handles GET requests for the price statistics of the products.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """
+        Handle GET requests for the price statistics of the products.
+
+        The statistics are read from the price buckets summary (see the 'stats' module) rather
+        than computed over the products table. The filter query params are the same as the ones
+        of the product list ('name', 'min_price' and 'max_price').
+
+        Parameters:
+        - request (HttpRequest): The HTTP request object.
+
+        Returns:
+        - Response: JSON response containing the number of products, their lowest, highest and
+                    average price, and their price histogram.
+
+        Raises:
+        - ValidationError: If any of the filter query params is invalid.
+        """
+        serializer = ProductFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        stats = get_price_stats(**serializer.validated_data)
+        return Response(ProductStatsSerializer(stats).data, status=status.HTTP_200_OK)
+
+
 class ProductDetail(APIView):
     """
     View for retrieving, updating, and deleting a specific product.
@@ -150,23 +683,46 @@ class ProductDetail(APIView):
         - Http404: If the product with the specified 'product_id' does not exist.
         """
         try:
-            return Product.objects.get(pk=product_id)
-        except Product.DoesNotExist as exc:
+            return Product.objects.shard(product_id).get(pk=product_id)
+        except (Product.DoesNotExist, DjangoValidationError) as exc:
             raise Http404 from exc
 
     def get(self, request, product_id):
         """
         Handle GET requests for retrieving a specific product.
 
+        The product is read through the local and shared product caches (see the 'cache'
+        module), and requests whose 'If-None-Match' or 'If-Modified-Since' header matches its
+        'ETag' and 'Last-Modified' headers are answered with a 304, without serializing it.
+        Passing 'fields' restricts the response to the given fields; the cached product being
+        complete, it does not narrow the columns read from the database.
+
         Parameters:
         - request (HttpRequest): The HTTP request object.
         - product_id (str): The unique identifier of the product.
 
         Returns:
-        - Response: JSON response containing the serialized product data or an error message.
+        - Response: JSON response containing the serialized product data or an error message,
+                    or an empty 304 response if the client already holds the product.
+
+        Raises:
+        - Http404: If the product with the specified 'product_id' does not exist.
+        - ValidationError: If any of the requested fields is invalid.
         """
-        serializer = ProductSerializer(self.get_object(product_id))
-        return Response(serializer.data)
+        fields = get_requested_fields(request.query_params)
+
+        try:
+            product = get_cached_product(product_id, store=can_cache_reads())
+        except (Product.DoesNotExist, DjangoValidationError) as exc:
+            raise Http404 from exc
+
+        etag = make_etag(request, product.pk, product.updated_at)
+        not_modified = evaluate_preconditions(request, etag, product.updated_at)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = ProductSerializer(product, fields=fields)
+        return set_validators(Response(serializer.data), etag, product.updated_at)
 
     def patch(self, request, product_id):
         """
@@ -0,0 +1,160 @@
+"""
+Benchmark comparing DRF's JSON renderer and parser with the 'orjson' ones.
+
+Two payloads are encoded and decoded, and the best time out of '--repeat' runs is reported:
+- page: a page of the product list, as returned by 'GET /products/'.
+- bulk: a bulk creation payload of '--bulk-size' products, as sent to 'POST /products/bulk'.
+
+The payloads are generated in memory, so that the benchmark needs no database.
+
+Usage:
+    python benchmarks/json_codecs.py --page-size 15 --bulk-size 10000 --repeat 20
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_management_system.settings")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.product.parsers import ORJSONParser  # noqa: E402
+from apps.product.renderers import ORJSONRenderer  # noqa: E402
+
+
+def make_page(size):
+    """
+    Build a page of the product list.
+
+    Parameters:
+    - size (int): The number of products of the page.
+
+    Returns:
+    - dict: The page, as returned by 'GET /products/'.
+    """
+    created_at = datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.UTC)
+    return {
+        "count": 600000,
+        "next": "http://localhost:8000/products/?page=3",
+        "previous": "http://localhost:8000/products/",
+        "results": [
+            {
+                "id": index,
+                "name": f"Product {index}",
+                "description": "Test product description " * 8,
+                "price": f"{650 + index}.50",
+                "created_at": created_at.isoformat().replace("+00:00", "Z"),
+                "updated_at": created_at.isoformat().replace("+00:00", "Z"),
+            }
+            for index in range(size)
+        ],
+    }
+
+
+def make_bulk(size):
+    """
+    Build a bulk creation payload.
+
+    Parameters:
+    - size (int): The number of products of the payload.
+
+    Returns:
+    - list: The payload, as sent to 'POST /products/bulk'.
+    """
+    return [
+        {
+            "name": f"Product {index}",
+            "description": "Test product description",
+            "price": 650.5 + index,
+        }
+        for index in range(size)
+    ]
+
+
+def best_time(function, repeat):
+    """
+    Run a function several times and keep the best time.
+
+    Parameters:
+    - function (callable): The function under test.
+    - repeat (int): The number of runs.
+
+    Returns:
+    - tuple: The result of the last run and the best time (in seconds).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def report(name, operation, drf_time, orjson_time):
+    """
+    Print the timings of a benchmark.
+
+    Parameters:
+    - name (str): The name of the payload.
+    - operation (str): The benchmarked operation ("render" or "parse").
+    - drf_time (float): The best time of the DRF codec (in seconds).
+    - orjson_time (float): The best time of the 'orjson' codec (in seconds).
+    """
+    print(
+        f"{name:<5} {operation:<7}"
+        f"  DRF {drf_time * 1000:>9.3f} ms"
+        f"  orjson {orjson_time * 1000:>9.3f} ms"
+        f"  speedup {drf_time / orjson_time:>5.1f}x"
+    )
+
+
+def main():
+    """
+    Parse the options and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page-size", type=int, default=15)
+    parser.add_argument("--bulk-size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    options = parser.parse_args()
+
+    payloads = [
+        ("page", make_page(options.page_size)),
+        ("bulk", make_bulk(options.bulk_size)),
+    ]
+    context = {"encoding": "utf-8"}
+
+    for name, payload in payloads:
+        expected, drf_time = best_time(
+            lambda data=payload: JSONRenderer().render(data), options.repeat
+        )
+        body, orjson_time = best_time(
+            lambda data=payload: ORJSONRenderer().render(data), options.repeat
+        )
+        assert body == expected, "The rendered documents differ."
+        report(name, "render", drf_time, orjson_time)
+
+        expected, drf_time = best_time(
+            lambda: JSONParser().parse(io.BytesIO(body), None, context), options.repeat
+        )
+        result, orjson_time = best_time(
+            lambda: ORJSONParser().parse(io.BytesIO(body), None, context),
+            options.repeat,
+        )
+        assert result == expected, "The parsed documents differ."
+        report(name, "parse", drf_time, orjson_time)
+
+
+if __name__ == "__main__":
+    main()
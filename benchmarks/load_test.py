@@ -0,0 +1,479 @@
+"""
+Load test of the product API, driving request mixes at a fixed concurrency through the WSGI and
+ASGI entry points of the project, and comparing the results with a stored baseline.
+
+The requests are run in-process, through the 'application' of 'django_management_system.wsgi'
+and 'django_management_system.asgi', so that the numbers reflect the whole request pipeline
+(middleware, routing, caches and database) rather than a particular server:
+- WSGI: a pool of '--concurrency' threads, each one serving a request at a time.
+- ASGI: a single event loop serving up to '--concurrency' requests at a time.
+
+Each mix draws its requests from weighted kinds, with a seeded random generator so that runs
+are reproducible:
+- list: A page of the product list, in any ordering.
+- filter: A page of the product list, filtered by name or price range.
+- detail: A product, among a sample of the stored ones.
+- write: A price update or a product creation.
+- mixed: Mostly reads, with a few writes invalidating the caches.
+
+Every run is preceded by '--warm-up' requests, and reports its throughput and the p50, p95 and
+p99 latencies of its requests. The results are compared with the baseline file, if any: a run
+whose throughput drops, or whose p95 latency grows, by more than '--tolerance' percent is
+reported as a regression, and the script then exits with status 1. '--save-baseline' stores the
+results as the new baseline of their runs.
+
+The load test uses the database configured by the settings (DJANGO_SETTINGS_MODULE), seeded
+beforehand with 'python manage.py seed_products', and creates a 'benchmark' user to
+authenticate the requests. The write mixes change the products.
+
+Usage:
+    python manage.py seed_products --count 100000 --seed 42 --clear
+    python benchmarks/load_test.py --requests 2000 --concurrency 32 \
+        --baseline benchmarks/baseline.json --save-baseline
+    python benchmarks/load_test.py --requests 2000 --concurrency 32 \
+        --baseline benchmarks/baseline.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_management_system.settings")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User  # noqa: E402
+from django.db.models import Max, Min  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from apps.product.models import Product  # noqa: E402
+from django_management_system.asgi import application as asgi_application  # noqa: E402
+from django_management_system.wsgi import application as wsgi_application  # noqa: E402
+
+SAMPLE_SIZE = 1000
+ORDERINGS = ("created_at", "-created_at", "price", "-price")
+
+# Weight of every request kind in each mix.
+MIXES = {
+    "list": {"list": 1},
+    "filter": {"filter": 1},
+    "detail": {"detail": 1},
+    "write": {"update": 1, "create": 1},
+    "mixed": {"list": 35, "filter": 20, "detail": 35, "update": 7, "create": 3},
+}
+
+
+def get_authorization():
+    """
+    Get the 'Authorization' header of the 'benchmark' user, creating the user if needed.
+
+    Returns:
+    - str: The header value.
+    """
+    user, created = User.objects.get_or_create(username="benchmark")
+    if created:
+        user.set_unusable_password()
+        user.save()
+
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def sample_products(rng, size=SAMPLE_SIZE):
+    """
+    Sample stored products, spread over the id range, as the targets of the requests.
+
+    Each product is found with an index lookup from a random id, so that sampling stays fast
+    whatever the size of the catalog.
+
+    Parameters:
+    - rng (Random): The random generator.
+    - size (int): The number of lookups.
+
+    Returns:
+    - list: The '(id, name, price)' tuples of the sampled products, without duplicates.
+    """
+    products = Product.objects.sharded()
+    bounds = products.aggregate(lowest=Min("id"), highest=Max("id"))
+    if bounds["lowest"] is None:
+        return []
+
+    sample = {}
+    for _ in range(size):
+        start = rng.randint(bounds["lowest"], bounds["highest"])
+        row = (
+            products.filter(id__gte=start)
+            .order_by("id")
+            .values_list("id", "name", "price")
+            .first()
+        )
+        if row is not None:
+            sample[row[0]] = row
+    return list(sample.values())
+
+
+def build_request(kind, rng, sample):
+    """
+    Build a request of a kind.
+
+    Parameters:
+    - kind (str): The kind of the request ("list", "filter", "detail", "update" or "create").
+    - rng (Random): The random generator.
+    - sample (list): The sampled products.
+
+    Returns:
+    - tuple: The method, the URL and the JSON body (or None) of the request.
+    """
+    product_id, name, price = rng.choice(sample)
+
+    if kind == "list":
+        query = {"ordering": rng.choice(ORDERINGS), "page": rng.randint(1, 20)}
+        return "GET", f"/products/?{urlencode(query)}", None
+
+    if kind == "filter":
+        if rng.random() < 0.5:
+            query = {"name": name}
+        else:
+            query = {"min_price": int(price * 4 / 5), "max_price": int(price * 6 / 5)}
+        query.update(ordering=rng.choice(ORDERINGS), page_size=10)
+        return "GET", f"/products/?{urlencode(query)}", None
+
+    if kind == "detail":
+        return "GET", f"/products/{product_id}", None
+
+    if kind == "update":
+        body = {"price": str(max(price + rng.randint(-100, 100), 500))}
+        return "PATCH", f"/products/{product_id}", body
+
+    body = {
+        "name": name,
+        "description": "Created by the load test.",
+        "price": str(price),
+    }
+    return "POST", "/products/", body
+
+
+def build_requests(mix, count, rng, sample):
+    """
+    Build the requests of a run, drawn from the kinds of a mix.
+
+    Parameters:
+    - mix (str): The name of the mix.
+    - count (int): The number of requests.
+    - rng (Random): The random generator.
+    - sample (list): The sampled products.
+
+    Returns:
+    - list: The '(method, url, body)' tuples of the requests.
+    """
+    kinds = rng.choices(list(MIXES[mix]), list(MIXES[mix].values()), k=count)
+    return [build_request(kind, rng, sample) for kind in kinds]
+
+
+def wsgi_request(request, authorization):
+    """
+    Run a request through the WSGI application.
+
+    Parameters:
+    - request (tuple): The method, the URL and the JSON body (or None) of the request.
+    - authorization (str): The 'Authorization' header.
+
+    Returns:
+    - tuple: The status code and the latency (in seconds) of the request.
+    """
+    method, url, body = request
+    payload = b"" if body is None else json.dumps(body).encode()
+
+    started = time.perf_counter()
+    parts = urlsplit(url)
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": parts.path,
+        "QUERY_STRING": parts.query,
+        "HTTP_AUTHORIZATION": authorization,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(payload)),
+        "wsgi.input": io.BytesIO(payload),
+    }
+    setup_testing_defaults(environ)
+    environ["SERVER_NAME"] = "localhost"
+
+    statuses = []
+    response = wsgi_application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b"".join(response)
+    response.close()
+
+    return int(statuses[0].split()[0]), time.perf_counter() - started
+
+
+async def asgi_request(request, authorization):
+    """
+    Run a request through the ASGI application.
+
+    Parameters:
+    - request (tuple): The method, the URL and the JSON body (or None) of the request.
+    - authorization (str): The 'Authorization' header.
+
+    Returns:
+    - tuple: The status code and the latency (in seconds) of the request.
+    """
+    method, url, body = request
+    payload = b"" if body is None else json.dumps(body).encode()
+
+    started = time.perf_counter()
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": [
+            (b"host", b"localhost"),
+            (b"authorization", authorization.encode()),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    received = False
+    statuses = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await asgi_application(scope, receive, send)
+    return statuses[0], time.perf_counter() - started
+
+
+def run_wsgi(requests, authorization, concurrency):
+    """
+    Run requests through the WSGI application, in a pool of threads.
+
+    Parameters:
+    - requests (list): The requests.
+    - authorization (str): The 'Authorization' header.
+    - concurrency (int): The number of threads.
+
+    Returns:
+    - tuple: The results of the requests and the elapsed time (in seconds).
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(
+            pool.map(lambda request: wsgi_request(request, authorization), requests)
+        )
+    return results, time.perf_counter() - started
+
+
+def run_asgi(requests, authorization, concurrency):
+    """
+    Run requests through the ASGI application, in a single event loop.
+
+    Parameters:
+    - requests (list): The requests.
+    - authorization (str): The 'Authorization' header.
+    - concurrency (int): The number of requests served at a time.
+
+    Returns:
+    - tuple: The results of the requests and the elapsed time (in seconds).
+    """
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(request):
+            async with semaphore:
+                return await asgi_request(request, authorization)
+
+        return await asyncio.gather(*(send(request) for request in requests))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    return results, time.perf_counter() - started
+
+
+ENTRY_POINTS = {"wsgi": run_wsgi, "asgi": run_asgi}
+
+
+def summarize(results, elapsed):
+    """
+    Summarize the results of a run.
+
+    Parameters:
+    - results (list): The '(status, latency)' tuples of the requests.
+    - elapsed (float): The elapsed time (in seconds).
+
+    Returns:
+    - dict: The throughput (in requests per second), the p50, p95 and p99 latencies (in
+            milliseconds), and the number of requests and of errors (statuses above 399).
+    """
+    latencies = [latency * 1000 for _, latency in results]
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": len(results),
+        "errors": sum(1 for status, _ in results if status >= 400),
+        "throughput": len(results) / elapsed,
+        "p50": percentiles[49],
+        "p95": percentiles[94],
+        "p99": percentiles[98],
+    }
+
+
+def compare(summary, baseline, tolerance):
+    """
+    Compare the summary of a run with its baseline.
+
+    Parameters:
+    - summary (dict): The summary of the run.
+    - baseline (dict): The summary of the baseline run, or None.
+    - tolerance (float): The accepted change, in percent.
+
+    Returns:
+    - tuple: The description of the changes, and whether the run regressed.
+    """
+    if baseline is None:
+        return "no baseline", False
+
+    throughput = (summary["throughput"] / baseline["throughput"] - 1) * 100
+    p95 = (summary["p95"] / baseline["p95"] - 1) * 100
+    regressed = throughput < -tolerance or p95 > tolerance
+    return f"throughput {throughput:+.1f}%  p95 {p95:+.1f}%", regressed
+
+
+def report(name, summary, comparison, regressed):
+    """
+    Print the summary of a run, and its comparison with the baseline.
+
+    Parameters:
+    - name (str): The name of the run ("<entry point>/<mix>").
+    - summary (dict): The summary of the run.
+    - comparison (str): The description of the changes from the baseline.
+    - regressed (bool): Whether the run regressed.
+    """
+    print(
+        f"{name:<14} {summary['throughput']:>9.1f} req/s"
+        f"  p50 {summary['p50']:>8.1f} ms  p95 {summary['p95']:>8.1f} ms"
+        f"  p99 {summary['p99']:>8.1f} ms  errors {summary['errors']:>4}"
+        f"  {comparison}{'  REGRESSION' if regressed else ''}"
+    )
+
+
+def main():
+    """
+    Parse the options, run the load test and compare it with the baseline.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--requests", type=int, default=1000, help="Requests per entry point and mix."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="Requests served at a time."
+    )
+    parser.add_argument(
+        "--warm-up", type=int, default=50, help="Requests run before each measure."
+    )
+    parser.add_argument(
+        "--entry-points",
+        nargs="+",
+        choices=list(ENTRY_POINTS),
+        default=list(ENTRY_POINTS),
+    )
+    parser.add_argument("--mixes", nargs="+", choices=list(MIXES), default=list(MIXES))
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the requests.")
+    parser.add_argument("--baseline", type=Path, help="Path of the baseline file.")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=10,
+        help="Accepted change from the baseline, in percent.",
+    )
+    options = parser.parse_args()
+
+    sample = sample_products(random.Random(options.seed))
+    if not sample:
+        parser.error("The database holds no product, run 'manage.py seed_products'.")
+
+    baseline = {}
+    if options.baseline is not None and options.baseline.exists():
+        baseline = json.loads(options.baseline.read_text())
+        if baseline["options"]["concurrency"] != options.concurrency:
+            print("The baseline was measured at another concurrency.")
+
+    authorization = get_authorization()
+    results = {}
+    regressions = 0
+    for entry_point in options.entry_points:
+        run = ENTRY_POINTS[entry_point]
+        for mix in options.mixes:
+            name = f"{entry_point}/{mix}"
+            # Every run draws its own requests, the same whatever the other runs.
+            rng = random.Random(f"{options.seed}/{name}")
+            warm_up = build_requests(mix, options.warm_up, rng, sample)
+            run(warm_up, authorization, options.concurrency)
+
+            requests = build_requests(mix, options.requests, rng, sample)
+            summary = summarize(*run(requests, authorization, options.concurrency))
+            comparison, regressed = compare(
+                summary, baseline.get("results", {}).get(name), options.tolerance
+            )
+            report(name, summary, comparison, regressed)
+
+            results[name] = summary
+            regressions += regressed
+
+    if options.save_baseline and options.baseline is not None:
+        options.baseline.write_text(
+            json.dumps(
+                {
+                    "options": {
+                        "requests": options.requests,
+                        "concurrency": options.concurrency,
+                        "products": Product.objects.sharded().count(),
+                    },
+                    "results": {**baseline.get("results", {}), **results},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Stored the baseline in {options.baseline}.")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark comparing ProductSerializer with the fast ProductReadSerializer on pages of products.
+
+For each page size, the same page of products is read and represented both ways, and the best
+time out of '--repeat' runs is reported:
+- ProductSerializer: the page is read as Product instances and serialized with 'many=True'.
+- ProductReadSerializer: the page is read as rows with 'values_list' and represented with the
+  compiled converters.
+
+Two timings are reported for each of them: the representation of an already read page, and
+the whole path, reading the page from the database included.
+
+The benchmark reads the database configured by the settings (DJANGO_SETTINGS_MODULE), which
+should hold at least as many products as the largest page size.
+
+Usage:
+    python benchmarks/read_serializer.py --page-sizes 15 100 1000 --repeat 20
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_management_system.settings")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from apps.product.models import Product  # noqa: E402
+from apps.product.serializers import (  # noqa: E402
+    ProductReadSerializer,
+    ProductSerializer,
+)
+
+
+def model_serializer(queryset):
+    """
+    Read and serialize a page with ProductSerializer.
+
+    Parameters:
+    - queryset (QuerySet): The sliced Product queryset.
+
+    Returns:
+    - list: The serialized products.
+    """
+    return ProductSerializer(list(queryset.all()), many=True).data
+
+
+def read_serializer(queryset):
+    """
+    Read and represent a page with ProductReadSerializer.
+
+    Parameters:
+    - queryset (QuerySet): The sliced Product queryset.
+
+    Returns:
+    - list: The represented products.
+    """
+    serializer = ProductReadSerializer()
+    return serializer.to_representation(list(serializer.select(queryset)))
+
+
+def best_time(function, argument, repeat):
+    """
+    Run a function several times and keep the best time.
+
+    Parameters:
+    - function (callable): The function under test.
+    - argument (object): The argument of the function.
+    - repeat (int): The number of runs.
+
+    Returns:
+    - tuple: The result of the last run and the best time (in seconds).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def report(name, page_size, model_time, read_time):
+    """
+    Print the timings of a benchmark.
+
+    Parameters:
+    - name (str): The name of the benchmark.
+    - page_size (int): The number of products of the page.
+    - model_time (float): The best time of ProductSerializer (in seconds).
+    - read_time (float): The best time of ProductReadSerializer (in seconds).
+    """
+    print(
+        f"{name:<9} page {page_size:>6}"
+        f"  ProductSerializer {model_time * 1000:>9.2f} ms"
+        f"  ProductReadSerializer {read_time * 1000:>9.2f} ms"
+        f"  speedup {model_time / read_time:>5.1f}x"
+    )
+
+
+def main():
+    """
+    Parse the options and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--page-sizes", type=int, nargs="+", default=[15, 100, 1000], metavar="SIZE"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    options = parser.parse_args()
+
+    if not Product.objects.exists():
+        parser.error("The database holds no product, seed it first.")
+
+    for page_size in options.page_sizes:
+        queryset = Product.objects.order_by("created_at", "id")[:page_size]
+        serializer = ProductReadSerializer()
+        products = list(queryset.all())
+        rows = list(serializer.select(queryset))
+
+        expected, model_time = best_time(
+            lambda page: ProductSerializer(page, many=True).data,
+            products,
+            options.repeat,
+        )
+        results, read_time = best_time(
+            serializer.to_representation, rows, options.repeat
+        )
+        assert results == expected, "The representations differ."
+        report("represent", page_size, model_time, read_time)
+
+        expected, model_time = best_time(model_serializer, queryset, options.repeat)
+        results, read_time = best_time(read_serializer, queryset, options.repeat)
+        assert results == expected, "The representations differ."
+        report("total", page_size, model_time, read_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmark comparing the mixed read/write throughput of SQLite with its default settings and with
+the connection profile of the 'database' module.
+
+Each profile runs on its own copy of the database configured by the settings
+(DJANGO_SETTINGS_MODULE), which should hold some products and is never written to:
+- default: rollback journal, full syncs and deferred transactions, as Django used to open them.
+- tuned: the pragma profile of the database settings (WAL journal, busy timeout, page cache,
+  memory mapping...), with immediate transactions.
+
+'--readers' threads read pages of products in a price range, while '--writers' threads update
+the price of a product they read first, in a transaction, for '--duration' seconds. Every thread
+holds its own connection, like the worker threads of a server. Writes failing with "database is
+locked" are rolled back and counted as errors.
+
+Usage:
+    python benchmarks/sqlite_profile.py --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_management_system.settings")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.db import DEFAULT_DB_ALIAS, connections  # noqa: E402
+
+from apps.product.database import apply_pragmas, get_pragmas  # noqa: E402
+from apps.product.models import Product  # noqa: E402
+
+TABLE = Product._meta.db_table
+
+READ_QUERY = (
+    f"SELECT id, name, description, price FROM {TABLE} "
+    "WHERE price BETWEEN ? AND ? ORDER BY price, id LIMIT 15"
+)
+
+
+def copy_database(source, path, journal_mode):
+    """
+    Copy a database with the SQLite backup API.
+
+    Parameters:
+    - source (str): The path of the copied database.
+    - path (str): The path of the copy.
+    - journal_mode (str): The journal mode of the copy.
+    """
+    with sqlite3.connect(source) as origin, sqlite3.connect(path) as copy:
+        origin.backup(copy)
+        copy.execute(f"PRAGMA journal_mode = {journal_mode}").fetchall()
+    origin.close()
+    copy.close()
+
+
+def connect(path, pragmas):
+    """
+    Open a connection in autocommit mode, transactions being begun explicitly.
+
+    Parameters:
+    - path (str): The path of the database.
+    - pragmas (dict): The pragmas set on the connection.
+
+    Returns:
+    - Connection: The sqlite3 connection.
+    """
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def read(connection, prices, results):
+    """
+    Read a page of products in a random price range.
+
+    Parameters:
+    - connection (Connection): The sqlite3 connection.
+    - prices (tuple): The lowest and highest price of the products.
+    - results (dict): The latencies and errors of the benchmark, updated in place.
+    """
+    lowest = random.uniform(*prices)
+    started = time.perf_counter()
+    connection.execute(READ_QUERY, (lowest, lowest + 100)).fetchall()
+    results["reads"].append(time.perf_counter() - started)
+
+
+def write(connection, ids, begin, results):
+    """
+    Update the price of a random product, read first, in a transaction.
+
+    Parameters:
+    - connection (Connection): The sqlite3 connection.
+    - ids (tuple): The lowest and highest id of the products.
+    - begin (str): The statement beginning the transaction.
+    - results (dict): The latencies and errors of the benchmark, updated in place.
+    """
+    product_id = random.randint(*ids)
+    started = time.perf_counter()
+    try:
+        connection.execute(begin)
+        row = connection.execute(
+            f"SELECT price FROM {TABLE} WHERE id = ?", (product_id,)
+        ).fetchone()
+        if row is not None:
+            price = str(Decimal(str(row[0])) + Decimal("0.01"))
+            connection.execute(
+                f"UPDATE {TABLE} SET price = ?, updated_at = datetime('now') WHERE id = ?",
+                (price, product_id),
+            )
+        connection.execute("COMMIT")
+    except sqlite3.OperationalError:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        results["errors"] += 1
+    else:
+        results["writes"].append(time.perf_counter() - started)
+
+
+def run(path, pragmas, begin, options):
+    """
+    Run the readers and the writers on a database for the duration of the benchmark.
+
+    Parameters:
+    - path (str): The path of the database.
+    - pragmas (dict): The pragmas set on every connection.
+    - begin (str): The statement beginning the write transactions.
+    - options (Namespace): The benchmark options.
+
+    Returns:
+    - dict: The read and write latencies (in seconds) and the number of failed writes.
+    """
+    with sqlite3.connect(path) as connection:
+        ids = connection.execute(f"SELECT MIN(id), MAX(id) FROM {TABLE}").fetchone()
+        prices = connection.execute(
+            f"SELECT MIN(price), MAX(price) FROM {TABLE}"
+        ).fetchone()
+    connection.close()
+
+    results = {"reads": [], "writes": [], "errors": 0}
+    deadline = time.perf_counter() + options.duration
+
+    def worker(step):
+        connection = connect(path, pragmas)
+        while time.perf_counter() < deadline:
+            step(connection)
+        connection.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(lambda c: read(c, prices, results),))
+        for _ in range(options.readers)
+    ] + [
+        threading.Thread(target=worker, args=(lambda c: write(c, ids, begin, results),))
+        for _ in range(options.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def report(name, results, duration):
+    """
+    Print the throughput and the latencies of a profile.
+
+    Parameters:
+    - name (str): The name of the profile.
+    - results (dict): The read and write latencies and the number of failed writes.
+    - duration (float): The duration of the benchmark (in seconds).
+    """
+    line = f"{name:<8}"
+    for kind in ("reads", "writes"):
+        latencies = sorted(results[kind]) or [0]
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        line += (
+            f"  {kind} {len(results[kind]) / duration:>8.1f}/s"
+            f" (p50 {statistics.median(latencies) * 1000:>6.2f} ms,"
+            f" p99 {p99 * 1000:>7.2f} ms)"
+        )
+    print(f"{line}  locked {results['errors']}")
+
+
+def main():
+    """
+    Parse the options and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--readers", type=int, default=8, help="Reading threads.")
+    parser.add_argument("--writers", type=int, default=2, help="Writing threads.")
+    parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds each profile runs for."
+    )
+    parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+    options = parser.parse_args()
+
+    settings_dict = connections[options.database].settings_dict
+    if not Product.objects.using(options.database).exists():
+        parser.error("The database holds no product, seed it first.")
+
+    profiles = [
+        ("default", "delete", {}, "BEGIN"),
+        ("tuned", "wal", get_pragmas(settings_dict), "BEGIN IMMEDIATE"),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, journal_mode, pragmas, begin in profiles:
+            path = os.path.join(directory, f"{name}.sqlite3")
+            copy_database(str(settings_dict["NAME"]), path, journal_mode)
+            report(name, run(path, pragmas, begin, options), options.duration)
+
+
+if __name__ == "__main__":
+    main()
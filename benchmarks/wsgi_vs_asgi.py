@@ -0,0 +1,262 @@
+"""
+Benchmark comparing the concurrent throughput of the product endpoints under WSGI and ASGI.
+
+The requests are run in-process, straight through Django's WSGI and ASGI handlers, so that the
+numbers reflect the request pipeline rather than a particular server:
+- WSGI: a pool of '--threads' worker threads, like a threaded WSGI server, each one serving a
+  request at a time.
+- ASGI: a single event loop serving every concurrent request.
+
+Slow clients are simulated with '--client-delay': every request spends that long being received
+before it reaches Django, holding a worker thread under WSGI, and only awaiting under ASGI. Each
+benchmark is preceded by a single warm-up request, so that the caches are filled.
+
+The benchmark reads the database configured by the settings (DJANGO_SETTINGS_MODULE), which
+should hold some products, and creates a 'benchmark' user to authenticate the requests.
+
+Usage:
+    python benchmarks/wsgi_vs_asgi.py --requests 2000 --concurrency 100 --threads 8 \
+        --client-delay 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_management_system.settings")
+
+import django  # noqa: E402 pylint: disable=wrong-import-position
+
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from apps.product.models import Product  # noqa: E402
+
+
+def get_authorization():
+    """
+    Get the 'Authorization' header of the 'benchmark' user, creating the user if needed.
+
+    Returns:
+    - str: The header value.
+    """
+    user, created = User.objects.get_or_create(username="benchmark")
+    if created:
+        user.set_unusable_password()
+        user.save()
+
+    return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+
+def wsgi_request(handler, url, authorization, client_delay):
+    """
+    Run a request through the WSGI handler.
+
+    Parameters:
+    - handler (WSGIHandler): The WSGI handler.
+    - url (str): The requested URL.
+    - authorization (str): The 'Authorization' header.
+    - client_delay (float): The number of seconds the request takes to be received.
+
+    Returns:
+    - tuple: The status and the latency (in seconds) of the request.
+    """
+    started = time.perf_counter()
+    time.sleep(client_delay)
+
+    parts = urlsplit(url)
+    environ = {
+        "PATH_INFO": parts.path,
+        "QUERY_STRING": parts.query,
+        "HTTP_AUTHORIZATION": authorization,
+    }
+    setup_testing_defaults(environ)
+    environ["SERVER_NAME"] = "localhost"
+
+    statuses = []
+    body = handler(environ, lambda status, headers: statuses.append(status))
+    b"".join(body)
+    body.close()
+
+    return statuses[0], time.perf_counter() - started
+
+
+async def asgi_request(handler, url, authorization, client_delay):
+    """
+    Run a request through the ASGI handler.
+
+    Parameters:
+    - handler (ASGIHandler): The ASGI handler.
+    - url (str): The requested URL.
+    - authorization (str): The 'Authorization' header.
+    - client_delay (float): The number of seconds the request takes to be received.
+
+    Returns:
+    - tuple: The status and the latency (in seconds) of the request.
+    """
+    started = time.perf_counter()
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": [
+            (b"host", b"localhost"),
+            (b"authorization", authorization.encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    received = False
+    statuses = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+
+        received = True
+        await asyncio.sleep(client_delay)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await handler(scope, receive, send)
+    return statuses[0], time.perf_counter() - started
+
+
+def run_wsgi(url, authorization, options):
+    """
+    Run the requests of a benchmark through the WSGI handler, in a pool of threads.
+
+    Parameters:
+    - url (str): The requested URL.
+    - authorization (str): The 'Authorization' header.
+    - options (Namespace): The benchmark options.
+
+    Returns:
+    - tuple: The results of the requests and the elapsed time (in seconds).
+    """
+    handler = WSGIHandler()
+    delay = options.client_delay / 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.threads) as pool:
+        results = list(
+            pool.map(
+                lambda _: wsgi_request(handler, url, authorization, delay),
+                range(options.requests),
+            )
+        )
+    return results, time.perf_counter() - started
+
+
+def run_asgi(url, authorization, options):
+    """
+    Run the requests of a benchmark through the ASGI handler, in a single event loop.
+
+    Parameters:
+    - url (str): The requested URL.
+    - authorization (str): The 'Authorization' header.
+    - options (Namespace): The benchmark options.
+
+    Returns:
+    - tuple: The results of the requests and the elapsed time (in seconds).
+    """
+    handler = ASGIHandler()
+    delay = options.client_delay / 1000
+
+    async def run():
+        semaphore = asyncio.Semaphore(options.concurrency)
+
+        async def request():
+            async with semaphore:
+                return await asgi_request(handler, url, authorization, delay)
+
+        return await asyncio.gather(*(request() for _ in range(options.requests)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    return results, time.perf_counter() - started
+
+
+def report(name, url, results, elapsed):
+    """
+    Print the throughput and the latencies of a benchmark.
+
+    Parameters:
+    - name (str): The name of the benchmark.
+    - url (str): The requested URL.
+    - results (list): The '(status, latency)' tuples of the requests.
+    - elapsed (float): The elapsed time (in seconds).
+    """
+    latencies = sorted(latency for _, latency in results)
+    errors = sum(1 for status, _ in results if not str(status).startswith("200"))
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<6} {url:<28} {len(results) / elapsed:>9.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:>8.1f} ms"
+        f"  p99 {p99 * 1000:>8.1f} ms  errors {errors}"
+    )
+
+
+def main():
+    """
+    Parse the options and run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="Concurrent ASGI requests."
+    )
+    parser.add_argument("--threads", type=int, default=8, help="WSGI worker threads.")
+    parser.add_argument(
+        "--client-delay",
+        type=float,
+        default=50,
+        help="Milliseconds every request takes to be received.",
+    )
+    options = parser.parse_args()
+
+    product = Product.objects.order_by("id").first()
+    if product is None:
+        parser.error("The database holds no product, seed it first.")
+
+    benchmarks = [
+        ("WSGI", run_wsgi, "/products/?page=2"),
+        ("ASGI", run_asgi, "/products/?page=2"),
+        ("ASGI", run_asgi, "/async/products/?page=2"),
+        ("WSGI", run_wsgi, f"/products/{product.id}"),
+        ("ASGI", run_asgi, f"/products/{product.id}"),
+        ("ASGI", run_asgi, f"/async/products/{product.id}"),
+    ]
+
+    warm_up = argparse.Namespace(requests=1, concurrency=1, threads=1, client_delay=0)
+    for name, run, url in benchmarks:
+        authorization = get_authorization()
+        run(url, authorization, warm_up)
+        results, elapsed = run(url, authorization, options)
+        report(name, url, results, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Module containing the middlewares of the project.
+
+Responses are compressed with the best content coding accepted by the client through the
+'Accept-Encoding' header, among Zstandard ('zstd'), Brotli ('br') and gzip. Zstandard and Brotli
+are offered only when their library ('zstandard' or 'brotli') is installed, gzip being always
+available. When the client accepts several of them with the same quality, the order of the
+'COMPRESSION_LEVELS' setting decides.
+
+Responses shorter than the 'COMPRESSION_MIN_LENGTH' setting are sent as they are, as the few
+bytes saved do not pay for the compression time. Streamed responses (e.g. the product exports)
+have no known length: they are always compressed, chunk by chunk, each chunk being flushed as
+soon as it is compressed so that the client keeps receiving data while the stream is produced.
+
+HTML responses (e.g. the pages of the browsable API) are never compressed: they may carry a
+secret, such as a CSRF token, next to text reflected from the request, which would expose the
+secret to compression side-channel attacks (BREACH).
+
+Settings:
+- COMPRESSION_MIN_LENGTH (int): The minimum length (in bytes) of the compressed bodies.
+- COMPRESSION_LEVELS (dict): The compression level of each content coding, in order of
+                             preference. Removing a coding disables it.
+
+Classes:
+- Compressor: Incremental compressor of a content coding.
+- CompressionMiddleware(MiddlewareMixin): Middleware compressing the responses.
+
+Functions:
+- parse_accept_encoding(header): Parses the quality of each coding of an 'Accept-Encoding'.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+MIN_LENGTH = 1024
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
+CODING_PATTERN = re.compile(r"^\s*([\w*.+-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+class Compressor:
+    """
+    Incremental compressor of a content coding.
+
+    Each call of 'compress' returns the compressed data flushed up to a block boundary, so that
+    it can be decoded by the client without waiting for the rest of the stream, and 'finish'
+    returns the end of the stream.
+
+    Attributes:
+    - coding (str): The content coding ('zstd', 'br' or 'gzip').
+    - level (int): The compression level.
+
+    Methods:
+    - available(coding): Tells whether the library of a content coding is installed.
+    - compress_all(data): Compresses a whole body at once.
+    - compress(data): Compresses a chunk of a stream.
+    - finish(): Ends the compressed stream.
+    """
+
+    def __init__(self, coding, level):
+        """
+        Initialize the compressor of a content coding.
+
+        Parameters:
+        - coding (str): The content coding ('zstd', 'br' or 'gzip').
+        - level (int): The compression level.
+        """
+        self.coding = coding
+        self.level = level
+        self._stream = None
+
+    @staticmethod
+    def available(coding):
+        """
+        Tell whether the library of a content coding is installed.
+
+        Parameters:
+        - coding (str): The content coding.
+
+        Returns:
+        - bool: Whether the coding can be used.
+        """
+        return {"zstd": zstandard, "br": brotli, "gzip": zlib}.get(coding) is not None
+
+    def compress_all(self, data):
+        """
+        Compress a whole body at once.
+
+        Parameters:
+        - data (bytes): The body.
+
+        Returns:
+        - bytes: The compressed body.
+        """
+        if self.coding == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        if self.coding == "br":
+            return brotli.compress(data, quality=self.level)
+        return self.compress(data) + self.finish()
+
+    def compress(self, data):
+        """
+        Compress a chunk of a stream, flushing the compressed data.
+
+        Parameters:
+        - data (bytes): The chunk.
+
+        Returns:
+        - bytes: The compressed data, possibly empty.
+        """
+        if self._stream is None:
+            self._stream = self._open()
+        if self.coding == "zstd":
+            return self._stream.compress(data) + self._stream.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        if self.coding == "br":
+            return self._stream.process(data) + self._stream.flush()
+        return self._stream.compress(data) + self._stream.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        """
+        End the compressed stream.
+
+        Returns:
+        - bytes: The end of the compressed stream.
+        """
+        if self._stream is None:
+            self._stream = self._open()
+        if self.coding == "br":
+            return self._stream.finish()
+        return self._stream.flush()
+
+    def _open(self):
+        """
+        Open the compression stream of the content coding.
+        """
+        if self.coding == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compressobj()
+        if self.coding == "br":
+            return brotli.Compressor(quality=self.level)
+        # A window of 16 + 15 bits writes the gzip header and trailer around the deflate data.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def parse_accept_encoding(header):
+    """
+    Parse the quality of each content coding of an 'Accept-Encoding' header.
+
+    Parameters:
+    - header (str): The value of the header.
+
+    Returns:
+    - dict: The quality (between 0 and 1) of each listed coding, in lower case, '*' standing for
+            the codings which are not listed.
+    """
+    qualities = {}
+    for item in header.split(","):
+        match = CODING_PATTERN.match(item)
+        if match is None:
+            continue
+        coding, quality = match.groups()
+        try:
+            qualities[coding.lower()] = min(float(quality or 1), 1.0)
+        except ValueError:
+            continue
+    return qualities
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Middleware compressing the responses with the best content coding accepted by the client.
+
+    Like Django's 'GZipMiddleware', it weakens the strong ETags of the compressed responses (the
+    validators still match the 'If-None-Match' headers, which use the weak comparison), adds
+    'Accept-Encoding' to their 'Vary' header, and leaves alone the responses which already have
+    a 'Content-Encoding'.
+
+    Attributes:
+    - min_length (int): The minimum length of the compressed bodies.
+    - levels (dict): The compression level of each available content coding, in order of
+                     preference.
+
+    Methods:
+    - select_coding(request): Selects the content coding of a response.
+    - process_response(request, response): Compresses a response.
+    """
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware from the compression settings.
+
+        Parameters:
+        - get_response (callable): The next middleware or view.
+        """
+        super().__init__(get_response)
+        self.min_length = getattr(settings, "COMPRESSION_MIN_LENGTH", MIN_LENGTH)
+        self.levels = {
+            coding: level
+            for coding, level in getattr(settings, "COMPRESSION_LEVELS", LEVELS).items()
+            if Compressor.available(coding)
+        }
+
+    def select_coding(self, request):
+        """
+        Select the content coding of a response, from the 'Accept-Encoding' request header.
+
+        Parameters:
+        - request (HttpRequest): The request.
+
+        Returns:
+        - str: The accepted coding with the highest quality, ties being broken by the order of
+               preference, or None if no available coding is accepted.
+        """
+        qualities = parse_accept_encoding(request.headers.get("Accept-Encoding", ""))
+        default = qualities.get("*", 0)
+        best, best_quality = None, 0
+        for coding in self.levels:
+            quality = qualities.get(coding, default)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def process_response(self, request, response):
+        """
+        Compress a response, if it is long enough, is not HTML and a content coding is
+        accepted.
+
+        Parameters:
+        - request (HttpRequest): The request.
+        - response (HttpResponse): The response.
+
+        Returns:
+        - HttpResponse: The given response, possibly compressed.
+        """
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        if response.get("Content-Type", "").startswith("text/html"):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        coding = self.select_coding(request)
+        if coding is None:
+            return response
+
+        compressor = Compressor(coding, self.levels[coding])
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._acompress_stream(
+                    compressor, response.streaming_content
+                )
+            else:
+                response.streaming_content = self._compress_stream(
+                    compressor, response.streaming_content
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compressor.compress_all(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
+
+    @staticmethod
+    def _compress_stream(compressor, chunks):
+        """
+        Compress the chunks of a streamed body.
+        """
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    @staticmethod
+    async def _acompress_stream(compressor, chunks):
+        """
+        Compress the chunks of an asynchronously streamed body.
+        """
+        async for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
 import django
@@ -53,16 +54,24 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "django_management_system.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.product.routers.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
 ]
 
+# Response compression (see django_management_system/middleware.py): bodies shorter than
+# COMPRESSION_MIN_LENGTH bytes are not compressed, and the codings are tried in the order of
+# COMPRESSION_LEVELS ('zstd' and 'br' being skipped when their library is not installed).
+COMPRESSION_MIN_LENGTH = 1024
+COMPRESSION_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+
 ROOT_URLCONF = "django_management_system.urls"
 
 TEMPLATES = [
@@ -86,13 +95,97 @@ WSGI_APPLICATION = "django_management_system.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+#
+# Connections are kept for CONN_MAX_AGE seconds, so that requests do not reopen (and tune) one
+# each. Every new SQLite connection is given the pragma profile of its 'PRAGMAS' entry, applied
+# in order (WAL journal, busy timeout, page cache, memory mapping...; see
+# 'apps/product/database.py'), where None leaves a pragma unset.
+# Transactions take the write lock as they begin ("IMMEDIATE"), so that a transaction reading
+# before writing waits for the other writers instead of failing with "database is locked".
+# The database is maintained by 'python manage.py db_maintain'.
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+        },
+        "PRAGMAS": {
+            "auto_vacuum": "incremental",
+            "busy_timeout": 5000,
+            "journal_mode": "wal",
+            "synchronous": "normal",
+            "cache_size": -20000,
+            "mmap_size": 268435456,
+            "temp_store": "memory",
+        },
     }
 }
 
+# Read replicas (see apps/product/routers.py): the product reads of the GET requests go to the
+# READ_REPLICAS databases, chosen by READ_REPLICA_SELECTION ("round_robin" or "least_lag"), and
+# every other query to 'default'. Replicas lagging more than READ_REPLICA_MAX_LAG seconds are left
+# out, and the reads of a user go to 'default' for READ_REPLICA_MAX_LAG seconds after their writes.
+# A replica is declared like the primary, e.g.:
+#
+#     DATABASES["replica"] = {
+#         "ENGINE": "django.db.backends.sqlite3",
+#         "NAME": BASE_DIR / "replica.sqlite3",
+#         "PRAGMAS": {
+#             **DATABASES["default"]["PRAGMAS"],
+#             "journal_mode": None,
+#             "query_only": 1,
+#         },
+#         "LAG_QUERY": "SELECT 0",
+#         "TEST": {"MIRROR": "default"},
+#     }
+#
+# where the optional 'LAG_QUERY' returns the lag of the replica in seconds.
+
+# Sharding (see apps/product/sharding.py): when PRODUCT_SHARDS lists database aliases, the
+# products are spread over them by id hash, the other tables staying in 'default'. A shard is
+# declared like the primary, e.g.:
+#
+#     DATABASES["shard_0"] = {**DATABASES["default"], "NAME": BASE_DIR / "shard_0.sqlite3"}
+#     PRODUCT_SHARDS = ["shard_0", "shard_1", "shard_2"]
+#
+# and migrated with 'python manage.py migrate --database shard_0'. The shards are fixed once
+# products are stored, and are not combined with read replicas.
+
+DATABASE_ROUTERS = [
+    "apps.product.routers.ShardRouter",
+    "apps.product.routers.ReplicaRouter",
+]
+READ_REPLICAS = []
+READ_REPLICA_SELECTION = "round_robin"
+READ_REPLICA_MAX_LAG = 10
+PRODUCT_SHARDS = []
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# The 'products' cache holds the cached product responses. It is file-based so that every
+# worker process of the host shares it (and its catalog version) without a cache server;
+# point it to a shared backend (e.g. Redis) when running on several hosts. Its TIMEOUT is the
+# TTL of the entries, and MAX_ENTRIES bounds their number.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "products": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "var" / "cache" / "products",
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "MAX_ENTRIES": 10000,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -111,11 +204,30 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The binary formats of the API (MessagePack and CBOR) are enabled when their library
+# is installed.
+BINARY_FORMATS = [
+    name
+    for library, name in (("msgpack", "MessagePack"), ("cbor2", "CBOR"))
+    if find_spec(library)
+]
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 2,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.product.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "apps.product.renderers.ORJSONRenderer",
+        *(f"apps.product.renderers.{name}Renderer" for name in BINARY_FORMATS),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.product.parsers.ORJSONParser",
+        *(f"apps.product.parsers.{name}Parser" for name in BINARY_FORMATS),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
@@ -4,12 +4,46 @@ framework.
 The fixtures include an API client and an authenticated API client. The authenticated client is 
 set up with a test user, providing a valid access token for testing endpoints that require 
 authentication.
+The product caches are replaced by in-memory caches, emptied before each test.
+It also contains the helpers shared by the product tests, to create products, capture the
+queries made on the products table and check their query plans.
 """
+from decimal import Decimal
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.product import authentication
+from apps.product.autocomplete import product_names
+from apps.product.cache import local_products
+from apps.product.models import Product
+
+
+@pytest.fixture(autouse=True)
+def products_cache(settings):
+    """
+    Fixture replacing the product cache with an empty in-memory cache for each test, and
+    emptying the local product cache, the product name index and the authentication caches of
+    the process.
+
+    :return: BaseCache
+    """
+    settings.CACHES = {
+        **settings.CACHES,
+        "products": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    caches["products"].clear()
+    local_products.clear()
+    product_names.clear()
+    authentication.validated_tokens.clear()
+    authentication.users.clear()
+    yield caches["products"]
+
 
 @pytest.fixture(scope="function")
 def api_client() -> APIClient:
@@ -36,3 +70,123 @@ def authenticated_api_client():
     client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
 
     return client
+
+
+def create_product(name="Test product", price=650) -> Product:
+    """
+    Create a product.
+
+    :param name: Name of the product.
+    :param price: Price of the product.
+    :return: The created product.
+    """
+    return Product.objects.create(
+        name=name, description="Test product description", price=price
+    )
+
+
+def create_products(
+    size,
+    name=lambda index: f"Product {index}",
+    price=lambda index: 650 + index,
+    description="Test product description",
+) -> list:
+    """
+    Create products, by default with distinct names and prices.
+
+    :param size: Number of products to be created.
+    :param name: Function returning the name of the product of the given index.
+    :param price: Function returning the price of the product of the given index.
+    :param description: Description of the products.
+    :return: List of the created products.
+    """
+    return [
+        Product.objects.create(
+            name=name(index), description=description, price=price(index)
+        )
+        for index in range(size)
+    ]
+
+
+def create_priced_products(size) -> list:
+    """
+    Create products whose names repeat and whose prices cross several buckets of the price
+    statistics.
+
+    :param size: Number of products to be created.
+    :return: List of the created products.
+    """
+    return create_products(
+        size,
+        name=lambda index: f"Product {index % 3}",
+        price=lambda index: Decimal("550.25") + index * 97,
+    )
+
+
+def product_queries(context) -> list:
+    """
+    Get the captured queries made on the products table.
+
+    :param context: Context that captured the queries.
+    :return: List of the SQL of the product queries.
+    """
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if f'"{Product._meta.db_table}"' in query["sql"]
+    ]
+
+
+def get_product_queries(client, url) -> tuple:
+    """
+    Request the given URL and get the queries made on the products table.
+
+    :param client: API client used for the request.
+    :param url: Requested URL.
+    :return: Tuple of the response and of the list of the SQL of the product queries.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    return response, product_queries(context)
+
+
+def get_plan(sql) -> list:
+    """
+    Run 'EXPLAIN QUERY PLAN' for the given query and return its steps.
+
+    :param sql: SQL query, with its parameters already interpolated.
+    :return: List of the plan steps.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def get_table_scans(sql, ordering_index=None) -> list:
+    """
+    Run 'EXPLAIN QUERY PLAN' for the given query and return its full scan and sort steps.
+
+    Any query fails on a scan of the products table without an index, and on a temporary B-tree.
+    Only a page query (one with a LIMIT) whose 'ordering_index' is None may sort its rows. A
+    page query also fails on scanning an index other than 'ordering_index', since such a scan
+    is not stopped by the LIMIT.
+
+    :param sql: SQL query, with its parameters already interpolated.
+    :param ordering_index: Name of the index the page query must be read in order from, or None
+                           if it must search the filtered products and sort them.
+    :return: List of the plan steps reading every product or sorting them.
+    """
+    page = " LIMIT " in sql
+    scans = []
+    for step in get_plan(sql):
+        scan = step.startswith(f"SCAN {Product._meta.db_table}")
+        if scan and "INDEX" not in step:
+            scans.append(step)
+        elif step.startswith("USE TEMP B-TREE"):
+            if not page or ordering_index is not None or "ORDER BY" not in step:
+                scans.append(step)
+        elif page and scan and not step.endswith(f" INDEX {ordering_index}"):
+            scans.append(step)
+
+    return scans
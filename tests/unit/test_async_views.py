@@ -0,0 +1,169 @@
+"""
+This test module includes unit tests for the async product views.
+
+The tests cover the following scenarios:
+1. Listing products through the async view, with the same response as the sync view.
+2. Counting the listed products with the async cache API and ORM only.
+3. Retrieving a product through the async view, with the same response as the sync view.
+4. Requesting the async views without valid credentials.
+5. Requesting the async views with invalid query params.
+"""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from conftest import create_products
+from django.test import AsyncClient
+
+from apps.product import counts, routers, stats
+
+
+def async_get(url, authorization=None):
+    """
+    Request the given URL through the ASGI handler.
+
+    :param url: Requested URL.
+    :param authorization: Value of the 'Authorization' header, if any.
+    :return: The response.
+    """
+    headers = {"Authorization": authorization} if authorization else {}
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+@pytest.fixture
+def authorization(authenticated_api_client) -> str:
+    """
+    Fixture to provide the 'Authorization' header of the authenticated API client.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: str
+    """
+    return authenticated_api_client._credentials["HTTP_AUTHORIZATION"]
+
+
+@pytest.mark.django_db
+def test_async_list_products(authenticated_api_client, authorization) -> None:
+    """
+    Test listing products through the async view.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param authorization: Authorization header fixture.
+    :return: None
+    """
+    create_products(7)
+
+    for query_string in ("", "?page=2", "?ordering=-price&min_price=652&page_size=2"):
+        response = async_get(f"/async/products/{query_string}", authorization)
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+
+        expected = authenticated_api_client.get(f"/products/{query_string}")
+        assert response.json() == json.loads(
+            json.dumps(expected.data).replace("/products/", "/async/products/")
+        )
+
+
+@pytest.mark.django_db
+def test_async_list_counts_asynchronously(
+    authenticated_api_client, authorization, monkeypatch
+) -> None:
+    """
+    Test counting the listed products, exactly or from the price statistics summary, without
+    calling the sync count and cache helpers.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param authorization: Authorization header fixture.
+    :param monkeypatch: Pytest fixture replacing the sync helpers.
+    :return: None
+    """
+    create_products(7)
+    monkeypatch.setattr(counts, "ESTIMATE_THRESHOLD", 1)
+    expected = authenticated_api_client.get(
+        "/products/?min_price=652.5&page_size=2"
+    ).data
+    assert expected["count_exact"] is False
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sync helper called")
+
+    for module, name in (
+        (counts, "get_list_state"),
+        (routers, "can_cache_reads"),
+        (stats, "read_summary"),
+    ):
+        monkeypatch.setattr(module, name, fail)
+
+    response = async_get("/async/products/?min_price=652.5&page_size=2", authorization)
+    assert response.status_code == 200
+    assert response.json()["count"] == expected["count"]
+    assert response.json()["count_exact"] is False
+
+    response = async_get("/async/products/?name=Product 1", authorization)
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+
+
+@pytest.mark.django_db
+def test_async_retrieve_product(authenticated_api_client, authorization) -> None:
+    """
+    Test retrieving a product through the async view.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param authorization: Authorization header fixture.
+    :return: None
+    """
+    (product,) = create_products(1)
+
+    response = async_get(f"/async/products/{product.id}", authorization)
+    assert response.status_code == 200
+
+    expected = authenticated_api_client.get(f"/products/{product.id}")
+    assert response.json() == json.loads(json.dumps(expected.data))
+
+    for product_id in (product.id + 1, "unknown"):
+        response = async_get(f"/async/products/{product_id}", authorization)
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Not found."}
+
+
+@pytest.mark.django_db
+def test_async_views_without_credentials() -> None:
+    """
+    Test requesting the async views without credentials, or with an invalid token.
+
+    :return: None
+    """
+    response = async_get("/async/products/")
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"] == 'Bearer realm="api"'
+
+    response = async_get("/async/products/1", "Bearer invalid")
+    assert response.status_code == 401
+    assert response.json()["code"] == "token_not_valid"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_string, field",
+    [
+        ("?ordering=name", "ordering"),
+        ("?min_price=abc", "min_price"),
+        ("?page=9", None),
+    ],
+)
+def test_async_list_with_invalid_params(authorization, query_string, field) -> None:
+    """
+    Test listing products through the async view with invalid query params.
+
+    :param authorization: Authorization header fixture.
+    :param query_string: Query string under test.
+    :param field: Name of the invalid query param, or None for an invalid page.
+    :return: None
+    """
+    response = async_get(f"/async/products/{query_string}", authorization)
+
+    if field is None:
+        assert response.status_code == 404
+    else:
+        assert response.status_code == 400
+        assert list(response.json()) == [field]
@@ -0,0 +1,141 @@
+"""
+This test module includes unit tests for the cached JWT authentication.
+
+The tests cover the following scenarios:
+1. Authenticating repeated requests without verifying the token or loading the user again.
+2. Rejecting the tokens of a user deactivated or deleted since it was cached.
+3. Rejecting invalid tokens, which are never cached.
+4. Expiring the cached tokens along with the tokens themselves.
+"""
+import time
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.product import authentication
+
+
+def user_queries(client, url) -> tuple:
+    """
+    Request the given URL and list the queries made on the users table.
+
+    :param client: API client used for the request.
+    :param url: Requested URL.
+    :return: Tuple of the response and of the list of user queries.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    queries = [
+        query
+        for query in context.captured_queries
+        if User._meta.db_table in query["sql"]
+    ]
+    return response, queries
+
+
+@pytest.mark.django_db
+def test_authentication_cached(authenticated_api_client, monkeypatch) -> None:
+    """
+    Test that repeated requests neither verify the token nor load the user again.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    response, queries = user_queries(authenticated_api_client, "/products/")
+    assert response.status_code == 200
+    assert len(queries) == 1
+    assert len(authentication.validated_tokens._entries) == 1
+
+    def fail(*args):
+        raise AssertionError("The token was verified again.")
+
+    monkeypatch.setattr(JWTAuthentication, "get_validated_token", fail)
+
+    response, queries = user_queries(authenticated_api_client, "/products/")
+    assert response.status_code == 200
+    assert queries == []
+
+
+@pytest.mark.django_db
+def test_changed_user_rejected(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that the tokens of a deactivated or deleted user are rejected although the user was
+    cached.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    assert authenticated_api_client.get("/products/").status_code == 200
+    user = User.objects.get(username="testuser")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+
+    response = authenticated_api_client.get("/products/")
+    assert response.status_code == 401
+    assert response.data["code"] == "user_inactive"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    response = authenticated_api_client.get("/products/")
+    assert response.status_code == 401
+    assert response.data["code"] == "user_not_found"
+
+
+@pytest.mark.django_db
+def test_invalid_token_not_cached(api_client) -> None:
+    """
+    Test that invalid tokens are rejected, and never cached.
+
+    :param api_client: API client fixture.
+    :return: None
+    """
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+    for _ in range(2):
+        response = api_client.get("/products/")
+        assert response.status_code == 401
+        assert response.data["code"] == "token_not_valid"
+
+    assert not authentication.validated_tokens._entries
+
+
+@pytest.mark.django_db
+def test_cached_token_expires(authenticated_api_client, monkeypatch) -> None:
+    """
+    Test that a cached token expires along with the token itself, and is then verified again.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    assert authenticated_api_client.get("/products/").status_code == 200
+    ((_, (token, expires)),) = authentication.validated_tokens._entries.items()
+    assert expires == pytest.approx(
+        time.monotonic() + token["exp"] - time.time(), abs=5
+    )
+
+    verified = []
+    get_validated_token = JWTAuthentication.get_validated_token
+
+    def spy(self, raw_token):
+        verified.append(raw_token)
+        return get_validated_token(self, raw_token)
+
+    monkeypatch.setattr(JWTAuthentication, "get_validated_token", spy)
+    assert authenticated_api_client.get("/products/").status_code == 200
+    assert verified == []
+
+    monkeypatch.setattr(time, "monotonic", lambda: expires + 1)
+    assert authenticated_api_client.get("/products/").status_code == 200
+    assert len(verified) == 1
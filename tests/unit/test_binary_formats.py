@@ -0,0 +1,144 @@
+"""
+This test module includes unit tests for the MessagePack and CBOR formats of the API.
+
+The tests cover the following scenarios:
+1. Listing and retrieving products in MessagePack and CBOR, with the values of the JSON ones.
+2. Creating products from MessagePack and CBOR bodies, with string or native prices.
+3. Decoding native MessagePack and CBOR timestamps and decimals.
+4. Sending invalid MessagePack and CBOR bodies.
+"""
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from apps.product.models import Product
+from apps.product.parsers import CBORParser, MessagePackParser
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+FORMATS = {
+    "application/msgpack": (msgpack.packb, msgpack.unpackb),
+    "application/cbor": (cbor2.dumps, cbor2.loads),
+}
+
+
+@pytest.fixture
+def product() -> Product:
+    """
+    Fixture to provide a product.
+
+    :return: Product
+    """
+    return Product.objects.create(
+        name="Chair", description="Test product description", price=Decimal("650.50")
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("media_type", FORMATS)
+def test_read_products_in_binary_formats(
+    authenticated_api_client, product, media_type
+) -> None:
+    """
+    Test listing and retrieving products in a binary format.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param product: Product fixture.
+    :param media_type: Media type of the binary format.
+    :return: None
+    """
+    _, decode = FORMATS[media_type]
+
+    for url in ("/products/", f"/products/{product.id}"):
+        expected = authenticated_api_client.get(url, HTTP_ACCEPT="application/json")
+        response = authenticated_api_client.get(url, HTTP_ACCEPT=media_type)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == media_type
+        assert decode(response.content) == json.loads(expected.content)
+        assert len(response.content) < len(expected.content)
+        assert response["ETag"] != expected["ETag"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "media_type, price",
+    [
+        ("application/msgpack", "650.50"),
+        ("application/msgpack", 650.5),
+        ("application/cbor", "650.50"),
+        ("application/cbor", Decimal("650.50")),
+        ("application/cbor", 650.5),
+    ],
+)
+def test_create_products_from_binary_formats(
+    authenticated_api_client, media_type, price
+) -> None:
+    """
+    Test creating products from bodies in a binary format.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param media_type: Media type of the binary format.
+    :param price: Price sent in the body.
+    :return: None
+    """
+    encode, decode = FORMATS[media_type]
+
+    payload = {"name": "Chair", "description": "Test product description"}
+    response = authenticated_api_client.post(
+        "/products/",
+        encode({**payload, "price": price}),
+        content_type=media_type,
+        HTTP_ACCEPT=media_type,
+    )
+    assert response.status_code == 201
+    assert decode(response.content)["price"] == "650.50"
+
+    response = authenticated_api_client.post(
+        "/products/bulk",
+        encode([{**payload, "price": price}] * 2),
+        content_type=media_type,
+    )
+    assert response.status_code == 201
+    assert Product.objects.filter(price=Decimal("650.50")).count() == 3
+
+
+def test_native_values_decoded() -> None:
+    """
+    Test decoding native MessagePack and CBOR timestamps and decimals.
+
+    :return: None
+    """
+    timestamp = datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.UTC)
+
+    body = msgpack.packb({"at": timestamp}, datetime=True)
+    assert MessagePackParser().parse(io.BytesIO(body)) == {"at": timestamp}
+
+    body = cbor2.dumps({"at": timestamp, "price": Decimal("650.50")})
+    assert CBORParser().parse(io.BytesIO(body)) == {
+        "at": timestamp,
+        "price": Decimal("650.50"),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("media_type", FORMATS)
+def test_invalid_binary_bodies(authenticated_api_client, media_type) -> None:
+    """
+    Test sending invalid bodies in a binary format.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param media_type: Media type of the binary format.
+    :return: None
+    """
+    _, decode = FORMATS[media_type]
+
+    response = authenticated_api_client.post(
+        "/products/", b"\xc1\xff", content_type=media_type, HTTP_ACCEPT=media_type
+    )
+    assert response.status_code == 400
+    assert "parse error" in decode(response.content)["detail"]
@@ -0,0 +1,259 @@
+"""
+This test module includes unit tests for the response compression middleware.
+
+The tests cover the following scenarios:
+1. Compressing the product list with each content coding, with the body of the uncompressed one.
+2. Selecting the content coding from the qualities of the 'Accept-Encoding' header.
+3. Sending the responses shorter than the threshold, the unaccepted and the HTML ones,
+uncompressed.
+4. Compressing the streamed export incrementally, and asynchronous streams.
+5. Applying the compression level and threshold settings.
+"""
+import gzip
+import zlib
+
+import brotli
+import pytest
+import zstandard
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from apps.product.models import Product
+from django_management_system.middleware import (
+    CompressionMiddleware,
+    parse_accept_encoding,
+)
+
+CONTENT_TYPE = "application/json"
+
+DECOMPRESSORS = {
+    "gzip": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS).decompress,
+    "br": lambda: brotli.Decompressor().process,
+    "zstd": lambda: zstandard.ZstdDecompressor().decompressobj().decompress,
+}
+
+
+def decompress(coding, data):
+    """
+    Decompress a body encoded with the given content coding.
+
+    :param coding: Content coding of the body.
+    :param data: Compressed body.
+    :return: The decompressed body.
+    """
+    return DECOMPRESSORS[coding]()(data)
+
+
+def compress_response(response, accept_encoding):
+    """
+    Pass a response through the middleware.
+
+    :param response: Response returned by the view.
+    :param accept_encoding: Value of the 'Accept-Encoding' request header.
+    :return: The response returned by the middleware.
+    """
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+@pytest.fixture
+def products() -> list:
+    """
+    Fixture to provide enough products for the product list to be compressed.
+
+    :return: List of products
+    """
+    return Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Chair {index}", description="Test product description", price=650
+            )
+            for index in range(15)
+        ]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("coding", DECOMPRESSORS)
+def test_compress_product_list(authenticated_api_client, products, coding) -> None:
+    """
+    Test compressing the product list with each content coding.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param products: Products fixture.
+    :param coding: Content coding under test.
+    :return: None
+    """
+    url = "/products/?page_size=15"
+    expected = authenticated_api_client.get(url)
+    response = authenticated_api_client.get(url, HTTP_ACCEPT_ENCODING=coding)
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == coding
+    assert "Accept-Encoding" in response["Vary"]
+    assert int(response["Content-Length"]) == len(response.content)
+    assert len(response.content) < len(expected.content)
+    assert decompress(coding, response.content) == expected.content
+    assert response["ETag"] == "W/" + expected["ETag"]
+
+    response = authenticated_api_client.get(
+        url, HTTP_ACCEPT_ENCODING=coding, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, coding",
+    [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("zstd;q=0, *", "br"),
+        ("*;q=0.1, gzip;q=0.2", "gzip"),
+        ("GZIP", "gzip"),
+        ("identity", None),
+        ("gzip;q=0, deflate", None),
+        ("", None),
+    ],
+)
+def test_select_coding(accept_encoding, coding) -> None:
+    """
+    Test selecting the content coding from the 'Accept-Encoding' header.
+
+    :param accept_encoding: Value of the 'Accept-Encoding' request header.
+    :param coding: Expected content coding, if any.
+    :return: None
+    """
+    response = compress_response(
+        HttpResponse(b"a" * 2000, content_type=CONTENT_TYPE), accept_encoding
+    )
+    assert response.get("Content-Encoding") == coding
+
+
+def test_parse_accept_encoding() -> None:
+    """
+    Test parsing the qualities of an 'Accept-Encoding' header, skipping the invalid items.
+
+    :return: None
+    """
+    header = "gzip;q=0.5, br, zstd;q=2, bad;q=x, ;;, *;q=0"
+    assert parse_accept_encoding(header) == {
+        "gzip": 0.5,
+        "br": 1.0,
+        "zstd": 1.0,
+        "*": 0.0,
+    }
+
+
+def test_skip_compression() -> None:
+    """
+    Test sending the short, already encoded, incompressible and HTML responses uncompressed.
+
+    :return: None
+    """
+    response = compress_response(
+        HttpResponse(b"a" * 1023, content_type=CONTENT_TYPE), "gzip"
+    )
+    assert not response.has_header("Content-Encoding")
+    assert response.content == b"a" * 1023
+
+    response = HttpResponse(
+        b"a" * 2000, content_type=CONTENT_TYPE, headers={"Content-Encoding": "br"}
+    )
+    assert compress_response(response, "gzip").content == b"a" * 2000
+
+    body = zlib.compress(bytes(range(256)) * 8)
+    response = compress_response(HttpResponse(body, content_type=CONTENT_TYPE), "gzip")
+    assert not response.has_header("Content-Encoding")
+    assert response.content == body
+
+    # HTML pages may reflect the request next to a secret (BREACH).
+    response = compress_response(HttpResponse(b"a" * 2000), "gzip")
+    assert not response.has_header("Content-Encoding")
+    assert response.content == b"a" * 2000
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("coding", DECOMPRESSORS)
+def test_compress_streamed_export(authenticated_api_client, products, coding) -> None:
+    """
+    Test compressing the streamed product export incrementally.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param products: Products fixture.
+    :param coding: Content coding under test.
+    :return: None
+    """
+    expected = b"".join(
+        authenticated_api_client.get("/products/export").streaming_content
+    )
+    response = authenticated_api_client.get(
+        "/products/export", HTTP_ACCEPT_ENCODING=coding
+    )
+
+    assert response.streaming
+    assert response["Content-Encoding"] == coding
+    assert not response.has_header("Content-Length")
+    assert decompress(coding, b"".join(response.streaming_content)) == expected
+
+    chunks = [b'{"name": "Chair"}\n' * 100] * 3
+    response = compress_response(
+        StreamingHttpResponse(iter(chunks), content_type=CONTENT_TYPE), coding
+    )
+    decompressor = DECOMPRESSORS[coding]()
+    # Every chunk is flushed: it can be decoded before the next one is produced.
+    for chunk, compressed in zip(chunks, response.streaming_content):
+        assert decompressor(compressed) == chunk
+
+
+@pytest.mark.parametrize("coding", DECOMPRESSORS)
+def test_compress_async_stream(coding) -> None:
+    """
+    Test compressing an asynchronously streamed body.
+
+    :param coding: Content coding under test.
+    :return: None
+    """
+    chunks = [b"chunk " * 100, b"", b"end"]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def read(response):
+        return b"".join([chunk async for chunk in response])
+
+    response = compress_response(
+        StreamingHttpResponse(stream(), content_type=CONTENT_TYPE), coding
+    )
+    assert response["Content-Encoding"] == coding
+    assert decompress(coding, async_to_sync(read)(response)) == b"".join(chunks)
+
+
+def test_compression_settings(settings) -> None:
+    """
+    Test applying the compression level and threshold settings.
+
+    :param settings: Pytest-django settings fixture.
+    :return: None
+    """
+    body = b"".join(b"Chair %d, " % index for index in range(1000))
+    settings.COMPRESSION_MIN_LENGTH = 50
+    settings.COMPRESSION_LEVELS = {"gzip": 1}
+
+    response = compress_response(
+        HttpResponse(b"a" * 50, content_type=CONTENT_TYPE), "br, gzip"
+    )
+    assert response["Content-Encoding"] == "gzip"
+
+    fast = compress_response(
+        HttpResponse(body, content_type=CONTENT_TYPE), "gzip"
+    ).content
+    settings.COMPRESSION_LEVELS = {"gzip": 9}
+    best = compress_response(
+        HttpResponse(body, content_type=CONTENT_TYPE), "gzip"
+    ).content
+
+    assert gzip.decompress(fast) == gzip.decompress(best) == body
+    # The extra flags of the gzip header tell the fastest (4) and best (2) compressions apart.
+    assert (fast[8], best[8]) == (4, 2)
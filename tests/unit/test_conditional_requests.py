@@ -0,0 +1,166 @@
+"""
+This test module includes unit tests for the conditional GET requests of the product API.
+
+The tests cover the following scenarios:
+1. Answering a matching 'If-None-Match' or 'If-Modified-Since' on a product with a 304.
+2. Sending the full product again once it was updated.
+3. Answering a matching 'If-None-Match' on a product list with a 304, from the cache or not,
+without counting the products of a cursor list.
+4. Sending the full product list again once a listed product was deleted.
+"""
+import pytest
+from conftest import create_product, product_queries
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.cache import CATALOG_VERSION_KEY, get_catalog_version
+
+
+@pytest.mark.django_db
+def test_product_not_modified(authenticated_api_client) -> None:
+    """
+    Test answering the validators of an unchanged product with a 304.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    product = create_product()
+
+    response = authenticated_api_client.get(f"/products/{product.id}")
+    assert response.status_code == 200
+    etag = response["ETag"]
+    last_modified = response["Last-Modified"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(
+            f"/products/{product.id}", HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert not response.content
+    assert not product_queries(context)
+
+    response = authenticated_api_client.get(
+        f"/products/{product.id}", HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == 304
+
+    response = authenticated_api_client.get(
+        f"/products/{product.id}?format=api", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_product_modified(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test sending the full product when it was updated since the client fetched it.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    product = create_product()
+
+    response = authenticated_api_client.get(f"/products/{product.id}")
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            f"/products/{product.id}", {"price": 700}, format="json"
+        )
+
+    response = authenticated_api_client.get(
+        f"/products/{product.id}", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == 200
+    assert response.data["price"] == "700.00"
+    assert response["ETag"] != etag
+
+    response = authenticated_api_client.get("/products/0", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_list_not_modified(authenticated_api_client, products_cache) -> None:
+    """
+    Test answering the validators of an unchanged product list with a 304.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param products_cache: Fixture providing the cleared 'products' cache.
+    :return: None
+    """
+    create_product()
+
+    response = authenticated_api_client.get("/products/?page_size=5")
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(
+            "/products/?page_size=5", HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 304
+    assert not product_queries(context)
+
+    version = get_catalog_version()
+    products_cache.clear()
+    products_cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(
+            "/products/?page_size=5", HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 304
+    queries = product_queries(context)
+    assert len(queries) == 2
+    assert "MAX" not in " ".join(queries)
+    assert "LIMIT 5" in queries[1]
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(
+            "/products/?pagination=cursor&page_size=5", HTTP_IF_NONE_MATCH=etag
+        )
+    assert response.status_code == 200
+    assert "COUNT" not in " ".join(product_queries(context))
+    cursor_etag = response["ETag"]
+
+    products_cache.clear()
+    products_cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+    response = authenticated_api_client.get(
+        "/products/?pagination=cursor&page_size=5", HTTP_IF_NONE_MATCH=cursor_etag
+    )
+    assert response.status_code == 304
+
+    response = authenticated_api_client.get(
+        "/products/?page_size=6", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_modified_by_delete(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test sending the full product list when one of the listed products was deleted.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    products = [create_product(price) for price in (650, 700)]
+
+    response = authenticated_api_client.get("/products/")
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(f"/products/{products[0].id}")
+
+    response = authenticated_api_client.get("/products/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    assert response["ETag"] != etag
@@ -0,0 +1,148 @@
+"""
+This test module includes unit tests for the SQLite connection profile and maintenance.
+
+The tests cover the following scenarios:
+1. Applying the pragma profile to every new SQLite connection.
+2. Updating the profile through the database settings, and rejecting invalid pragmas.
+3. Vacuuming and checkpointing a database file.
+4. Running the 'db_maintain' command.
+"""
+import io
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from apps.product.database import checkpoint, get_pragmas, incremental_vacuum
+
+
+def read_pragma(wrapper, name):
+    """
+    Read the value of a pragma on a connection.
+
+    :param wrapper: Django database connection.
+    :param name: Name of the pragma.
+    :return: The value of the pragma.
+    """
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    """
+    Fixture providing a connection to a database file, closed after the test.
+
+    :param tmp_path: Pytest temporary directory fixture.
+    :return: DatabaseWrapper
+    """
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="file",
+    )
+    yield wrapper
+    wrapper.close()
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connections(file_database) -> None:
+    """
+    Test applying the pragma profile to every new SQLite connection.
+
+    :param file_database: Database file connection fixture.
+    :return: None
+    """
+    for wrapper in (connection, file_database):
+        assert read_pragma(wrapper, "busy_timeout") == 5000
+        assert read_pragma(wrapper, "synchronous") == 1
+        assert read_pragma(wrapper, "cache_size") == -20000
+        assert read_pragma(wrapper, "temp_store") == 2
+
+    assert read_pragma(file_database, "journal_mode") == "wal"
+    assert read_pragma(file_database, "auto_vacuum") == 2
+
+
+def test_pragmas_from_settings() -> None:
+    """
+    Test updating the pragma profile through the database settings, and rejecting invalid
+    pragmas.
+
+    :return: None
+    """
+    profile = connection.settings_dict["PRAGMAS"]
+    assert get_pragmas(connection.settings_dict) == profile
+    assert get_pragmas({}) == {}
+
+    pragmas = get_pragmas(
+        {"PRAGMAS": {**profile, "mmap_size": None, "busy_timeout": 100}}
+    )
+    assert "mmap_size" not in pragmas
+    assert pragmas["busy_timeout"] == 100
+    assert list(pragmas)[:2] == ["auto_vacuum", "busy_timeout"]
+
+    for invalid in ({"journal_mode": "wal; DROP TABLE x"}, {"x y": 1}):
+        with pytest.raises(ImproperlyConfigured):
+            get_pragmas({"PRAGMAS": invalid})
+
+
+@pytest.mark.django_db
+def test_vacuum_and_checkpoint(file_database) -> None:
+    """
+    Test vacuuming and checkpointing a database file.
+
+    :param file_database: Database file connection fixture.
+    :return: None
+    """
+    with file_database.cursor() as cursor:
+        cursor.execute("CREATE TABLE item (value TEXT)")
+        cursor.executemany(
+            "INSERT INTO item (value) VALUES (%s)", [("x" * 1000,)] * 500
+        )
+        cursor.execute("DELETE FROM item")
+
+    assert read_pragma(file_database, "freelist_count") > 0
+    busy, log_pages, checkpointed_pages = checkpoint(file_database, "PASSIVE")
+    assert not busy
+    assert log_pages == checkpointed_pages > 0
+    assert checkpoint(file_database) == (False, 0, 0)
+
+    assert incremental_vacuum(file_database, 10) == 10
+    assert incremental_vacuum(file_database) > 0
+    assert read_pragma(file_database, "freelist_count") == 0
+
+    with file_database.cursor() as cursor:
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        cursor.execute("PRAGMA journal_mode = delete")
+        cursor.execute("PRAGMA auto_vacuum = none")
+        cursor.execute("VACUUM")
+    assert incremental_vacuum(file_database) is None
+    assert checkpoint(file_database, "PASSIVE") == (False, -1, -1)
+
+    with pytest.raises(ValueError):
+        checkpoint(file_database, "NOW")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_maintain_command() -> None:
+    """
+    Test running the 'db_maintain' command.
+
+    :return: None
+    """
+    stdout = io.StringIO()
+    call_command("db_maintain", stdout=stdout)
+    output = stdout.getvalue()
+
+    assert "Analyzed the tables and indexes." in output
+    assert "Optimized the database." in output
+    assert "Vacuumed 0 free pages." in output
+    assert "Skipped the checkpoint" in output
+    assert "Maintained the database." in output
+
+    stdout = io.StringIO()
+    call_command("db_maintain", "--steps", "optimize", stdout=stdout)
+    assert "Analyzed" not in stdout.getvalue()
+    assert "Optimized the database." in stdout.getvalue()
@@ -0,0 +1,115 @@
+"""
+This test module includes unit tests for the 'import_products' management command.
+
+The tests cover the following scenarios:
+1. Importing products from a CSV file, with rejected rows written to a side file.
+2. Importing products from an NDJSON file, validating the rows in worker processes.
+3. Importing products from a file of unknown format.
+"""
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.product.models import Product
+
+
+@pytest.mark.django_db
+def test_import_products_from_csv(tmp_path) -> None:
+    """
+    Test importing products from a CSV file, with invalid rows.
+
+    :param tmp_path: Temporary directory fixture.
+    :return: None
+    """
+    source = tmp_path / "products.csv"
+    source.write_text(
+        "name,description,price\n"
+        "First product,First product description,650\n"
+        "ab,Second product description,650\n"
+        "Third product,,700.50\n"
+        "Fourth product,Fourth product description,499\n"
+        "Fifth product,Fifth product description,not a price\n"
+        "Sixth product,Sixth product description,800\n"
+    )
+    rejects = tmp_path / "rejects.ndjson"
+
+    call_command("import_products", str(source), batch_size=2, rejects=str(rejects))
+
+    products = Product.objects.order_by("id")
+    assert [product.name for product in products] == [
+        "First product",
+        "Third product",
+        "Sixth product",
+    ]
+    assert products[1].description is None
+    assert str(products[1].price) == "700.50"
+
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert [row["line"] for row in rejected] == [3, 5, 6]
+    assert rejected[0]["errors"] == {
+        "name": ["Field 'name' must have at least 3 characters"]
+    }
+    assert rejected[1]["errors"] == {"price": ["Field 'price' must be higher than 500"]}
+    assert rejected[2]["row"]["name"] == "Fifth product"
+    assert list(rejected[2]["errors"]) == ["price"]
+
+
+@pytest.mark.django_db
+def test_import_products_from_ndjson_with_workers(tmp_path) -> None:
+    """
+    Test importing products from an NDJSON file, validating the rows in worker processes.
+
+    :param tmp_path: Temporary directory fixture.
+    :return: None
+    """
+    lines = [
+        json.dumps(
+            {
+                "name": f"Product {index}",
+                "description": "Imported product description",
+                "price": 600 + index,
+            }
+        )
+        for index in range(25)
+    ]
+    lines.insert(10, "not json")
+    lines.insert(20, "")
+    source = tmp_path / "products.ndjson"
+    source.write_text("\n".join(lines))
+    rejects = tmp_path / "rejects.ndjson"
+
+    call_command(
+        "import_products",
+        str(source),
+        batch_size=4,
+        workers=2,
+        rejects=str(rejects),
+    )
+
+    assert Product.objects.count() == 25
+    assert list(Product.objects.order_by("id").values_list("name", flat=True)[:3]) == [
+        "Product 0",
+        "Product 1",
+        "Product 2",
+    ]
+
+    rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+    assert rejected == [
+        {
+            "line": 11,
+            "row": "not json",
+            "errors": {"non_field_errors": ["Expected a JSON object"]},
+        }
+    ]
+
+
+def test_import_products_with_unknown_format(tmp_path) -> None:
+    """
+    Test importing products from a file whose format cannot be guessed.
+
+    :param tmp_path: Temporary directory fixture.
+    :return: None
+    """
+    with pytest.raises(CommandError):
+        call_command("import_products", str(tmp_path / "products.xml"))
@@ -0,0 +1,161 @@
+"""
+This test module includes unit tests for the 'orjson' renderer and parser.
+
+The tests cover the following scenarios:
+1. Rendering data like DRF's JSONRenderer, including Decimals and aware datetimes, and floats
+   in exponent notation with the same value.
+2. Falling back to JSONRenderer for indented output, and when 'orjson' is missing.
+3. Parsing documents like DRF's JSONParser, including the documents 'orjson' rejects.
+4. Creating and listing products through the renderer and the parser.
+"""
+import datetime
+import io
+import uuid
+import zoneinfo
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+
+from apps.product import parsers, renderers
+from apps.product.parsers import ORJSONParser
+from apps.product.renderers import ORJSONRenderer
+
+DATA = {
+    "price": Decimal("650.50"),
+    "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=datetime.UTC),
+    "updated_at": datetime.datetime(
+        2024, 7, 2, 3, 4, 5, tzinfo=zoneinfo.ZoneInfo("America/Sao_Paulo")
+    ),
+    "naive": datetime.datetime(2024, 1, 2, 3, 4, 5),
+    "date": datetime.date(2024, 1, 2),
+    "time": datetime.time(3, 4, 5, 6),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Not found."),
+    "text": "Descrição \u2028 \u2029 ☃",
+    "numbers": [1, -2.5, 0.1, 2**63 - 1, True, None],
+    1: ("tuple", {"nested": []}),
+}
+
+
+def parse(parser, body, content_type="application/json"):
+    """
+    Parse a request body with the given parser.
+
+    :param parser: Parser under test.
+    :param body: Request body.
+    :param content_type: Content type of the request body.
+    :return: The parsed document.
+    """
+    encoding = content_type.partition("charset=")[2] or "utf-8"
+    return parser.parse(io.BytesIO(body), content_type, {"encoding": encoding})
+
+
+@pytest.mark.parametrize(
+    "data",
+    [DATA, [DATA, DATA], {"big": 2**70}, {"empty": {}}, "text", 1.5, None],
+)
+def test_render_like_json_renderer(data) -> None:
+    """
+    Test rendering data like DRF's JSONRenderer.
+
+    :param data: Data under test.
+    :return: None
+    """
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_render_floats_in_exponent_notation() -> None:
+    """
+    Test that floats written in exponent notation keep their value.
+
+    :return: None
+    """
+    data = [1e-7, 1.5e300, -2e-310]
+    assert json.loads(ORJSONRenderer().render(data)) == data
+
+
+def test_render_fallbacks(monkeypatch) -> None:
+    """
+    Test falling back to JSONRenderer for indented output, and when 'orjson' is missing.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    media_type = "application/json; indent=4"
+    assert ORJSONRenderer().render(DATA, media_type) == JSONRenderer().render(
+        DATA, media_type
+    )
+    assert b"\n    " in ORJSONRenderer().render(DATA, media_type)
+
+    monkeypatch.setattr(renderers, "orjson", None)
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (b'{"name": "Chair", "price": 650.5, "tags": ["a", "\\u00e9"]}', None),
+        (b'[{"id": 1}, {"id": 2, "price": "650.50"}]', None),
+        (b'{"big": 123456789012345678901234567890}', None),
+        ('{"name": "Cadeira é"}'.encode("latin-1"), "charset=latin-1"),
+    ],
+)
+def test_parse_like_json_parser(body, content_type, monkeypatch) -> None:
+    """
+    Test parsing documents like DRF's JSONParser.
+
+    :param body: Request body under test.
+    :param content_type: Charset parameter of the content type, if any.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    content_type = "; ".join(filter(None, ["application/json", content_type]))
+    expected = parse(JSONParser(), body, content_type)
+
+    assert parse(ORJSONParser(), body, content_type) == expected
+
+    monkeypatch.setattr(parsers, "orjson", None)
+    assert parse(ORJSONParser(), body, content_type) == expected
+
+
+@pytest.mark.parametrize("body", [b"", b"{", b'{"price": NaN}', b"\xff", b'{"a": 1} x'])
+def test_parse_errors(body) -> None:
+    """
+    Test rejecting the documents DRF's JSONParser rejects, with the same errors.
+
+    :param body: Request body under test.
+    :return: None
+    """
+    with pytest.raises(ParseError) as expected:
+        parse(JSONParser(), body)
+
+    with pytest.raises(ParseError) as error:
+        parse(ORJSONParser(), body)
+
+    assert str(error.value) == str(expected.value)
+
+
+@pytest.mark.django_db
+def test_products_through_orjson(authenticated_api_client) -> None:
+    """
+    Test creating and listing products through the renderer and the parser.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response = authenticated_api_client.post(
+        "/products/",
+        b'{"name": "Chair", "description": "Test product description", "price": 650.5}',
+        content_type="application/json",
+    )
+    assert response.status_code == 201
+    assert response.json()["price"] == "650.50"
+
+    response = authenticated_api_client.get("/products/")
+    assert response.content == JSONRenderer().render(response.data)
+    assert response.json()["results"][0]["created_at"].endswith("Z")
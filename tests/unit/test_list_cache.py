@@ -0,0 +1,125 @@
+"""
+This test module includes unit tests for the versioned cache of the product list API.
+
+The tests cover the following scenarios:
+1. Serving repeated list requests from the cache, with normalized query params.
+2. Invalidating the cached lists when a product is created, updated or deleted.
+3. Invalidating the cached lists when products are changed by the bulk endpoints.
+"""
+import pytest
+from conftest import get_product_queries
+
+from apps.product.cache import get_catalog_version
+from apps.product.models import Product
+
+
+@pytest.mark.django_db
+def test_list_served_from_cache(authenticated_api_client) -> None:
+    """
+    Test that repeated list requests are served without querying the products.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    Product.objects.create(
+        name="Test product", description="Test product description", price=650
+    )
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?page_size=5&name="
+    )
+    assert response.status_code == 200
+    assert len(queries) == 2
+
+    cached_response, queries = get_product_queries(
+        authenticated_api_client, "/products/?name=&page_size=5"
+    )
+    assert cached_response.status_code == 200
+    assert len(queries) == 0
+    assert cached_response.data == response.data
+
+    # Another page of the same filters reuses their cached count.
+    _, queries = get_product_queries(authenticated_api_client, "/products/?page_size=6")
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_list_cache_invalidated_by_product_changes(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that creating, updating and deleting a product invalidates the cached lists.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    payload = {
+        "name": "Test product",
+        "description": "Test product description",
+        "price": 650,
+    }
+    version = get_catalog_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_api_client.post("/products/", payload, format="json")
+    product_id = response.data["id"]
+    assert get_catalog_version() != version
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            f"/products/{product_id}", {"price": 700}, format="json"
+        )
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["results"][0]["price"] == "700.00"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(f"/products/{product_id}")
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_list_cache_invalidated_by_bulk_changes(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that the bulk endpoints invalidate the cached lists.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    payload = [
+        {
+            "name": "Test product",
+            "description": "Test product description",
+            "price": 650,
+        }
+    ]
+
+    authenticated_api_client.get("/products/")
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.post("/products/bulk", payload, format="json")
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.post(
+            "/products/reprice", {"factor": "2"}, format="json"
+        )
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["results"][0]["price"] == "1300.00"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete("/products/bulk?all=true")
+
+    response = authenticated_api_client.get("/products/")
+    assert response.data["count"] == 0
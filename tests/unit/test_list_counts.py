@@ -0,0 +1,199 @@
+"""
+This test module includes unit tests for the counts of the paginated product lists.
+
+The tests cover the following scenarios:
+1. Counting the products once per filter shape, whatever the page, ordering or fields.
+2. Estimating the count of wide price ranges from the price statistics summary, and correcting
+   it on the last page.
+3. Counting the products exactly when they are filtered by name or few enough.
+4. Estimating the number of products of a price range from the summary.
+5. Listing products with an estimated count through the async view.
+"""
+import json
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from conftest import create_priced_products, get_product_queries
+from django.test import AsyncClient
+
+from apps.product import counts
+from apps.product.models import Product
+from apps.product.stats import estimate_price_count
+
+
+@pytest.fixture
+def estimate_threshold(monkeypatch) -> int:
+    """
+    Fixture lowering the number of products above which the counts are estimated.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: int
+    """
+    monkeypatch.setattr(counts, "ESTIMATE_THRESHOLD", 5)
+    yield 5
+
+
+@pytest.mark.django_db
+def test_count_cached_per_filter_shape(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test counting the products once per filter shape.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    create_priced_products(12)
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?name=Product 1&page_size=2"
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 4
+    assert response.data["count_exact"] is True
+    assert len([sql for sql in queries if "COUNT" in sql]) == 1
+
+    for url in (
+        "/products/?name=Product 1&page=2&page_size=2",
+        "/products/?ordering=-price&fields=id&name=Product 1",
+    ):
+        response, queries = get_product_queries(authenticated_api_client, url)
+        assert response.status_code == 200
+        assert response.data["count"] == 4
+        assert [sql for sql in queries if "COUNT" in sql] == []
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?name=Product 2"
+    )
+    assert response.data["count"] == 4
+    assert len([sql for sql in queries if "COUNT" in sql]) == 1
+
+    # A product change moves the catalog version, and the products are counted again.
+    product = Product.objects.filter(name="Product 1").first()
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(f"/products/{product.id}")
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?name=Product 1&page_size=2"
+    )
+    assert response.data["count"] == 3
+    assert len([sql for sql in queries if "COUNT" in sql]) == 1
+
+
+@pytest.mark.django_db
+def test_estimated_count(authenticated_api_client, estimate_threshold) -> None:
+    """
+    Test estimating the count of a wide price range from the summary, and correcting it on the
+    last page.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param estimate_threshold: Lowered estimate threshold fixture.
+    :return: None
+    """
+    create_priced_products(12)
+    expected = Product.objects.filter(price__lte=1500).order_by("created_at", "id")
+    assert len(expected) == 10
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?max_price=1500&page_size=4"
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 11
+    assert response.data["count_exact"] is False
+    assert response.data["next"] is not None
+    assert [item["id"] for item in response.data["results"]] == [
+        product.id for product in expected[:4]
+    ]
+    assert len(queries) == 1
+    assert "COUNT" not in queries[0]
+
+    response = authenticated_api_client.get(
+        "/products/?max_price=1500&page_size=4&page=3"
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 10
+    assert response.data["count_exact"] is True
+    assert response.data["next"] is None
+    assert [item["id"] for item in response.data["results"]] == [
+        product.id for product in expected[8:]
+    ]
+
+    response = authenticated_api_client.get(
+        "/products/?max_price=1500&page_size=4&page=4"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_string, expected",
+    [("", 12), ("?min_price=500&max_price=999.99", 5), ("?name=Product 1", 4)],
+)
+def test_exact_count(
+    authenticated_api_client, estimate_threshold, query_string, expected
+) -> None:
+    """
+    Test counting the products exactly when the summary buckets match the price range, the
+    products are filtered by name, or they are few enough.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param estimate_threshold: Lowered estimate threshold fixture.
+    :param query_string: Query string of the filters under test.
+    :param expected: Expected number of products.
+    :return: None
+    """
+    create_priced_products(12)
+
+    response = authenticated_api_client.get(f"/products/{query_string}")
+    assert response.status_code == 200
+    assert response.data["count"] == expected
+    assert response.data["count_exact"] is True
+
+    response = authenticated_api_client.get("/products/?min_price=1500")
+    assert response.data["count"] == 2
+    assert response.data["count_exact"] is True
+
+
+@pytest.mark.django_db
+def test_estimate_price_count() -> None:
+    """
+    Test estimating the number of products of a price range from the summary.
+
+    :return: None
+    """
+    create_priced_products(12)
+
+    assert estimate_price_count() == (12, True)
+    assert estimate_price_count(Decimal("600"), Decimal("899.99")) == (3, True)
+    assert estimate_price_count(Decimal("2000")) == (0, True)
+    assert estimate_price_count(Decimal("1100")) == (6, False)
+    assert estimate_price_count(max_price=Decimal("1500")) == (11, False)
+
+
+@pytest.mark.django_db
+def test_async_estimated_count(authenticated_api_client, estimate_threshold) -> None:
+    """
+    Test listing products with an estimated count through the async view.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param estimate_threshold: Lowered estimate threshold fixture.
+    :return: None
+    """
+    create_priced_products(12)
+    authorization = authenticated_api_client._credentials["HTTP_AUTHORIZATION"]
+
+    for query_string in (
+        "?max_price=1500&page_size=4",
+        "?max_price=1500&page=3&page_size=4",
+    ):
+        response = async_to_sync(AsyncClient().get)(
+            f"/async/products/{query_string}", headers={"Authorization": authorization}
+        )
+        assert response.status_code == 200
+
+        expected = authenticated_api_client.get(f"/products/{query_string}")
+        assert response.json() == json.loads(
+            json.dumps(expected.data).replace("/products/", "/async/products/")
+        )
@@ -0,0 +1,111 @@
+"""
+This test module includes unit tests for the pagination modes of the product list API.
+
+The tests cover the following scenarios:
+1. Walking every page forwards and backwards with cursor pagination.
+2. Cursor pagination over an ordering with repeated values (price).
+3. Rejecting unsupported pagination modes, orderings and cursors.
+"""
+import pytest
+
+from apps.product.models import Product
+
+
+def create_products(prices) -> list:
+    """
+    Create one product per given price.
+
+    :param prices: Iterable of product prices.
+    :return: List of the created product ids.
+    """
+    return [
+        Product.objects.create(
+            name=f"Product {index}",
+            description="Test product description",
+            price=price,
+        ).id
+        for index, price in enumerate(prices)
+    ]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_every_page(authenticated_api_client) -> None:
+    """
+    Test walking the whole product list forwards and backwards with cursors.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    product_ids = create_products([650] * 12)
+
+    response = authenticated_api_client.get(
+        "/products/?pagination=cursor&page_size=5", format="json"
+    )
+    assert response.status_code == 200
+    assert "count" not in response.data
+    assert response.data["previous"] is None
+
+    seen_ids = [product["id"] for product in response.data["results"]]
+    while response.data["next"]:
+        response = authenticated_api_client.get(response.data["next"], format="json")
+        assert response.status_code == 200
+        seen_ids += [product["id"] for product in response.data["results"]]
+
+    assert seen_ids == product_ids
+
+    seen_ids = [product["id"] for product in response.data["results"]]
+    while response.data["previous"]:
+        response = authenticated_api_client.get(
+            response.data["previous"], format="json"
+        )
+        seen_ids = [product["id"] for product in response.data["results"]] + seen_ids
+
+    assert seen_ids == product_ids
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_by_price(authenticated_api_client) -> None:
+    """
+    Test cursor pagination ordered by descending price, with repeated prices.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_products([700, 900, 700, 800, 700, 900, 700])
+
+    response = authenticated_api_client.get(
+        "/products/?pagination=cursor&ordering=-price&page_size=2", format="json"
+    )
+    seen = [(product["price"], product["id"]) for product in response.data["results"]]
+    while response.data["next"]:
+        response = authenticated_api_client.get(response.data["next"], format="json")
+        seen += [
+            (product["price"], product["id"]) for product in response.data["results"]
+        ]
+
+    assert len(seen) == 7
+    assert seen == sorted(
+        seen, key=lambda item: (float(item[0]), item[1]), reverse=True
+    )
+
+
+@pytest.mark.django_db
+def test_pagination_with_invalid_values(authenticated_api_client) -> None:
+    """
+    Test the product list with an invalid pagination mode, ordering and cursor.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response = authenticated_api_client.get("/products/?pagination=offset")
+    assert response.status_code == 400
+    assert "pagination" in response.data
+
+    response = authenticated_api_client.get("/products/?ordering=description")
+    assert response.status_code == 400
+    assert "ordering" in response.data
+
+    response = authenticated_api_client.get(
+        "/products/?pagination=cursor&cursor=invalid"
+    )
+    assert response.status_code == 404
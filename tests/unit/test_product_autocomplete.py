@@ -0,0 +1,167 @@
+"""
+This test module includes unit tests for the product name autocomplete.
+
+The tests cover the following scenarios:
+1. Completing product names from a prefix, ignoring case and accents, without queries.
+2. Updating the index when products are created, renamed and deleted, dropping unused names.
+3. Updating the index when products are deleted by filter, without reloading it.
+4. Completing product names with invalid query params.
+5. Bounding the number of products tracked by the index.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.autocomplete import ProductNameIndex, product_names
+from apps.product.models import Product
+
+
+def create_products(*names) -> list:
+    """
+    Create products with the given names.
+
+    :param names: Names of the products.
+    :return: List of the created products.
+    """
+    return [
+        Product.objects.create(
+            name=name, description="Test product description", price=650
+        )
+        for name in names
+    ]
+
+
+@pytest.mark.django_db
+def test_autocomplete_product_names(authenticated_api_client) -> None:
+    """
+    Test completing product names from a prefix, from the loaded index.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_products("Chair", "Chaise longue", "chair", "Crème brûlée", "Table")
+
+    response = authenticated_api_client.get("/products/autocomplete?q=cha")
+    assert response.status_code == 200
+    assert response.data == {"results": ["Chair", "Chaise longue"]}
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get("/products/autocomplete?q=CREME B")
+    assert response.data == {"results": ["Crème brûlée"]}
+    assert not [
+        query
+        for query in context.captured_queries
+        if Product._meta.db_table in query["sql"]
+    ]
+
+    response = authenticated_api_client.get("/products/autocomplete?q=c&limit=2")
+    assert response.data == {"results": ["Chair", "Chaise longue"]}
+
+
+@pytest.mark.django_db
+def test_autocomplete_follows_product_changes(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that the index follows the created, renamed and deleted products, dropping the names
+    no product uses anymore.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    (chair,) = create_products("Chair")
+    assert product_names.search("ch", 10) == ["Chair"]
+
+    payload = {"name": "Chest", "description": "Test product description", "price": 650}
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.post("/products/", payload, format="json")
+        authenticated_api_client.post("/products/bulk", [payload], format="json")
+        authenticated_api_client.patch(
+            f"/products/{chair.id}", {"name": "Armchair"}, format="json"
+        )
+    assert product_names.search("ch", 10) == ["Chest"]
+    assert product_names.search("arm", 10) == ["Armchair"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(f"/products/{chair.id}")
+    assert product_names.search("arm", 10) == []
+
+    # An entry shared by several products shows the name of a product still using it.
+    with django_capture_on_commit_callbacks(execute=True):
+        first, second = create_products("Desk", "DESK")
+    assert product_names.search("de", 10) == ["Desk"]
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            f"/products/{first.id}", {"name": "Dresser"}, format="json"
+        )
+    assert product_names.search("de", 10) == ["DESK"]
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(
+            f"/products/{second.id}", {"name": "desk"}, format="json"
+        )
+    assert product_names.search("de", 10) == ["desk"]
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(f"/products/{second.id}")
+    assert product_names.search("d", 10) == ["Dresser"]
+
+
+@pytest.mark.django_db
+def test_autocomplete_updated_after_filter_delete(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that deleting products by filter removes them from the index, without reloading it.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    create_products("Chair", "Table")
+    assert product_names.search("", 10) == ["Chair", "Table"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete("/products/bulk?name=Chair")
+    assert not product_names._stale
+
+    with CaptureQueriesContext(connection) as context:
+        assert product_names.search("", 10) == ["Table"]
+    assert len(context.captured_queries) == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_string, field",
+    [("", "q"), ("q=", "q"), ("q=ch&limit=0", "limit"), ("q=ch&limit=51", "limit")],
+)
+def test_autocomplete_with_invalid_params(
+    authenticated_api_client, query_string, field
+) -> None:
+    """
+    Test completing product names with invalid query params.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param query_string: Query string under test.
+    :param field: Name of the invalid query param.
+    :return: None
+    """
+    response = authenticated_api_client.get(f"/products/autocomplete?{query_string}")
+    assert response.status_code == 400
+    assert list(response.data) == [field]
+
+
+@pytest.mark.django_db
+def test_autocomplete_index_bounded() -> None:
+    """
+    Test that the index tracks at most 'max_size' products.
+
+    :return: None
+    """
+    products = create_products("Chair", "Table", "Lamp")
+    index = ProductNameIndex(max_size=2)
+
+    assert len(index.search("", 10)) == 2
+    assert index._table.truncated
+
+    index.update([(products[0].pk + 100, "Sofa")])
+    assert index.search("s", 10) == []
@@ -0,0 +1,327 @@
+"""
+This test module includes unit tests for the bulk product API.
+
+The tests cover the following scenarios:
+1. Creating many products at once with valid data.
+2. Creating many products at once with some invalid items (partial success).
+3. Creating many products at once with only invalid items, or with a payload that is not a list.
+4. Partially updating many products at once with valid data.
+5. Partially updating many products at once with invalid items and unknown ids.
+6. Deleting every product matching the list filters, updating the price statistics with them
+only.
+7. Multiplying the price of every product matching the list filters, with valid and invalid
+factors, updating the price statistics with them only.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.models import Product, ProductPriceBucket
+
+
+def rebuilds_price_stats(queries) -> bool:
+    """
+    Tell whether the price statistics were rebuilt from every product by the given queries.
+
+    :param queries: Captured queries.
+    :return: True if the price buckets were all deleted, to be rebuilt.
+    """
+    return any(
+        query["sql"] == f'DELETE FROM "{ProductPriceBucket._meta.db_table}"'
+        for query in queries
+    )
+
+
+def build_payload(size) -> list:
+    """
+    Build a list of valid product payloads.
+
+    :param size: Number of products in the payload.
+    :return: List of product payloads.
+    """
+    return [
+        {
+            "name": f"Bulk product {index}",
+            "description": "Bulk product description",
+            "price": 650 + index,
+        }
+        for index in range(size)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_create_products(authenticated_api_client) -> None:
+    """
+    Test the bulk create product API with valid data.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    payload = build_payload(1200)
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.post(
+            "/products/bulk", data=payload, format="json"
+        )
+    assert response.status_code == 201
+    assert response.data["errors"] == []
+    assert len(response.data["created"]) == 1200
+    assert response.data["created"][0]["name"] == payload[0]["name"]
+    assert response.data["created"][0]["id"] is not None
+    assert response.data["created"][0]["created_at"] is not None
+
+    inserts = [
+        query for query in context.captured_queries if query["sql"].startswith("INSERT")
+    ]
+    assert len(inserts) < 10
+    assert Product.objects.count() == 1200
+
+
+@pytest.mark.django_db
+def test_bulk_create_products_with_invalid_items(authenticated_api_client) -> None:
+    """
+    Test the bulk create product API with some invalid items in the payload.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    payload = build_payload(5)
+    payload[1]["name"] = "ab"
+    payload[3]["price"] = 499
+    del payload[4]["price"]
+
+    response = authenticated_api_client.post(
+        "/products/bulk", data=payload, format="json"
+    )
+    assert response.status_code == 207
+    assert [product["name"] for product in response.data["created"]] == [
+        payload[0]["name"],
+        payload[2]["name"],
+    ]
+    assert [error["index"] for error in response.data["errors"]] == [1, 3, 4]
+    assert response.data["errors"][0]["errors"]["name"] == [
+        "Field 'name' must have at least 3 characters"
+    ]
+    assert response.data["errors"][1]["errors"]["price"] == [
+        "Field 'price' must be higher than 500"
+    ]
+    assert response.data["errors"][2]["errors"]["price"] == ["This field is required."]
+    assert Product.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_create_products_without_valid_items(authenticated_api_client) -> None:
+    """
+    Test the bulk create product API with only invalid items, and with a non-list payload.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response = authenticated_api_client.post(
+        "/products/bulk", data=[{"name": "ab"}], format="json"
+    )
+    assert response.status_code == 400
+    assert response.data["created"] == []
+    assert response.data["errors"][0]["index"] == 0
+
+    response = authenticated_api_client.post(
+        "/products/bulk", data=build_payload(1)[0], format="json"
+    )
+    assert response.status_code == 400
+    assert "non_field_errors" in response.data
+    assert Product.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_bulk_patch_products(authenticated_api_client) -> None:
+    """
+    Test the bulk partial update product API with valid data.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    products = Product.objects.bulk_create(
+        [Product(**product) for product in build_payload(3)]
+    )
+    original_updated_at = Product.objects.get(pk=products[2].id).updated_at
+
+    payload = [
+        {"id": products[0].id, "price": 900},
+        {"id": products[1].id, "name": "Renamed product", "price": 950},
+        {"id": products[2].id, "price": products[2].price},
+    ]
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.patch(
+            "/products/bulk", data=payload, format="json"
+        )
+    assert response.status_code == 200
+    assert response.data["not_found"] == []
+    assert response.data["errors"] == []
+    assert [product["price"] for product in response.data["updated"]] == [
+        "900.00",
+        "950.00",
+        f"{products[2].price}.00",
+    ]
+
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith(f'UPDATE "{Product._meta.db_table}"')
+    ]
+    assert len(updates) == 2
+    assert all('"description"' not in sql for sql in updates)
+
+    products = Product.objects.in_bulk([product.id for product in products])
+    first, second, third = products.values()
+    assert first.price == 900
+    assert second.name == "Renamed product"
+    assert first.updated_at > original_updated_at
+    assert third.updated_at == original_updated_at
+
+
+@pytest.mark.django_db
+def test_bulk_patch_products_with_invalid_items(authenticated_api_client) -> None:
+    """
+    Test the bulk partial update product API with invalid items and unknown ids.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    product = Product.objects.create(**build_payload(1)[0])
+
+    payload = [
+        {"id": product.id, "price": 800},
+        {"id": product.id + 100, "price": 800},
+        {"id": product.id, "description": "short"},
+        {"price": 800},
+    ]
+
+    response = authenticated_api_client.patch(
+        "/products/bulk", data=payload, format="json"
+    )
+    assert response.status_code == 207
+    assert response.data["updated"][0]["price"] == "800.00"
+    assert response.data["not_found"] == [product.id + 100]
+    assert [error["index"] for error in response.data["errors"]] == [2, 3]
+    assert response.data["errors"][1]["errors"]["id"] == ["This field is required."]
+
+    response = authenticated_api_client.patch(
+        "/products/bulk", data=[{"id": product.id + 100, "price": 800}], format="json"
+    )
+    assert response.status_code == 404
+    assert response.data["not_found"] == [product.id + 100]
+
+
+@pytest.mark.django_db
+def test_bulk_delete_products_by_filters(authenticated_api_client) -> None:
+    """
+    Test deleting every product matching the filters with a single statement, without
+    rebuilding the price statistics.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    Product.objects.bulk_create([Product(**product) for product in build_payload(10)])
+
+    response = authenticated_api_client.delete("/products/bulk", format="json")
+    assert response.status_code == 400
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.delete(
+            "/products/bulk?min_price=652&max_price=655", format="json"
+        )
+    assert response.status_code == 200
+    assert response.data["deleted"] == 4
+
+    deletes = [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith(f'DELETE FROM "{Product._meta.db_table}"')
+    ]
+    assert len(deletes) == 1
+    assert not rebuilds_price_stats(context.captured_queries)
+    assert Product.objects.count() == 6
+
+    Product.objects.bulk_create([Product(**product) for product in build_payload(250)])
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.delete("/products/bulk?all=true")
+    assert response.status_code == 200
+    assert response.data["deleted"] == 256
+
+    statements = [
+        query["sql"].split()[0]
+        for query in context.captured_queries
+        if f'FROM "{Product._meta.db_table}"' in query["sql"]
+    ]
+    assert statements == ["SELECT", "DELETE"]
+
+
+@pytest.mark.django_db
+def test_reprice_products_by_filters(authenticated_api_client) -> None:
+    """
+    Test multiplying the price of every product matching the filters, without reading the
+    products nor rebuilding the price statistics.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    products = Product.objects.bulk_create(
+        [Product(**product) for product in build_payload(4)]
+    )
+    Product.objects.filter(pk=products[0].id).update(price="650.55")
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.post(
+            "/products/reprice?max_price=651", data={"factor": "1.05"}, format="json"
+        )
+    assert response.status_code == 200
+    assert response.data["updated"] == 2
+
+    updates = [
+        query
+        for query in context.captured_queries
+        if query["sql"].startswith(f'UPDATE "{Product._meta.db_table}"')
+    ]
+    assert len(updates) == 1
+    assert not rebuilds_price_stats(context.captured_queries)
+    assert not [
+        query
+        for query in context.captured_queries
+        if f'"{Product._meta.db_table}"."name"' in query["sql"]
+    ]
+
+    prices = Product.objects.order_by("id").values_list("price", flat=True)
+    assert [str(price) for price in prices] == ["683.08", "683.55", "652.00", "653.00"]
+
+
+@pytest.mark.django_db
+def test_reprice_products_with_invalid_values(authenticated_api_client) -> None:
+    """
+    Test the price adjustment API with invalid factors and filters.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    Product.objects.bulk_create([Product(**product) for product in build_payload(2)])
+
+    response = authenticated_api_client.post(
+        "/products/reprice", data={"factor": "0"}, format="json"
+    )
+    assert response.status_code == 400
+    assert response.data["factor"] == ["Field 'factor' must be higher than 0"]
+
+    response = authenticated_api_client.post(
+        "/products/reprice", data={"factor": "0.5"}, format="json"
+    )
+    assert response.status_code == 400
+    assert response.data["factor"] == [
+        "Field 'factor' would take a price lower than 500"
+    ]
+
+    response = authenticated_api_client.post(
+        "/products/reprice?min_price=abc", data={"factor": "1.1"}, format="json"
+    )
+    assert response.status_code == 400
+    assert "min_price" in response.data
+    assert list(Product.objects.values_list("price", flat=True)) == [650, 651]
@@ -0,0 +1,255 @@
+"""
+This test module includes unit tests for the two-tier cache of single products.
+
+The tests cover the following scenarios:
+1. Serving a product from the local cache, then from the shared cache, without queries.
+2. Invalidating a cached product when it is updated, replaced, saved or deleted.
+3. Invalidating the cached products changed by filter-based mutations.
+4. Caching unknown products, and rejecting invalid ids, as not found.
+5. Reloading an expired product once, while concurrent requests get the stale product.
+6. Ignoring a product read before a change but stored after its invalidation, even once its
+version is evicted.
+7. Invalidating many products at once by changing the object generation.
+8. Evicting the least recently used and the expired entries of the local cache.
+"""
+import time
+
+import pytest
+from conftest import create_product, get_product_queries
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product import cache as product_cache
+from apps.product.cache import (
+    MAX_INVALIDATED_OBJECTS,
+    LocalCache,
+    get_cached_product,
+    get_object_cache_key,
+    get_object_generation,
+    get_object_version_key,
+    invalidate_products,
+    load_product_entry,
+    local_products,
+)
+from apps.product.models import Product
+
+
+@pytest.mark.django_db
+def test_product_served_from_cache(authenticated_api_client) -> None:
+    """
+    Test that repeated product requests are served without querying the products.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    product = create_product()
+    url = f"/products/{product.id}"
+
+    response, queries = get_product_queries(authenticated_api_client, url)
+    assert response.status_code == 200
+    assert len(queries) == 1
+
+    cached_response, queries = get_product_queries(authenticated_api_client, url)
+    assert len(queries) == 0
+    assert cached_response.data == response.data
+
+    local_products.clear()
+    cached_response, queries = get_product_queries(authenticated_api_client, url)
+    assert len(queries) == 0
+    assert cached_response.data == response.data
+
+
+@pytest.mark.django_db
+def test_product_cache_invalidated_by_changes(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that updating, replacing, saving and deleting a product invalidates its cached copy.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    product = create_product()
+    url = f"/products/{product.id}"
+    authenticated_api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.patch(url, {"price": 700}, format="json")
+    assert authenticated_api_client.get(url).data["price"] == "700.00"
+
+    payload = {
+        "name": "Replaced product",
+        "description": "Test product description",
+        "price": 800,
+    }
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.put(url, payload, format="json")
+    assert authenticated_api_client.get(url).data["name"] == "Replaced product"
+
+    product.refresh_from_db()
+    product.name = "Saved product"
+    with django_capture_on_commit_callbacks(execute=True):
+        product.save()
+    assert authenticated_api_client.get(url).data["name"] == "Saved product"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete(url)
+    assert authenticated_api_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_product_cache_invalidated_by_filter_changes(
+    authenticated_api_client, django_capture_on_commit_callbacks
+) -> None:
+    """
+    Test that filter-based mutations invalidate the cached products they change.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    product = create_product()
+    url = f"/products/{product.id}"
+    authenticated_api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.post(
+            "/products/reprice", {"factor": "2"}, format="json"
+        )
+    assert authenticated_api_client.get(url).data["price"] == "1300.00"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        authenticated_api_client.delete("/products/bulk?all=true")
+    assert authenticated_api_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_unknown_product_cached(authenticated_api_client) -> None:
+    """
+    Test that unknown products are cached as not found, and invalid ids rejected as not found.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response, queries = get_product_queries(authenticated_api_client, "/products/0")
+    assert response.status_code == 404
+    assert len(queries) == 1
+
+    response, queries = get_product_queries(authenticated_api_client, "/products/0")
+    assert response.status_code == 404
+    assert len(queries) == 0
+
+    response = authenticated_api_client.get("/products/unknown")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_expired_product_reloaded_once(products_cache, monkeypatch) -> None:
+    """
+    Test that an expired product is served stale while another request holds the reload lock.
+
+    :param products_cache: Fixture providing the cleared 'products' cache.
+    :param monkeypatch: Pytest fixture patching the cache timeouts.
+    :return: None
+    """
+    product = create_product()
+    key = get_object_cache_key(product.pk)
+
+    get_cached_product(str(product.pk))
+    entry = products_cache.get(key)
+    products_cache.set(key, {**entry, "fresh_until": time.time() - 1})
+    local_products.clear()
+
+    products_cache.add(f"{key}:lock", True)
+    with CaptureQueriesContext(connection) as context:
+        assert get_cached_product(str(product.pk)).pk == product.pk
+    assert not context.captured_queries
+
+    products_cache.delete(key)
+    local_products.clear()
+    monkeypatch.setattr(product_cache, "OBJECT_LOCK_WAIT", 0.1)
+    with CaptureQueriesContext(connection) as context:
+        assert get_cached_product(str(product.pk)).pk == product.pk
+    assert len(context.captured_queries) == 1
+    assert products_cache.get(key) is None
+
+    products_cache.delete(f"{key}:lock")
+    local_products.clear()
+    get_cached_product(str(product.pk))
+    assert products_cache.get(key)["fresh_until"] > time.time()
+
+
+@pytest.mark.django_db
+def test_stale_product_stored_after_invalidation(products_cache, monkeypatch) -> None:
+    """
+    Test that a product read before a change, but stored after the change was invalidated, is
+    not served as a fresh entry.
+
+    :param products_cache: Fixture providing the cleared 'products' cache.
+    :param monkeypatch: Pytest fixture delaying the invalidation into the product load.
+    :return: None
+    """
+    product = create_product()
+
+    def load_then_change(pk, generation, version):
+        entry = load_product_entry(pk, generation, version)
+        Product.objects.filter(pk=pk).update(price=900)
+        invalidate_products([pk])
+        return entry
+
+    with monkeypatch.context() as context:
+        context.setattr(product_cache, "load_product_entry", load_then_change)
+        assert get_cached_product(str(product.pk)).price == 650
+
+    entry = products_cache.get(get_object_cache_key(product.pk))
+    assert entry["product"].price == 650
+    local_products.clear()
+    assert get_cached_product(str(product.pk)).price == 900
+
+    # An evicted version is replaced by a new one, which the stale entry does not match either.
+    products_cache.set(get_object_cache_key(product.pk), entry)
+    products_cache.delete(get_object_version_key(product.pk))
+    local_products.clear()
+    assert get_cached_product(str(product.pk)).price == 900
+
+
+@pytest.mark.django_db
+def test_many_products_invalidated_at_once(products_cache) -> None:
+    """
+    Test that invalidating more than MAX_INVALIDATED_OBJECTS products changes the object
+    generation, rather than the version of every product.
+
+    :param products_cache: Fixture providing the cleared 'products' cache.
+    :return: None
+    """
+    product = create_product()
+    get_cached_product(str(product.pk))
+    generation = get_object_generation()
+
+    pks = range(product.pk, product.pk + MAX_INVALIDATED_OBJECTS + 1)
+    invalidate_products(list(pks))
+    assert get_object_generation() != generation
+    assert products_cache.get(get_object_version_key(product.pk + 1)) is None
+
+
+def test_local_cache_eviction(monkeypatch) -> None:
+    """
+    Test that the local cache evicts its least recently used and its expired entries.
+
+    :param monkeypatch: Pytest fixture patching the clock.
+    :return: None
+    """
+    local_cache = LocalCache(max_size=2, timeout=5)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    assert local_cache.get("a") == 1
+
+    local_cache.set("c", 3)
+    assert local_cache.get("b") is None
+    assert local_cache.get("a") == 1
+    assert local_cache.get("c") == 3
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert local_cache.get("a") is None
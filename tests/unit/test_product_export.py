@@ -0,0 +1,162 @@
+"""
+This test module includes unit tests for the product export API.
+
+The tests cover the following scenarios:
+1. Exporting products as NDJSON, with the same representation as the product API.
+2. Exporting filtered products as CSV.
+3. Exporting products with an invalid output format.
+4. Streaming the export in index order, without sorting the whole table first.
+5. Streaming the export chunk by chunk under ASGI, without encoding every product first.
+"""
+import csv
+import io
+import json
+from functools import partial
+
+import pytest
+from asgiref.sync import async_to_sync
+from conftest import create_products, get_table_scans
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from apps.product import exports
+from apps.product.models import Product
+
+# Products whose descriptions must be quoted in CSV, listed by descending price.
+create_quoted_products = partial(
+    create_products,
+    description="Test product description, with a comma",
+    price=lambda index: 900 - index,
+)
+
+
+@pytest.mark.django_db
+def test_export_products_as_ndjson(authenticated_api_client) -> None:
+    """
+    Test exporting every product as NDJSON.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    products = create_quoted_products(3)
+
+    response = authenticated_api_client.get("/products/export")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response.streaming
+
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    exported = [json.loads(line) for line in lines]
+    assert [product["id"] for product in exported] == [
+        product.id for product in reversed(products)
+    ]
+
+    detail = authenticated_api_client.get(f"/products/{products[0].id}")
+    assert exported[-1] == json.loads(json.dumps(detail.data))
+
+
+@pytest.mark.django_db
+def test_export_filtered_products_as_csv(authenticated_api_client) -> None:
+    """
+    Test exporting the products matching the filters as CSV.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_quoted_products(5)
+
+    response = authenticated_api_client.get(
+        "/products/export?output=csv&min_price=897&max_price=898"
+    )
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/csv"
+
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [row["name"] for row in rows] == ["Product 3", "Product 2"]
+    assert rows[0]["price"] == "897.00"
+    assert rows[0]["description"] == "Test product description, with a comma"
+
+
+@pytest.mark.django_db
+def test_export_products_with_invalid_output(authenticated_api_client) -> None:
+    """
+    Test exporting products with an unsupported output format.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response = authenticated_api_client.get("/products/export?output=xml")
+    assert response.status_code == 400
+    assert "output" in response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query_string", ["", "?min_price=897", "?name=Product 1"])
+def test_export_products_without_sorting(
+    authenticated_api_client, query_string
+) -> None:
+    """
+    Test that the export query follows an index, so that rows are streamed as they are read.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param query_string: Query string of the filter combination under test.
+    :return: None
+    """
+    create_quoted_products(3)
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(f"/products/export{query_string}")
+        b"".join(response.streaming_content)
+
+    sql = next(
+        query["sql"]
+        for query in context.captured_queries
+        if Product._meta.db_table in query["sql"]
+    )
+    assert get_table_scans(sql) == [], sql
+
+
+@pytest.mark.django_db
+def test_export_products_through_asgi(authenticated_api_client, monkeypatch) -> None:
+    """
+    Test that the export is streamed chunk by chunk under ASGI, each chunk being encoded as it
+    is sent rather than the whole export being encoded first.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    create_quoted_products(7)
+    monkeypatch.setattr(exports, "CHUNK_SIZE", 2)
+
+    encoded = []
+    iter_ndjson = exports.iter_ndjson
+
+    def counting_iter_ndjson(queryset):
+        for line in iter_ndjson(queryset):
+            encoded.append(line)
+            yield line
+
+    monkeypatch.setitem(exports.OUTPUT_ENCODERS, "ndjson", counting_iter_ndjson)
+    authorization = authenticated_api_client._credentials["HTTP_AUTHORIZATION"]
+
+    async def export():
+        response = await AsyncClient().get(
+            "/products/export", headers={"Authorization": authorization}
+        )
+        assert response.status_code == 200
+        assert response.is_async
+
+        chunks = []
+        async for chunk in response.streaming_content:
+            chunks.append((chunk, len(encoded)))
+        return chunks
+
+    chunks = async_to_sync(export)()
+    assert [len(chunk.splitlines()) for chunk, _ in chunks] == [2, 2, 2, 1]
+    # Each chunk is sent once its own lines are encoded, before the next ones are.
+    assert [count for _, count in chunks] == [2, 4, 6, 7]
+    lines = b"".join(chunk for chunk, _ in chunks).decode().splitlines()
+    assert len({json.loads(line)["id"] for line in lines}) == 7
@@ -0,0 +1,150 @@
+"""
+This test module includes unit tests for the full-text search of products.
+
+The tests cover the following scenarios:
+1. Searching products by words, ranked by relevance and combined with the price range.
+2. Keeping the full-text index in sync with updated, bulk updated and deleted products.
+3. Searching with a text holding no word, or FTS5 query syntax.
+4. Rebuilding the full-text index with the 'rebuild_search_index' management command.
+"""
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.product.models import Product
+from apps.product.search import FTS_TABLE
+
+
+def create_products() -> list:
+    """
+    Create products with overlapping words in their names and descriptions.
+
+    :return: List of the created products.
+    """
+    return [
+        Product.objects.create(name=name, description=description, price=price)
+        for name, description, price in (
+            ("Blue table", "Goes well with the wooden chair", 700),
+            ("Wooden chair", "A solid oak chair", 650),
+            ("Lamp", None, 900),
+            ("Garden chair", "Plastic outdoor chair", 550),
+        )
+    ]
+
+
+def search_names(client, query_string) -> list:
+    """
+    Search products and return the names of the results.
+
+    :param client: API client used for the request.
+    :param query_string: Query string of the search.
+    :return: List of the names of the found products.
+    """
+    response = client.get(f"/products/search?{query_string}")
+    assert response.status_code == 200
+    return [product["name"] for product in response.data["results"]]
+
+
+@pytest.mark.django_db
+def test_search_products(authenticated_api_client) -> None:
+    """
+    Test searching products by words, ranked by relevance, with filters and pagination.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_products()
+
+    assert search_names(authenticated_api_client, "q=wooden chair") == [
+        "Wooden chair",
+        "Blue table",
+    ]
+    names = search_names(authenticated_api_client, "q=cha")
+    assert sorted(names[:2]) == ["Garden chair", "Wooden chair"]
+    assert names[2] == "Blue table"
+    assert search_names(authenticated_api_client, "q=OAK") == ["Wooden chair"]
+    assert sorted(search_names(authenticated_api_client, "q=chair&max_price=660")) == [
+        "Garden chair",
+        "Wooden chair",
+    ]
+
+    response = authenticated_api_client.get("/products/search?q=chair&page_size=2")
+    assert response.data["count"] == 3
+    assert response.data["next"]
+    assert "rank" not in response.data["results"][0]
+
+
+@pytest.mark.django_db
+def test_search_index_in_sync(authenticated_api_client) -> None:
+    """
+    Test that the full-text index follows the updated, bulk updated and deleted products.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    table, chair, lamp, garden_chair = create_products()
+
+    authenticated_api_client.patch(
+        f"/products/{lamp.id}", {"description": "Reading lamp"}, format="json"
+    )
+    assert search_names(authenticated_api_client, "q=reading") == ["Lamp"]
+
+    authenticated_api_client.patch(
+        "/products/bulk", [{"id": table.id, "name": "Red sofa"}], format="json"
+    )
+    assert search_names(authenticated_api_client, "q=sofa") == ["Red sofa"]
+    assert search_names(authenticated_api_client, "q=table") == []
+
+    authenticated_api_client.delete(f"/products/{chair.id}")
+    authenticated_api_client.delete("/products/bulk?max_price=600")
+    assert search_names(authenticated_api_client, "q=chair") == ["Red sofa"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("text", ["", "  ", "!!!"])
+def test_search_without_words(authenticated_api_client, text) -> None:
+    """
+    Test searching with a text holding no word.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param text: Search text under test.
+    :return: None
+    """
+    response = authenticated_api_client.get("/products/search", {"q": text})
+    assert response.status_code == 400
+    assert response.data == {"q": ["Field 'q' must hold at least one word"]}
+
+
+@pytest.mark.django_db
+def test_search_with_query_syntax(authenticated_api_client) -> None:
+    """
+    Test that FTS5 query syntax in the text is searched as plain words.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_products()
+
+    response = authenticated_api_client.get(
+        "/products/search", {"q": 'name:"lamp" OR (NEAR'}
+    )
+    assert response.status_code == 200
+    assert response.data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(authenticated_api_client) -> None:
+    """
+    Test rebuilding the full-text index after it was emptied.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_products()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('delete-all')")
+    assert search_names(authenticated_api_client, "q=lamp") == []
+
+    call_command("rebuild_search_index")
+    assert search_names(authenticated_api_client, "q=lamp") == ["Lamp"]
@@ -0,0 +1,234 @@
+"""
+This test module includes unit tests for the product price statistics API.
+
+The tests cover the following scenarios:
+1. Keeping the statistics in sync with the products through single and bulk changes.
+2. Filtering the statistics by price range and name, without scanning the products table.
+3. Summarizing the prices with and without NumPy, and rebuilding the summary.
+4. Rolling the summary back along with the products.
+5. Requesting the statistics with invalid filters.
+"""
+import io
+from decimal import Decimal
+
+import pytest
+from conftest import create_priced_products, get_table_scans
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.product import stats
+from apps.product.models import Product, ProductPriceBucket
+from apps.product.stats import get_bucket, summarize, to_cents
+
+
+def expected_stats(products) -> dict:
+    """
+    Compute the statistics of the given products, as returned by the API.
+
+    :param products: Product queryset.
+    :return: The expected statistics.
+    """
+    prices = [to_cents(price) for price in products.values_list("price", flat=True)]
+    if not prices:
+        return {
+            "count": 0,
+            "min_price": None,
+            "max_price": None,
+            "avg_price": None,
+            "histogram": [],
+        }
+
+    counts = {}
+    for price in prices:
+        counts[get_bucket(price)] = counts.get(get_bucket(price), 0) + 1
+
+    return {
+        "count": len(prices),
+        "min_price": f"{Decimal(min(prices)) / 100:.2f}",
+        "max_price": f"{Decimal(max(prices)) / 100:.2f}",
+        "avg_price": f"{Decimal(sum(prices)) / len(prices) / 100:.2f}",
+        "histogram": [counts[bucket] for bucket in sorted(counts)],
+    }
+
+
+def get_stats(client, query_string="") -> dict:
+    """
+    Request the statistics, with the histogram reduced to its counts.
+
+    :param client: Authenticated API client.
+    :param query_string: Query string of the filters.
+    :return: The statistics.
+    """
+    response = client.get(f"/products/stats{query_string}")
+    assert response.status_code == 200
+    data = response.json()
+    data["histogram"] = [bucket["count"] for bucket in data["histogram"]]
+    return data
+
+
+@pytest.mark.django_db
+def test_stats_follow_product_changes(authenticated_api_client) -> None:
+    """
+    Test keeping the statistics in sync with the products through single and bulk changes.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    client = authenticated_api_client
+    assert get_stats(client) == expected_stats(Product.objects.all())
+
+    products = create_priced_products(12)
+    response = client.get("/products/stats")
+    assert response.json()["histogram"][0] == {
+        "lower": "500.00",
+        "upper": "600.00",
+        "count": 1,
+    }
+    assert get_stats(client) == expected_stats(Product.objects.all())
+
+    changes = [
+        lambda: client.patch(f"/products/{products[0].id}", {"price": 5000.5}),
+        lambda: client.patch(f"/products/{products[1].id}", {"name": "Renamed"}),
+        lambda: client.delete(f"/products/{products[11].id}"),
+        lambda: client.delete(f"/products/{products[10].id}"),
+        lambda: client.post(
+            "/products/bulk",
+            [{"name": "Chair", "description": "Bulk description", "price": 777}] * 3,
+            format="json",
+        ),
+        lambda: client.patch(
+            "/products/bulk",
+            [{"id": products[2].id, "price": 1}, {"id": products[3].id, "price": 999}],
+            format="json",
+        ),
+        lambda: client.post("/products/reprice?min_price=900", {"factor": "1.1"}),
+        lambda: client.delete("/products/bulk?name=Product 2"),
+    ]
+    for change in changes:
+        assert change().status_code < 300
+        assert get_stats(client) == expected_stats(Product.objects.all())
+
+    # Queryset updates send no signal: the summary is rebuilt by the command.
+    Product.objects.filter(pk=products[4].pk).update(price=12345)
+    call_command("rebuild_price_stats", stdout=io.StringIO())
+    assert get_stats(client) == expected_stats(Product.objects.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        "?min_price=600",
+        "?max_price=1000",
+        "?min_price=647.25&max_price=1035.25",
+        "?min_price=700&max_price=799.99",
+        "?min_price=2000&max_price=3000",
+        "?name=Product 1",
+        "?name=Product 1&min_price=700&max_price=1100",
+        "?name=Unknown",
+    ],
+)
+def test_filtered_stats(authenticated_api_client, query_string) -> None:
+    """
+    Test filtering the statistics by price range and name, without scanning the products table.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param query_string: Query string of the filters under test.
+    :return: None
+    """
+    create_priced_products(12)
+    products = Product.objects.all()
+    for param in query_string.lstrip("?").split("&"):
+        field, value = param.split("=")
+        lookup = {"min_price": "price__gte", "max_price": "price__lte"}.get(
+            field, field
+        )
+        products = products.filter(**{lookup: value})
+
+    with CaptureQueriesContext(connection) as context:
+        assert get_stats(authenticated_api_client, query_string) == expected_stats(
+            products
+        )
+
+    for query in context.captured_queries:
+        if f'"{Product._meta.db_table}"' in query["sql"]:
+            assert get_table_scans(query["sql"]) == [], query["sql"]
+
+
+@pytest.mark.django_db
+def test_unfiltered_stats_read_the_summary(authenticated_api_client) -> None:
+    """
+    Test that the unfiltered statistics only read the summary.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_priced_products(5)
+
+    with CaptureQueriesContext(connection) as context:
+        get_stats(authenticated_api_client)
+
+    assert not [
+        query
+        for query in context.captured_queries
+        if f'"{Product._meta.db_table}"' in query["sql"]
+    ]
+
+
+def test_summarize_with_and_without_numpy(monkeypatch) -> None:
+    """
+    Test summarizing prices with NumPy and with the pure Python fallback.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    prices = [0, 1, 99, 100, 199, 55025, 55025, 60000, -500, 9999999999, 10**9, 7]
+    expected = {
+        0: (2, -500, -500, 0),
+        1: (1, 1, 1, 1),
+        7: (1, 7, 7, 7),
+        18: (1, 99, 99, 99),
+        19: (2, 299, 100, 199),
+        41: (2, 110050, 55025, 55025),
+        42: (1, 60000, 60000, 60000),
+        82: (1, 10**9, 10**9, 10**9),
+        90: (1, 9999999999, 9999999999, 9999999999),
+    }
+    assert summarize(iter(prices)) == expected
+    assert summarize(iter([])) == {}
+
+    monkeypatch.setattr(stats, "numpy", None)
+    assert summarize(iter(prices)) == expected
+
+
+@pytest.mark.django_db
+def test_summary_rolled_back_with_products() -> None:
+    """
+    Test rolling the summary back along with the products.
+
+    :return: None
+    """
+    create_priced_products(3)
+    summary = list(ProductPriceBucket.objects.order_by("bucket").values())
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            Product.objects.create(name="Chair", description="Description", price=9000)
+            Product.objects.all().first().delete()
+            raise RuntimeError
+
+    assert list(ProductPriceBucket.objects.order_by("bucket").values()) == summary
+
+
+@pytest.mark.django_db
+def test_stats_invalid_filters(authenticated_api_client) -> None:
+    """
+    Test requesting the statistics with invalid filters.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    response = authenticated_api_client.get("/products/stats?min_price=cheap")
+    assert response.status_code == 400
+    assert "min_price" in response.json()
@@ -0,0 +1,138 @@
+"""
+This test module checks that every query run by the product list API is backed by an index.
+
+Each list and filter combination is requested through the API while its SQL queries are
+captured. Every captured query is then run through SQLite's 'EXPLAIN QUERY PLAN', and the test
+fails if any step of the plan falls back to a full scan of the products table. The pages must
+also be read in order from an index, without a temporary B-tree sort or a full index scan,
+unless the filters and the ordering need different indexes.
+
+The pages of the default 'created_at' orderings, without filters, must be read from the
+'(created_at, id)' index, for the first and the next cursor pages alike.
+"""
+from urllib.parse import urlsplit
+
+import pytest
+from conftest import get_plan, get_table_scans
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.product.models import Product
+
+CREATED_AT_INDEX = "product_created_at_id_idx"
+PRICE_INDEX = "product_price_idx"
+NAME_CREATED_AT_INDEX = "product_name_created_at_id_idx"
+NAME_PRICE_INDEX = "product_name_price_idx"
+
+# Query strings and the index their pages must be read in order from, or None when the price
+# range and the 'created_at' ordering need different indexes: the pages must then search the
+# products within the range, and only sort those.
+LIST_QUERY_STRINGS = [
+    ("", CREATED_AT_INDEX),
+    ("?min_price=600", None),
+    ("?max_price=800", None),
+    ("?min_price=600&max_price=800", None),
+    ("?name=Product 1", NAME_CREATED_AT_INDEX),
+    ("?name=Product 1&ordering=-price", NAME_PRICE_INDEX),
+    ("?name=Product 1&min_price=600", None),
+    ("?name=Product 1&min_price=600&max_price=800", None),
+    ("?name=Product 1&min_price=600&ordering=price", NAME_PRICE_INDEX),
+    ("?ordering=price", PRICE_INDEX),
+    ("?ordering=-price&min_price=600&max_price=800", PRICE_INDEX),
+    ("?ordering=-created_at", CREATED_AT_INDEX),
+    ("?pagination=cursor", CREATED_AT_INDEX),
+    ("?pagination=cursor&min_price=600&max_price=800", None),
+    ("?pagination=cursor&name=Product 1", NAME_CREATED_AT_INDEX),
+    ("?pagination=cursor&ordering=price", PRICE_INDEX),
+    ("?pagination=cursor&ordering=-price&min_price=600", PRICE_INDEX),
+]
+
+
+def create_products() -> None:
+    """
+    Create products whose names and prices repeat.
+
+    :return: None
+    """
+    for index in range(10):
+        Product.objects.create(
+            name=f"Product {index % 3}",
+            description="Test product description",
+            price=550 + index * 50,
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query_string,ordering_index", LIST_QUERY_STRINGS)
+def test_product_list_queries_use_indexes(
+    authenticated_api_client, query_string, ordering_index
+) -> None:
+    """
+    Test that the product list queries never fall back to a full scan, and that their pages are
+    read in order from an index whenever one can serve both the filters and the ordering.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param query_string: Query string of the list and filter combination under test.
+    :param ordering_index: Name of the index the pages must be read in order from, or None.
+    :return: None
+    """
+    create_products()
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_api_client.get(f"/products/{query_string}")
+    assert response.status_code == 200
+
+    product_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'"{Product._meta.db_table}"' in query["sql"]
+    ]
+    assert product_queries
+
+    for sql in product_queries:
+        assert get_table_scans(sql, ordering_index) == [], sql
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query_string",
+    [
+        "?page_size=3",
+        "?ordering=-created_at&page=3&page_size=3",
+        "?pagination=cursor&page_size=3",
+        "?pagination=cursor&ordering=-created_at&page_size=3",
+    ],
+)
+def test_default_ordering_uses_index(authenticated_api_client, query_string) -> None:
+    """
+    Test that the pages of the default orderings are read in order from the '(created_at, id)'
+    index, for the first and the next cursor pages.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param query_string: Query string of the ordering and pagination under test.
+    :return: None
+    """
+    create_products()
+
+    url = f"/products/{query_string}"
+    for _ in range(2):
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_api_client.get(url)
+        assert response.status_code == 200
+
+        page_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if f'"{Product._meta.db_table}"' in query["sql"]
+            and "ORDER BY" in query["sql"]
+        ]
+        assert page_queries
+        for sql in page_queries:
+            plan = get_plan(sql)
+            assert "USE TEMP B-TREE FOR ORDER BY" not in plan, sql
+            assert any(CREATED_AT_INDEX in step for step in plan), sql
+
+        if not response.data.get("next") or "cursor" not in query_string:
+            break
+        url = "/products/?" + urlsplit(response.data["next"]).query
@@ -0,0 +1,322 @@
+"""
+This test module includes unit tests for the routing of the product reads to read replicas.
+
+The replicas are stood in for by copies of the test database, made on demand, so that the reads
+served by a replica miss the products created since its last copy.
+
+The tests cover the following scenarios:
+1. Reading the products of the GET requests from a replica, through the sync and async views.
+2. Sending the writes, and the reads of a user following their changes, to the primary, while
+the other users read from the replica without caching it.
+3. Sending the reads outside of any request, and of the other applications, to the primary.
+4. Choosing the replicas in turn or by least lag, and leaving out the lagging ones.
+5. Forbidding the migrations of the replicas.
+"""
+import sqlite3
+import time
+from contextlib import closing
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.product import routers
+from apps.product.cache import CATALOG_VERSION_KEY
+from apps.product.models import Product
+from apps.product.routers import (
+    ReplicaRouter,
+    current_request,
+    get_write_key,
+    select_replica,
+)
+
+REPLICAS = ("replica", "first", "second", "third")
+LAG_QUERIES = {"first": "SELECT 3", "second": "SELECT 1", "third": None}
+DATABASES = [DEFAULT_DB_ALIAS, *REPLICAS]
+
+
+def create_product(name="Chair") -> Product:
+    """
+    Create a product in the primary database.
+
+    :param name: Name of the product.
+    :return: The created product.
+    """
+    return Product.objects.create(
+        name=name, description="Test product description", price=650
+    )
+
+
+def create_client(username) -> APIClient:
+    """
+    Create a user and an API client authenticated as them.
+
+    :param username: Name of the user.
+    :return: The authenticated API client.
+    """
+    user = User.objects.create_user(username=username, password="testpassword")
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+    )
+    return client
+
+
+def age_catalog(products_cache) -> None:
+    """
+    Make the last change of the products older than the maximum lag of the replicas.
+
+    :param products_cache: Products cache fixture.
+    :return: None
+    """
+    products_cache.set(CATALOG_VERSION_KEY, time.time_ns() - 60 * 10**9, timeout=None)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica_databases(django_db_setup, tmp_path_factory):
+    """
+    Fixture declaring the replica databases, before the tests are allowed to use them: the
+    'replica' file, copied from the test database by the 'replica' fixture, and in-memory
+    databases answering the lag queries.
+
+    :param django_db_setup: Pytest-django test database fixture.
+    :param tmp_path_factory: Pytest temporary directory factory fixture.
+    :return: The path of the 'replica' database.
+    """
+    path = tmp_path_factory.mktemp("replicas") / "replica.sqlite3"
+    base = {**connection.settings_dict, "OPTIONS": {}}
+    connections.settings["replica"] = {
+        **base,
+        "NAME": str(path),
+        "PRAGMAS": {**base["PRAGMAS"], "journal_mode": None, "query_only": 1},
+    }
+    for alias, lag_query in LAG_QUERIES.items():
+        connections.settings[alias] = {
+            **base,
+            "NAME": ":memory:",
+            "LAG_QUERY": lag_query,
+        }
+
+    yield path
+
+    for alias in REPLICAS:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.fixture
+def replica(settings, products_cache, replica_databases):
+    """
+    Fixture routing the product reads to the 'replica' database, made of a copy of the test
+    database by the returned function. The copy is made once per test, before reading the
+    replica, whose reads hold a transaction until the end of the test.
+
+    :param settings: Pytest-django settings fixture.
+    :param products_cache: Products cache fixture.
+    :param replica_databases: Replica databases fixture.
+    :return: Function copying the test database to the replica.
+    """
+
+    def copy():
+        # The dump is read through the test connection, which sees its own transaction. The
+        # full-text index, whose virtual tables do not survive a dump, is left out.
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE sql LIKE 'CREATE VIRTUAL TABLE%'"
+            )
+            virtual_tables = [name for name, in cursor.fetchall()]
+        dump = "\n".join(
+            statement
+            for statement in connection.connection.iterdump()
+            if not any(name in statement for name in virtual_tables)
+        )
+        with closing(sqlite3.connect(replica_databases)) as target:
+            tables = target.execute(
+                "SELECT name FROM sqlite_master"
+                " WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ).fetchall()
+            target.executescript(
+                "".join(f'DROP TABLE IF EXISTS "{name}";' for name, in tables) + dump
+            )
+
+    settings.READ_REPLICAS = ["replica"]
+    age_catalog(products_cache)
+    return copy
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_get_reads_from_replica(authenticated_api_client, replica) -> None:
+    """
+    Test reading the products of the GET requests from a replica.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param replica: Replica fixture.
+    :return: None
+    """
+    chair = create_product()
+    replica()
+    table = create_product("Table")
+
+    response = authenticated_api_client.get("/products/")
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    assert authenticated_api_client.get(f"/products/{chair.id}").status_code == 200
+    assert authenticated_api_client.get(f"/products/{table.id}").status_code == 404
+
+    authorization = authenticated_api_client._credentials["HTTP_AUTHORIZATION"]
+    response = async_to_sync(AsyncClient().get)(
+        "/async/products/?page_size=5", headers={"Authorization": authorization}
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_writes_and_recent_changes_use_primary(
+    authenticated_api_client,
+    replica,
+    products_cache,
+    django_capture_on_commit_callbacks,
+) -> None:
+    """
+    Test sending the writes, and the reads of a user following their changes, to the primary,
+    while the other users keep reading from the replica without caching its products.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param replica: Replica fixture.
+    :param products_cache: Products cache fixture.
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    product = create_product()
+    replica()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = authenticated_api_client.patch(
+            f"/products/{product.id}", {"price": 700}, format="json"
+        )
+    assert response.status_code == 200
+    assert Product.objects.using(DEFAULT_DB_ALIAS).get().price == 700
+
+    # The user just changed the products: their change is read back from the primary.
+    response = authenticated_api_client.get("/products/")
+    assert response.data["results"][0]["price"] == "700.00"
+
+    # The other users read from the replica, whose products are not cached yet.
+    other_client = create_client("otheruser")
+    for _ in range(2):
+        with CaptureQueriesContext(connections["replica"]) as context:
+            response = other_client.get("/products/?page_size=5")
+            assert other_client.get(f"/products/{product.id}").data["price"] == (
+                "650.00"
+            )
+        assert response.data["results"][0]["price"] == "650.00"
+        # The page and the product are read again, the count of the unfiltered products
+        # having been cached by the primary read above.
+        assert len(context.captured_queries) == 2
+
+    # Once the lag passed, the replica is read and cached for every user.
+    user = User.objects.get(username="testuser")
+    products_cache.delete(get_write_key(SimpleNamespace(user=user)))
+    age_catalog(products_cache)
+    for cached in (False, True):
+        with CaptureQueriesContext(connections["replica"]) as context:
+            response = authenticated_api_client.get("/products/?page_size=5")
+        assert response.data["results"][0]["price"] == "650.00"
+        assert bool(context.captured_queries) is not cached
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_reads_outside_requests_use_primary(rf, replica) -> None:
+    """
+    Test sending the reads outside of any request, and of the other applications, to the
+    primary.
+
+    :param rf: Pytest-django request factory fixture.
+    :param replica: Replica fixture.
+    :return: None
+    """
+    router = ReplicaRouter()
+    replica()
+    create_product()
+
+    assert router.db_for_read(Product) == DEFAULT_DB_ALIAS
+    assert Product.objects.count() == 1
+
+    token = current_request.set(rf.get("/products/"))
+    try:
+        assert router.db_for_read(Product) == "replica"
+        assert router.db_for_read(User) == DEFAULT_DB_ALIAS
+        assert Product.objects.count() == 0
+
+        product = Product.objects.using(DEFAULT_DB_ALIAS).get()
+        assert router.db_for_read(Product, instance=product) == DEFAULT_DB_ALIAS
+    finally:
+        current_request.reset(token)
+
+    token = current_request.set(rf.post("/products/"))
+    try:
+        assert router.db_for_read(Product) == DEFAULT_DB_ALIAS
+    finally:
+        current_request.reset(token)
+
+    assert router.db_for_write(Product) == DEFAULT_DB_ALIAS
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_replica_selection(settings, monkeypatch) -> None:
+    """
+    Test choosing the replicas in turn or by least lag, and leaving out the lagging ones.
+
+    :param settings: Pytest-django settings fixture.
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :return: None
+    """
+    monkeypatch.setattr(routers, "replica_lags", {})
+    settings.READ_REPLICAS = list(LAG_QUERIES)
+    settings.READ_REPLICA_MAX_LAG = 2
+
+    assert {select_replica() for _ in range(4)} == {"second", "third"}
+
+    settings.READ_REPLICA_SELECTION = "least_lag"
+    assert {select_replica() for _ in range(4)} == {"third"}
+
+    settings.READ_REPLICAS = ["first"]
+    assert select_replica() is None
+
+    # A failing lag query leaves the replica out until its next check.
+    monkeypatch.setattr(routers, "replica_lags", {})
+    monkeypatch.setitem(
+        connections.settings["second"], "LAG_QUERY", "SELECT lag FROM missing"
+    )
+    settings.READ_REPLICAS = ["second"]
+    assert select_replica() is None
+
+
+def test_replicas_not_migrated(settings) -> None:
+    """
+    Test forbidding the migrations of the replicas, and allowing the relations between the
+    primary and the replicas.
+
+    :param settings: Pytest-django settings fixture.
+    :return: None
+    """
+    settings.READ_REPLICAS = ["replica"]
+    router = ReplicaRouter()
+
+    assert router.allow_migrate("replica", "product") is False
+    assert router.allow_migrate(DEFAULT_DB_ALIAS, "product") is None
+
+    first, second = Product(), Product()
+    first._state.db, second._state.db = DEFAULT_DB_ALIAS, "replica"
+    assert router.allow_relation(first, second) is True
+    second._state.db = "other"
+    assert router.allow_relation(first, second) is None
@@ -0,0 +1,92 @@
+"""
+This test module includes unit tests for the fast read serializer of the products.
+
+The tests cover the following scenarios:
+1. Representing products like ProductSerializer, for every field and for sparse fields.
+2. Representing timestamps like ProductSerializer in another time zone.
+3. Listing products with cursor pagination from the rows read by the serializer.
+"""
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.product.models import Product
+from apps.product.serializers import ProductReadSerializer, ProductSerializer
+
+
+@pytest.fixture
+def products() -> list:
+    """
+    Fixture to provide products with varied descriptions and prices.
+
+    :return: List of the created products.
+    """
+    prices = [Decimal("500"), Decimal("650.5"), Decimal("1234.56"), Decimal("99999999")]
+    descriptions = ["Test product description", None, "", "Descrição com acentos"]
+
+    return [
+        Product.objects.create(
+            name=f"Product {index}", description=description, price=price
+        )
+        for index, (price, description) in enumerate(zip(prices, descriptions))
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", [None, ("id", "name", "price"), ("updated_at",)])
+def test_read_serializer_parity(products, fields) -> None:
+    """
+    Test that the read serializer represents products like ProductSerializer.
+
+    :param products: Products fixture.
+    :param fields: Names of the serialized fields, or None for every field.
+    :return: None
+    """
+    queryset = Product.objects.order_by("id")
+    serializer = ProductReadSerializer(fields)
+
+    expected = ProductSerializer(queryset, many=True, fields=fields).data
+    assert serializer.to_representation(serializer.select(queryset)) == expected
+
+
+@pytest.mark.django_db
+def test_read_serializer_parity_in_other_time_zone(products) -> None:
+    """
+    Test that the read serializer represents timestamps like ProductSerializer in another
+    time zone than UTC.
+
+    :param products: Products fixture.
+    :return: None
+    """
+    queryset = Product.objects.order_by("id")
+
+    with timezone.override("America/Sao_Paulo"):
+        serializer = ProductReadSerializer()
+        expected = ProductSerializer(queryset, many=True).data
+        results = serializer.to_representation(serializer.select(queryset))
+
+    assert results == expected
+    assert results[0]["created_at"].endswith("-03:00")
+
+
+@pytest.mark.django_db
+def test_cursor_pages_from_rows(authenticated_api_client, products) -> None:
+    """
+    Test walking the product list with cursor pagination, whose positions are read from the
+    rows of the read serializer.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param products: Products fixture.
+    :return: None
+    """
+    url = "/products/?pagination=cursor&ordering=price&fields=name&page_size=3"
+    names = []
+
+    while url:
+        response = authenticated_api_client.get(url)
+        assert response.status_code == 200
+        names += [product["name"] for product in response.data["results"]]
+        url = response.data["next"]
+
+    assert names == [product.name for product in products]
@@ -0,0 +1,123 @@
+"""
+This test module includes unit tests for the 'seed_products' management command.
+
+The tests cover the following scenarios:
+1. Seeding a reproducible catalog of valid products, replacing the stored ones.
+2. Announcing the seeded products once, after the last batch is committed.
+3. Drawing the names, descriptions and prices from skewed distributions.
+4. Seeding with invalid options.
+"""
+import io
+import statistics
+from collections import Counter
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.product import signals
+from apps.product.autocomplete import product_names
+from apps.product.management.commands.seed_products import (
+    PRICE_MEDIAN,
+    generate_products,
+)
+from apps.product.models import Product
+from apps.product.stats import get_price_stats
+from apps.product.validators import clean_product
+
+
+def read_catalog() -> list:
+    """
+    Read the stored products, in their order of creation.
+
+    :return: The '(name, description, price)' tuples of the products.
+    """
+    return list(
+        Product.objects.order_by("id").values_list("name", "description", "price")
+    )
+
+
+@pytest.mark.django_db
+def test_seed_reproducible_catalog(django_capture_on_commit_callbacks) -> None:
+    """
+    Test seeding a reproducible catalog of valid products, replacing the stored ones.
+
+    :param django_capture_on_commit_callbacks: Fixture running the on-commit callbacks.
+    :return: None
+    """
+    stdout = io.StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("seed_products", count=250, batch_size=40, seed=7, stdout=stdout)
+    assert "Seeded 250 products." in stdout.getvalue()
+
+    catalog = read_catalog()
+    assert len(catalog) == 250
+    for name, description, price in catalog:
+        _, errors = clean_product(
+            {"name": name, "description": description, "price": str(price)}
+        )
+        assert not errors
+    assert get_price_stats()["count"] == 250
+
+    stdout = io.StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("seed_products", count=250, seed=7, clear=True, stdout=stdout)
+    assert "Deleted 250 products." in stdout.getvalue()
+    assert read_catalog() == catalog
+    assert get_price_stats()["count"] == 250
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seed_announced_once(monkeypatch) -> None:
+    """
+    Test announcing the seeded products once, after the last batch is committed, rather than
+    invalidating the cached products and updating the name index batch by batch.
+
+    :param monkeypatch: Pytest fixture recording the invalidations of the cached products.
+    :return: None
+    """
+    invalidations = []
+    monkeypatch.setattr(signals, "invalidate_products", invalidations.append)
+    assert product_names.search("", 10) == []
+
+    call_command(
+        "seed_products", count=250, batch_size=40, seed=7, stdout=io.StringIO()
+    )
+    assert invalidations == [None]
+    assert product_names._stale
+    assert get_price_stats()["count"] == 250
+
+
+def test_generated_distributions() -> None:
+    """
+    Test drawing the names, descriptions and prices from skewed distributions.
+
+    :return: None
+    """
+    products = list(generate_products(5000, seed=1))
+    assert products[:10] == list(generate_products(10, seed=1))
+
+    names = Counter(product["name"] for product in products)
+    counts = sorted(names.values(), reverse=True)
+    assert counts[0] > 10 * counts[len(counts) // 2]
+
+    prices = [product["price"] for product in products]
+    assert min(prices) >= 500
+    assert 0.8 * PRICE_MEDIAN < statistics.median(prices) < 1.2 * PRICE_MEDIAN
+    assert max(prices) > 4 * PRICE_MEDIAN
+    cents = Counter(str(price)[-2:] for price in prices)
+    assert cents["99"] > len(prices) / 2
+
+    missing = sum(1 for product in products if product["description"] is None)
+    assert 0 < missing < len(products) / 10
+
+
+@pytest.mark.parametrize("options", [{"count": 0}, {"batch_size": 0}])
+def test_seed_with_invalid_options(options) -> None:
+    """
+    Test seeding with invalid options.
+
+    :param options: Invalid options of the command.
+    :return: None
+    """
+    with pytest.raises(CommandError):
+        call_command("seed_products", **options)
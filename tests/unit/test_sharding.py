@@ -0,0 +1,295 @@
+"""
+This test module includes unit tests for the hash sharding of the products.
+
+The shards are SQLite files, migrated once for the module, next to the test database holding
+the other tables and the id sequence.
+
+The tests cover the following scenarios:
+1. Spreading the created products over the shards by id hash, with unique ids.
+2. Reading, updating and deleting a product in the shard owning it.
+3. Listing the products of every shard with page and cursor pagination, filters and orderings,
+like a single database would.
+4. Merging the rows of the shards, whatever their ordering and type, and combining their counts
+and aggregates.
+5. Updating, repricing and deleting products in bulk across the shards, along with their
+statistics.
+"""
+from decimal import Decimal
+from functools import partial
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from conftest import create_products
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.test import override_settings
+
+from apps.product import sharding
+from apps.product.models import Product
+from apps.product.routers import ShardRouter
+from apps.product.sharding import ShardedQuerySet, shard_for
+
+SHARDS = ("shard_0", "shard_1", "shard_2")
+DATABASES = [DEFAULT_DB_ALIAS, *SHARDS]
+
+# Products whose names and prices repeat, so that the orderings have ties.
+create_repeated_products = partial(
+    create_products,
+    name=lambda index: f"Product {index % 4}",
+    price=lambda index: Decimal(500 + (index * 37) % 50),
+)
+
+
+def count_rows(alias) -> int:
+    """
+    Count the products stored in a database.
+
+    :param alias: Alias of the database.
+    :return: The number of products.
+    """
+    return Product.objects.using(alias).count()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shard_databases(django_db_setup, django_db_blocker, tmp_path_factory):
+    """
+    Fixture declaring and migrating the shard databases, and sharding the products for the
+    tests of the module.
+
+    :param django_db_setup: Pytest-django test database fixture.
+    :param django_db_blocker: Pytest-django database access fixture.
+    :param tmp_path_factory: Pytest temporary directory factory fixture.
+    :return: None
+    """
+    directory = tmp_path_factory.mktemp("shards")
+    for alias in SHARDS:
+        connections.settings[alias] = {
+            **connection.settings_dict,
+            "NAME": str(directory / f"{alias}.sqlite3"),
+            "OPTIONS": {},
+        }
+
+    sharded = override_settings(PRODUCT_SHARDS=list(SHARDS))
+    sharded.enable()
+    with django_db_blocker.unblock():
+        for alias in SHARDS:
+            call_command("migrate", database=alias, verbosity=0)
+
+    yield
+
+    sharded.disable()
+    sharding.get_executor().shutdown()
+    sharding.get_executor.cache_clear()
+    for alias in SHARDS:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_products_spread_over_shards(authenticated_api_client) -> None:
+    """
+    Test spreading the created products over the shards by id hash, with unique ids.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    payload = [
+        {"name": f"Product {index}", "description": "Sharded product", "price": 600}
+        for index in range(60)
+    ]
+    response = authenticated_api_client.post("/products/bulk", payload, format="json")
+    assert response.status_code == 201
+    created = create_repeated_products(30)
+
+    ids = [item["id"] for item in response.data["created"]]
+    ids += [product.id for product in created]
+    assert len(set(ids)) == 90
+
+    assert count_rows(DEFAULT_DB_ALIAS) == 0
+    assert sum(count_rows(alias) for alias in SHARDS) == 90
+    assert all(count_rows(alias) > 10 for alias in SHARDS)
+    for product in created:
+        assert product._state.db == shard_for(product.id)
+        assert Product.objects.using(shard_for(product.id)).filter(pk=product.id)
+
+    assert Product.objects.sharded().count() == 90
+    assert response.data["created"][0]["created_at"] is not None
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_detail_uses_owning_shard(authenticated_api_client) -> None:
+    """
+    Test reading, updating and deleting a product in the shard owning it.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    product = create_repeated_products(1)[0]
+    url = f"/products/{product.id}"
+
+    response = authenticated_api_client.get(url)
+    assert response.status_code == 200
+    assert response.data["name"] == product.name
+
+    response = authenticated_api_client.get(f"/async/products/{product.id}")
+    assert response.status_code == 200
+
+    response = authenticated_api_client.patch(url, {"price": 700}, format="json")
+    assert response.status_code == 200
+    product.refresh_from_db()
+    assert product.price == 700
+    assert product._state.db == shard_for(product.id)
+
+    assert authenticated_api_client.delete(url).status_code == 204
+    assert not Product.objects.shard(product.id).filter(pk=product.id).exists()
+    assert authenticated_api_client.get(url).status_code == 404
+    assert authenticated_api_client.get("/products/abc").status_code == 404
+
+    router = ShardRouter()
+    assert router.db_for_write(Product, instance=product) == shard_for(product.id)
+    assert router.db_for_write(Product, instance=Product()) is None
+    assert router.allow_migrate("shard_0", "product", "product") is True
+    assert router.allow_migrate("shard_0", "product", "productsequence") is False
+    assert router.allow_migrate("shard_0", "auth", "user") is False
+    assert router.allow_migrate(DEFAULT_DB_ALIAS, "product", "product") is None
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+@pytest.mark.parametrize("ordering", ["created_at", "-created_at", "price", "-price"])
+def test_list_pages_match_single_database(authenticated_api_client, ordering) -> None:
+    """
+    Test listing the products of every shard with page and cursor pagination, filters and
+    orderings, like a single database would.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param ordering: Ordering of the list.
+    :return: None
+    """
+    products = create_repeated_products(23)
+    names = [name.lstrip("-") for name in (ordering, "id")]
+    expected = sorted(
+        products,
+        key=lambda product: tuple(getattr(product, name) for name in names),
+        reverse=ordering.startswith("-"),
+    )
+
+    ids = []
+    for page in range(1, 6):
+        response = authenticated_api_client.get(
+            f"/products/?ordering={ordering}&page_size=5&page={page}"
+        )
+        assert response.status_code == 200
+        assert response.data["count"] == 23
+        ids += [item["id"] for item in response.data["results"]]
+    assert ids == [product.id for product in expected]
+
+    ids, cursor = [], None
+    while True:
+        query = f"pagination=cursor&ordering={ordering}&page_size=4&fields=id,name"
+        if cursor is not None:
+            query += f"&cursor={cursor}"
+        response = authenticated_api_client.get(f"/products/?{query}")
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.data["results"]]
+        if response.data["next"] is None:
+            break
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+    assert ids == [product.id for product in expected]
+
+    filtered = [
+        product
+        for product in expected
+        if product.name == "Product 1" and product.price >= 520
+    ]
+    response = authenticated_api_client.get(
+        f"/async/products/?ordering={ordering}&page_size=15"
+        "&name=Product 1&min_price=520&fields=id"
+    )
+    assert response.status_code == 200
+    assert response.json()["count"] == len(filtered)
+    assert len(response.json()["results"]) == len(filtered)
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_merged_rows_and_aggregates() -> None:
+    """
+    Test merging the rows of the shards, whatever their ordering and type, and combining their
+    counts and aggregates.
+
+    :return: None
+    """
+    products = create_repeated_products(20)
+    queryset = Product.objects.sharded()
+    assert isinstance(queryset, ShardedQuerySet)
+
+    expected = sorted(products, key=lambda product: (product.name, -product.id))
+    rows = queryset.order_by("name", "-id")
+    assert [product.id for product in rows] == [product.id for product in expected]
+    assert [row["id"] for row in rows.values("id", "name")[3:8]] == [
+        product.id for product in expected[3:8]
+    ]
+    assert list(rows.values_list("id", "name")[2:][:3]) == [
+        (product.id, product.name) for product in expected[2:5]
+    ]
+    assert list(queryset.order_by("-pk").values_list("id", flat=True).iterator(7)) == (
+        sorted((product.id for product in products), reverse=True)
+    )
+    assert rows[4].id == expected[4].id
+    assert queryset.first().id == min(product.id for product in products)
+    assert len(rows[18:30]) == 2
+    with pytest.raises(TypeError):
+        rows[:5].filter(name="Product 1")
+
+    assert queryset.count() == 20
+    assert queryset.filter(name="Product 2").exists()
+    assert not queryset.filter(name="Missing").exists()
+    prices = [product.price for product in products]
+    assert queryset.aggregate(Count("id"), Max("price"), total=Sum("price")) == {
+        "id__count": 20,
+        "price__max": max(prices),
+        "total": sum(prices),
+    }
+    assert queryset.none().aggregate(lowest=Min("price")) == {"lowest": None}
+    with pytest.raises(TypeError):
+        queryset.aggregate(Avg("price"))
+
+    picked = [products[0].id, products[7].id, 10**9]
+    assert set(queryset.in_bulk(picked)) == set(picked[:2])
+
+
+@pytest.mark.django_db(transaction=True, databases=DATABASES)
+def test_bulk_changes_across_shards(authenticated_api_client) -> None:
+    """
+    Test updating, repricing and deleting products in bulk across the shards, along with their
+    statistics.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    products = create_repeated_products(12)
+    client = authenticated_api_client
+
+    payload = [{"id": product.id, "price": 800} for product in products[:6]]
+    response = client.patch("/products/bulk", payload, format="json")
+    assert response.status_code == 200
+    assert Product.objects.sharded().filter(price=800).count() == 6
+
+    stats = client.get("/products/stats").json()
+    assert stats["count"] == 12
+    assert Decimal(stats["max_price"]) == 800
+
+    response = client.post(
+        "/products/reprice?min_price=800", {"factor": "1.5"}, format="json"
+    )
+    assert response.data["updated"] == 6
+    assert Decimal(client.get("/products/stats").json()["max_price"]) == 1200
+
+    response = client.delete("/products/bulk?min_price=1000")
+    assert response.data["deleted"] == 6
+    assert Product.objects.sharded().count() == 6
+    assert client.get("/products/stats").json()["count"] == 6
+    assert client.get("/products/stats?name=Product 1").json()["count"] == len(
+        [product for product in products[6:] if product.name == "Product 1"]
+    )
@@ -0,0 +1,146 @@
+"""
+This test module includes unit tests for the sparse fieldsets of the product reads.
+
+The tests cover the following scenarios:
+1. Listing products restricted to some fields, reading only their columns.
+2. Listing products restricted to some fields with cursor pagination, without extra queries.
+3. Retrieving and searching products restricted to some fields.
+4. Restricting the async views to some fields.
+5. Requesting unknown fields.
+"""
+from functools import partial
+
+import pytest
+from asgiref.sync import async_to_sync
+from conftest import create_products, get_product_queries
+from django.test import AsyncClient
+
+create_chairs = partial(create_products, name=lambda index: f"Chair {index}")
+
+
+@pytest.mark.django_db
+def test_list_products_with_fields(authenticated_api_client) -> None:
+    """
+    Test listing products restricted to some fields.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    products = create_chairs(3)
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/?fields=id,name,price&page_size=2"
+    )
+    assert response.status_code == 200
+    assert response.data["results"] == [
+        {"id": product.id, "name": product.name, "price": f"{product.price:.2f}"}
+        for product in products[:2]
+    ]
+    assert '"description"' not in queries[-1]
+
+    response = authenticated_api_client.get("/products/?fields=&page_size=2")
+    assert set(response.data["results"][0]) == {
+        "id",
+        "name",
+        "description",
+        "price",
+        "created_at",
+        "updated_at",
+    }
+
+
+@pytest.mark.django_db
+def test_list_products_with_fields_and_cursor(authenticated_api_client) -> None:
+    """
+    Test listing products restricted to some fields with cursor pagination, which reads the
+    ordering fields of the page without querying them again.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    create_chairs(3)
+
+    response, queries = get_product_queries(
+        authenticated_api_client,
+        "/products/?pagination=cursor&ordering=-price&fields=name&page_size=2",
+    )
+    assert response.status_code == 200
+    assert response.data["results"] == [{"name": "Chair 2"}, {"name": "Chair 1"}]
+    assert response.data["next"] is not None
+    assert len(queries) == 1
+
+
+@pytest.mark.django_db
+def test_retrieve_and_search_products_with_fields(authenticated_api_client) -> None:
+    """
+    Test retrieving and searching products restricted to some fields.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    (product,) = create_chairs(1)
+
+    response = authenticated_api_client.get(f"/products/{product.id}?fields=name")
+    assert response.status_code == 200
+    assert response.data == {"name": product.name}
+
+    etag = response["ETag"]
+    response = authenticated_api_client.get(f"/products/{product.id}")
+    assert response["ETag"] != etag
+
+    response, queries = get_product_queries(
+        authenticated_api_client, "/products/search?q=chair&fields=id,name"
+    )
+    assert response.status_code == 200
+    assert response.data["results"] == [{"id": product.id, "name": product.name}]
+    assert '"description"' not in queries[-1].split("FROM")[0]
+
+
+@pytest.mark.django_db
+def test_async_views_with_fields(authenticated_api_client) -> None:
+    """
+    Test restricting the async views to some fields.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :return: None
+    """
+    (product,) = create_chairs(1)
+    headers = {
+        "Authorization": authenticated_api_client._credentials["HTTP_AUTHORIZATION"]
+    }
+    client = AsyncClient()
+
+    response = async_to_sync(client.get)(
+        "/async/products/?fields=id,name", headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"id": product.id, "name": product.name}]
+
+    response = async_to_sync(client.get)(
+        f"/async/products/{product.id}?fields=price", headers=headers
+    )
+    assert response.json() == {"price": "650.00"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/products/?fields=id,secret",
+        "/products/1?fields=id,secret",
+        "/products/search?q=chair&fields=secret",
+    ],
+)
+def test_unknown_fields(authenticated_api_client, url) -> None:
+    """
+    Test requesting unknown fields.
+
+    :param authenticated_api_client: Authenticated API client fixture.
+    :param url: Requested URL.
+    :return: None
+    """
+    create_chairs(1)
+
+    response = authenticated_api_client.get(url)
+    assert response.status_code == 400
+    assert list(response.data) == ["fields"]